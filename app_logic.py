@@ -1,6 +1,6 @@
-import re
 from tkinter import filedialog
-from utils.logger import log_info, log_error
+from robot_model import detect_machine_model, detect_robot_model
+from utils.logger import log_error
 #System do dopracowania
 
 class AppLogic:
@@ -29,15 +29,8 @@ class AppLogic:
             return
 
         try:
-            with open(source_file, 'r') as src:
-                source_content = src.read()
-            source_match = re.search(r'KR\s*\d+', source_content)
-            source_model = source_match.group(0).replace(" ", "") if source_match else None
-
-            with open(target_file, 'r') as tgt:
-                target_content = tgt.read()
-            target_match = re.search(r'MACHINE_DEF\[\d+\]=\{NAME\[\]\s*"KR\s*\d+', target_content)
-            target_model = target_match.group(0).split('"')[1].replace(" ", "") if target_match else None
+            source_model = detect_robot_model(source_file)
+            target_model = detect_machine_model(target_file)
 
             self.ui.log_display.config(state="normal")
             if source_model == target_model:
@@ -1,41 +1,68 @@
 import os
-import threading
 from value_transfer import transfer_values
+from value_purge import purge_values
+from jobs import Job, JobCancelled
+from progress import ProgressReporter
+from run_report import RunReport
+from utils.backup_store import BackupStore
 from utils.logger import log_info, log_error
-from utils.file_utils import prepare_target_file
+from utils.file_utils import disk_path, file_exists, prepare_target_file, remove_file
+
+
+def discard_cancelled_copy(target_file, new_target_file, log_message):
+    """
+    Remove the working copy made by prepare_target_file after a cancelled job.
+    """
+    if new_target_file and new_target_file != target_file and file_exists(new_target_file):
+        remove_file(new_target_file)
+        log_message(f"Removed working copy: {new_target_file}", level="INFO")
 
 
 def run_transfer(
     source_file, target_file, update_base_data_flag, update_base_name_flag, update_base_type_flag,
     update_tool_data_flag, update_tool_type_flag, update_tool_name_flag, update_load_data_flag,
-    update_e6axis_flag, e6axis_names, modify_directly, log_message
+    update_e6axis_flag, e6axis_names, modify_directly, log_message, progress=None, cancel_token=None,
+    backup_store=None
 ):
     """
     Wykonuje transfer danych między plikami.
+
+    Args:
+        backup_store (str): Directory of a BackupStore that receives the target
+            before it is edited in place (instead of a timestamped copy).
     """
+    new_target_file = None
     try:
         log_message("Starting transfer...", level="INFO")
         log_info("Transfer thread started.")
 
         # Przygotowanie pliku docelowego
-        new_target_file = prepare_target_file(target_file, modify_directly, log_message)
+        store = BackupStore(backup_store) if backup_store else None
+        new_target_file = prepare_target_file(target_file, modify_directly, log_message, store)
         if not new_target_file:
             return  # Wyjdź, jeśli wystąpił błąd podczas przygotowania pliku
 
         # Wywołanie funkcji transfer_values z odpowiednimi parametrami
+        report = RunReport()
         transfer_values(
             source_file, new_target_file, log_message,
             update_base_data_flag, update_base_name_flag, update_base_type_flag,
             update_tool_data_flag, update_tool_type_flag, update_tool_name_flag,
-            update_load_data_flag, update_e6axis_flag, e6axis_names
+            update_load_data_flag, update_e6axis_flag, e6axis_names,
+            progress=progress, cancel_token=cancel_token, report=report
         )
 
         log_message("Transfer completed successfully!", level="INFO")
+        log_message(report.summary(), level="INFO")
 
         # Otwórz nowo utworzony plik, jeśli zaznaczono odpowiednią opcję
         if not modify_directly:
-            os.startfile(new_target_file)
+            os.startfile(disk_path(new_target_file))
 
+    except JobCancelled:
+        log_message("Transfer cancelled, target file left unchanged.", level="WARNING")
+        discard_cancelled_copy(target_file, new_target_file, log_message)
+        raise
     except Exception as e:
         log_message(f"Error during transfer: {e}", level="ERROR")
 
@@ -43,16 +70,99 @@ def run_transfer(
 def start_transfer_in_thread(
     source_file, target_file, update_base_data_flag, update_base_name_flag, update_base_type_flag,
     update_tool_data_flag, update_tool_type_flag, update_tool_name_flag, update_load_data_flag,
-    update_e6axis_flag, e6axis_names, modify_directly, log_message
+    update_e6axis_flag, e6axis_names, modify_directly, log_message, progress=None, executor=None,
+    backup_store=None
 ):
     """
     Uruchamia transfer w osobnym wątku.
+
+    Args:
+        backup_store (str): Directory of a BackupStore (see run_transfer); None keeps
+            the modify_directly behaviour.
+        progress (ProgressReporter): The job's progress counters (a new one if None);
+            never share one between jobs that may run at the same time.
+        executor (JobExecutor): Queue the job there (serialised per target file);
+            without one the job gets its own thread.
+
+    Returns:
+        Job: The queued or running job (use job.cancel() to stop it, job.progress to follow it).
     """
-    threading.Thread(
-        target=run_transfer,
-        args=(
-            source_file, target_file, update_base_data_flag, update_base_name_flag, update_base_type_flag,
-            update_tool_data_flag, update_tool_type_flag, update_tool_name_flag, update_load_data_flag,
-            update_e6axis_flag, e6axis_names, modify_directly, log_message
+    if progress is None:
+        progress = ProgressReporter()
+    job = Job(
+        f"transfer {target_file}", run_transfer,
+        source_file, target_file, update_base_data_flag, update_base_name_flag, update_base_type_flag,
+        update_tool_data_flag, update_tool_type_flag, update_tool_name_flag, update_load_data_flag,
+        update_e6axis_flag, e6axis_names, modify_directly, log_message, progress,
+        target=target_file, progress=progress, backup_store=backup_store
+    )
+    return executor.submit(job) if executor is not None else job.start()
+
+
+def run_purge(
+    target_file, section_flags, modify_directly, open_after, log_message, progress=None, cancel_token=None,
+    backup_store=None
+):
+    """
+    Wykonuje czyszczenie (purge) pliku docelowego.
+
+    Args:
+        section_flags (dict): update_*_flag keyword arguments for purge_values.
+        open_after (bool): Open the purged file when done.
+        backup_store (str): Directory of a BackupStore that receives the target
+            before it is edited in place (instead of a timestamped copy).
+    """
+    new_target_file = None
+    try:
+        log_message(f"Purging file: {target_file}", level="INFO")
+
+        store = BackupStore(backup_store) if backup_store else None
+        new_target_file = prepare_target_file(target_file, modify_directly, log_message, store)
+        if not new_target_file:
+            return
+
+        report = RunReport()
+        purge_values(
+            new_target_file, log_message, progress=progress, cancel_token=cancel_token, report=report, **section_flags
         )
-    ).start()
\ No newline at end of file
+
+        log_message("Purge process completed successfully!", level="INFO")
+        log_message(report.summary(), level="INFO")
+
+        if open_after:
+            os.startfile(disk_path(new_target_file))
+
+    except JobCancelled:
+        log_message("Purge cancelled, target file left unchanged.", level="WARNING")
+        discard_cancelled_copy(target_file, new_target_file, log_message)
+        raise
+    except Exception as e:
+        log_message(f"Error during purge: {e}", level="ERROR")
+
+
+def start_purge_in_thread(
+    target_file, section_flags, modify_directly, open_after, log_message, progress=None, executor=None,
+    backup_store=None
+):
+    """
+    Uruchamia purge w osobnym wątku.
+
+    Args:
+        backup_store (str): Directory of a BackupStore (see run_purge); None keeps
+            the modify_directly behaviour.
+        progress (ProgressReporter): The job's progress counters (a new one if None);
+            never share one between jobs that may run at the same time.
+        executor (JobExecutor): Queue the job there (serialised per target file);
+            without one the job gets its own thread.
+
+    Returns:
+        Job: The queued or running job (use job.cancel() to stop it, job.progress to follow it).
+    """
+    if progress is None:
+        progress = ProgressReporter()
+    job = Job(
+        f"purge {target_file}", run_purge,
+        target_file, section_flags, modify_directly, open_after, log_message, progress,
+        target=target_file, progress=progress, backup_store=backup_store
+    )
+    return executor.submit(job) if executor is not None else job.start()
@@ -0,0 +1,241 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from change_plan import plan_transfer
+from jobs import target_key
+from value_compare import compare_configs
+from config_cache import get_parsed_config
+from run_report import RunReport
+from value_transfer import transfer_values
+from stream_transfer import stream_transfer_values
+from utils.archive_utils import expand_archive_pattern, is_archive_path
+from utils.backup_store import BackupStore
+from utils.file_utils import prepare_target_file
+
+# Indeks źródła przekazywany raz do każdego procesu roboczego (initializer)
+_worker_source_index = None
+
+
+def expand_targets(patterns):
+    """
+    Expand a list of paths and glob patterns into a sorted list of unique files.
+
+    Archive paths may have patterns on both sides of "!/", e.g.
+    "backups/*.zip!/KRC/R1/System/$config.dat".
+    """
+    targets = []
+    for pattern in patterns:
+        if is_archive_path(pattern):
+            matches = expand_archive_pattern(pattern)
+        elif glob.has_magic(pattern):
+            matches = glob.glob(pattern, recursive=True)
+        else:
+            matches = [pattern]
+        for path in matches:
+            if path not in targets:
+                targets.append(path)
+    return sorted(targets)
+
+
+def group_targets(target_files):
+    """
+    Group targets by the file on disk that holds them (see jobs.target_key).
+
+    Writing any member of an archive rebuilds the whole zip, so all members
+    of one archive must be written one after another by the same worker;
+    plain files each form their own group.
+
+    Returns:
+        list: Lists of targets, in the order of their first target.
+    """
+    groups = {}
+    for target in target_files:
+        groups.setdefault(target_key(target), []).append(target)
+    return list(groups.values())
+
+
+def _init_worker(source_index):
+    global _worker_source_index
+    _worker_source_index = source_index
+
+
+def _transfer_one(target_file, modify_directly, streaming, backup_store, options):
+    """
+    Run a single transfer inside a worker process and summarise it.
+    """
+    errors = []
+
+    def log_callback(message, level="INFO", bold=False):
+        if level == "ERROR":
+            errors.append(message)
+
+    started = time.perf_counter()
+    changed_sections = []
+    report = RunReport()
+    store = BackupStore(backup_store) if backup_store else None
+    new_target_file = prepare_target_file(target_file, modify_directly, log_callback, backup_store=store)
+    if new_target_file:
+        engine = stream_transfer_values if streaming else transfer_values
+        changed_sections = engine(
+            None, new_target_file, log_callback, source_index=_worker_source_index, report=report, **options
+        )
+
+    return {
+        "target": target_file,
+        "output": new_target_file,
+        "changed_sections": changed_sections,
+        "errors": errors,
+        "duration": time.perf_counter() - started,
+        "report": report.to_dict(),
+    }
+
+
+def _failed_summary(target_file, error):
+    return {
+        "target": target_file, "output": None, "changed_sections": [],
+        "errors": [str(error)], "duration": 0.0,
+    }
+
+
+def _transfer_group(target_files, modify_directly, streaming, backup_store, options):
+    """
+    Transfer the targets of one group (see group_targets) one after another.
+    """
+    summaries = []
+    for target_file in target_files:
+        try:
+            summaries.append(_transfer_one(target_file, modify_directly, streaming, backup_store, options))
+        except Exception as e:
+            summaries.append(_failed_summary(target_file, e))
+    return summaries
+
+
+def _plan_one(target_file, diff, options):
+    return plan_transfer(None, target_file, source_index=_worker_source_index, diff=diff, **options)
+
+
+def _compare_one(source_file, target_file, options):
+    return compare_configs(source_file, target_file, source_index=_worker_source_index, **options)
+
+
+def transfer_batch(
+    source_file, targets, workers=None, modify_directly=True, streaming=False, backup_store=None, **options
+):
+    """
+    Apply one source config to many targets using a process pool.
+
+    The source is read and indexed once; every worker receives the index
+    when it starts instead of parsing the source again. Members of the same
+    archive are transferred one after another in a single worker task, as
+    each write rebuilds the zip (see group_targets).
+
+    Args:
+        source_file (str): Path of the source $config.dat.
+        targets (list): Target paths or glob patterns.
+        workers (int): Number of worker processes (default: CPU count).
+        modify_directly (bool): Edit targets in place or timestamped copies.
+        streaming (bool): Use stream_transfer_values for every target.
+        backup_store (str): Directory of a BackupStore that receives every
+            target before it is edited (shared by all workers).
+        options: Section flags and e6axis_names, as for transfer_values.
+
+    Returns:
+        list: One summary dict per target with target, output,
+        changed_sections, errors and duration (seconds).
+    """
+    source_index = get_parsed_config(source_file).index
+
+    target_files = expand_targets(targets)
+    if not target_files:
+        return []
+
+    groups = group_targets(target_files)
+    workers = min(workers or os.cpu_count() or 1, len(groups))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source_index,)) as executor:
+        futures = [
+            executor.submit(_transfer_group, group, modify_directly, streaming, backup_store, options)
+            for group in groups
+        ]
+        summaries = {}
+        for group, future in zip(groups, futures):
+            try:
+                group_summaries = future.result()
+            except Exception as e:
+                group_summaries = [_failed_summary(target, e) for target in group]
+            for summary in group_summaries:
+                summaries[summary["target"]] = summary
+    return [summaries[target] for target in target_files]
+
+
+def plan_batch(source_file, targets, workers=None, diff=True, **options):
+    """
+    Plan (dry-run) one source config against many targets; nothing is written.
+
+    Uses the same process pool setup as transfer_batch. A single target is
+    planned in the calling process.
+
+    Args:
+        source_file (str): Path of the source $config.dat.
+        targets (list): Target paths or glob patterns.
+        workers (int): Number of worker processes (default: CPU count).
+        diff (bool): Whether every plan should include its unified diff.
+        options: Section flags and e6axis_names, as for transfer_values.
+
+    Returns:
+        list: One plan dict per target, as returned by plan_transfer.
+    """
+    source_index = get_parsed_config(source_file).index
+
+    target_files = expand_targets(targets)
+    if len(target_files) <= 1 or workers == 1:
+        return [plan_transfer(None, target, source_index=source_index, diff=diff, **options) for target in target_files]
+
+    workers = min(workers or os.cpu_count() or 1, len(target_files))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source_index,)) as executor:
+        futures = [executor.submit(_plan_one, target, diff, options) for target in target_files]
+        plans = []
+        for target, future in zip(target_files, futures):
+            try:
+                plans.append(future.result())
+            except Exception as e:
+                plan = {"target": target, "changes": [], "errors": [str(e)]}
+                if diff:
+                    plan["diff"] = ""
+                plans.append(plan)
+    return plans
+
+
+def compare_batch(source_file, targets, workers=None, **options):
+    """
+    Compare many targets against one source config (see value_compare.compare_configs).
+
+    Args:
+        source_file (str): Path of the reference $config.dat.
+        targets (list): Target paths or glob patterns.
+        workers (int): Number of worker processes (default: CPU count).
+        options: tolerances, sections and e6axis_names for compare_configs.
+
+    Returns:
+        list: One comparison report per target.
+    """
+    source_index = get_parsed_config(source_file).index
+
+    target_files = expand_targets(targets)
+    if len(target_files) <= 1 or workers == 1:
+        return [compare_configs(source_file, target, source_index=source_index, **options) for target in target_files]
+
+    workers = min(workers or os.cpu_count() or 1, len(target_files))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source_index,)) as executor:
+        futures = [executor.submit(_compare_one, source_file, target, options) for target in target_files]
+        reports = []
+        for target, future in zip(target_files, futures):
+            try:
+                reports.append(future.result())
+            except Exception as e:
+                reports.append({
+                    "source": source_file, "target": target, "compared": {},
+                    "differences": [], "missing": [], "errors": [str(e)],
+                })
+    return reports
@@ -0,0 +1,106 @@
+"""
+Micro-benchmark of the per-line cost of record matching.
+
+Compares the legacy handler approach (one re.match with a string pattern per
+section, for every line), the same patterns compiled but without a
+pre-filter, and patterns.match_line with its prefix dispatch. Frame values
+are timed the same way: the legacy per-field re.match against
+records.Frame.parse, which the handlers use.
+
+    python -m benchmarks.bench_patterns [--lines 200000] [--repeat 5]
+"""
+import argparse
+import re
+import timeit
+
+from patterns import SECTION_PATTERNS, SEARCH_SECTIONS, match_line
+from records import Frame
+
+LEGACY_PATTERNS = [
+    (r'BASE_DATA\[(\d+)\]=\{(.*)\}', False),
+    (r'BASE_NAME\[(\d+),\]=["](.*)["]', False),
+    (r'BASE_TYPE\[(\d+)\]=#(\w+)', False),
+    (r'TOOL_DATA\[(\d+)\]=\{(.*)\}', False),
+    (r'TOOL_TYPE\[(\d+)\]=#(\w+)', False),
+    (r'TOOL_NAME\[(\d+),\]=["](.*)["]', False),
+    (r'LOAD_DATA\[(\d+)\]=\{(.*)\}', False),
+    (r'E6AXIS\s+([A-Za-z0-9_]+)\s*=\s*\{(.*)\}', True),
+]
+
+
+def sample_lines(count):
+    """
+    Return a realistic mix of record, comment and unrelated lines.
+    """
+    template = [
+        "BASE_DATA[{i}]={{X 335.22,Y -12.5,Z 800.0,A 0.0,B 90.0,C 0.0}}\n",
+        "BASE_NAME[{i},]=\"FIX_{i}\"\n",
+        "BASE_TYPE[{i}]=#NONE\n",
+        "TOOL_DATA[{i}]={{X 516.36,Y 0.0,Z 300.0,A 0.0,B 0.0,C 0.0}}\n",
+        "TOOL_NAME[{i},]=\"GRIPPER_{i}\"\n",
+        "TOOL_TYPE[{i}]=#BASE\n",
+        "LOAD_DATA[{i}]={{M 12.5,CM {{X 0.0,Y 0.0,Z 80.0,A 0.0,B 0.0,C 0.0}},J {{X 0.1,Y 0.1,Z 0.2}}}}\n",
+        "DECL E6AXIS XHOME{i}={{A1 0.0,A2 -90.0,A3 90.0,A4 0.0,A5 0.0,A6 0.0,E1 0.0,E2 0.0,E3 0.0,E4 0.0,E5 0.0,E6 0.0}}\n",
+        ";FOLD comment line {i}\n",
+        "DECL INT COUNTER_{i}=0\n",
+        "\n",
+        ";ENDFOLD\n",
+    ]
+    return [template[i % len(template)].format(i=i // len(template) + 1) for i in range(count)]
+
+
+def legacy_scan(lines):
+    for line in lines:
+        for pattern, search in LEGACY_PATTERNS:
+            if (re.search if search else re.match)(pattern, line):
+                break
+
+
+def compiled_scan(lines):
+    for line in lines:
+        for section, pattern in SECTION_PATTERNS.items():
+            if (pattern.search if section in SEARCH_SECTIONS else pattern.match)(line):
+                break
+
+
+def registry_scan(lines):
+    for line in lines:
+        match_line(line)
+
+
+def legacy_frame_parse(values):
+    # Jak stare handlery BASE_DATA/TOOL_DATA: re.match(str) dla każdego pola
+    for text in values:
+        [float(value.split()[1]) for value in text.split(',') if re.match(r'[XYZABC] [\-\d.]+', value)]
+
+
+def records_frame_parse(values):
+    for text in values:
+        Frame.parse(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    lines = sample_lines(args.lines)
+    values = ["X 335.22,Y -12.5,Z 800.0,A 0.0,B 90.0,C 0.0"] * (args.lines // 12)
+
+    cases = [
+        ("line match: legacy re.match(str) x8", lambda: legacy_scan(lines), len(lines)),
+        ("line match: compiled, no pre-filter", lambda: compiled_scan(lines), len(lines)),
+        ("line match: registry match_line", lambda: registry_scan(lines), len(lines)),
+        ("frame value: legacy re.match(str) per field", lambda: legacy_frame_parse(values), len(values)),
+        ("frame value: records.Frame.parse", lambda: records_frame_parse(values), len(values)),
+    ]
+
+    print(f"{'case':46} {'ns/item':>10}")
+    for name, func, count in cases:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"{name:46} {best / count * 1e9:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
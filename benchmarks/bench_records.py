@@ -0,0 +1,76 @@
+"""
+Memory benchmark of the parsed source data: nested dicts of strings (the
+handlers' old representation) versus the records module.
+
+    python -m benchmarks.bench_records [--configs 80] [--records 200]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from config_index import ConfigIndex
+from sections import SECTIONS
+
+
+def sample_config(records):
+    lines = []
+    for i in range(1, records + 1):
+        lines.append(f"BASE_DATA[{i}]={{X {i}.5,Y -12.5,Z 800.0,A 0.0,B 90.0,C 0.0}}\n")
+        lines.append(
+            f"DECL E6AXIS XHOME{i}={{A1 {i}.0,A2 -90.0,A3 90.0,A4 0.0,A5 0.0,A6 0.0,"
+            f"E1 0.0,E2 0.0,E3 0.0,E4 0.0,E5 0.0,E6 0.0}}\n"
+        )
+    return lines
+
+
+def parse_as_dicts(index):
+    """
+    The representation used before the records module.
+    """
+    frames = {}
+    for record in index.sections["BASE_DATA"].values():
+        frames[record.key] = {}
+        for value in record.value.split(','):
+            key, val = value.strip().split(' ', 1)
+            frames[record.key][key.strip()] = val.strip()
+    axes = {}
+    for record in index.sections["E6AXIS"].values():
+        values = record.value.strip()
+        axes[record.key] = {arg.split()[0]: arg.split()[1] for arg in values.split(",")}
+    return frames, axes
+
+
+def parse_as_records(index):
+    quiet = lambda *args, **kwargs: None
+    return SECTIONS["BASE_DATA"].parse_source(index, quiet), SECTIONS["E6AXIS"].parse_source(index, quiet)
+
+
+def measure(parse, indexes):
+    gc.collect()
+    tracemalloc.start()
+    parsed = [parse(index) for index in indexes]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+    return current
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", type=int, default=80, help="number of parsed configs held at once")
+    parser.add_argument("--records", type=int, default=200, help="BASE_DATA and E6AXIS records per config")
+    args = parser.parse_args(argv)
+
+    indexes = [ConfigIndex(sample_config(args.records)) for _ in range(args.configs)]
+    count = args.configs * args.records * 2
+
+    dicts = measure(parse_as_dicts, indexes)
+    records = measure(parse_as_records, indexes)
+    print(f"{'representation':24} {'total MiB':>10} {'bytes/record':>13}")
+    print(f"{'nested dicts':24} {dicts / 2 ** 20:10.2f} {dicts / count:13.0f}")
+    print(f"{'records':24} {records / 2 ** 20:10.2f} {records / count:13.0f}")
+    print(f"records use {records / dicts:.0%} of the dict representation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Startup time of the GUI, measured with python -X importtime.
+
+    python -m benchmarks.bench_startup [--repeat 5] [--import-budget-ms 150] [--window-budget-ms 1500]
+
+Runs a fresh interpreter that imports ui, builds FileTransferApp and draws
+the first window, and reports the best of --repeat runs: the cumulative
+import time of ui, the slowest imports and the time from process start to
+the first drawn window. Exits with 1 if a budget is exceeded or if one of
+the engine modules (LAZY_MODULES) is imported before the first transfer or
+purge. Without a display only the import part is checked and the exit
+status is 2 (SKIPPED), so a run that could not measure the window never
+passes the window budget.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Kod wyjścia, gdy okna nie dało się zmierzyć (brak ekranu), a import przeszedł
+SKIPPED = 2
+
+# Moduły silnika, które mają się ładować dopiero przy pierwszym transferze/purge
+LAZY_MODULES = (
+    "background_tasks", "value_transfer", "value_purge", "sections", "config_cache",
+    "records", "splice", "run_report", "robot_model",
+)
+
+# Skrypt uruchamiany w nowym interpreterze: pierwsze okno, potem od razu koniec
+WINDOW_SCRIPT = """
+import sys
+import tkinter as tk
+from ui import FileTransferApp
+root = tk.Tk()
+FileTransferApp(root)
+root.update()
+print("window", flush=True)
+print(",".join(name for name in {lazy!r} if name in sys.modules), flush=True)
+root.destroy()
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output into {module: (self us, cumulative us)}.
+    """
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure_imports():
+    """
+    Import ui in a fresh interpreter; return {module: (self us, cumulative us)}.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import ui"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_window():
+    """
+    Start a fresh interpreter that opens the main window.
+
+    Returns:
+        tuple: (seconds from process start to the first drawn window, engine
+        modules loaded by then) or None if no display is available.
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", WINDOW_SCRIPT.format(lazy=LAZY_MODULES)],
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    ready = process.stdout.readline()
+    elapsed = time.perf_counter() - started
+    loaded, _ = process.communicate()
+    if ready.strip() != "window":
+        return None
+    return elapsed, [name for name in loaded.strip().split(",") if name]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="runs; the best is reported (default: 5)")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list (default: 10)")
+    parser.add_argument(
+        "--import-budget-ms", type=float, default=150.0,
+        help="maximum cumulative import time of ui (default: 150)"
+    )
+    parser.add_argument(
+        "--window-budget-ms", type=float, default=1500.0,
+        help="maximum time from process start to the first window (default: 1500)"
+    )
+    args = parser.parse_args(argv)
+
+    runs = [measure_imports() for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times["ui"][1])
+    import_ms = best["ui"][1] / 1000
+    print(f"{'module':32} {'self ms':>9} {'cumul. ms':>10}")
+    for name, (self_us, cumulative_us) in sorted(best.items(), key=lambda item: item[1][1], reverse=True)[:args.top]:
+        print(f"{name:32} {self_us / 1000:9.1f} {cumulative_us / 1000:10.1f}")
+
+    failures = []
+    print(f"\nimport ui: {import_ms:.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import ui took {import_ms:.1f} ms, budget {args.import_budget_ms:.0f} ms")
+    eager = [name for name in LAZY_MODULES if name in best]
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+
+    windows = [measure_window() for _ in range(args.repeat)]
+    skipped = None in windows
+    if skipped:
+        print("first window: skipped: no display, window budget not checked")
+    else:
+        window_ms = min(elapsed for elapsed, _ in windows) * 1000
+        print(f"first window: {window_ms:.1f} ms (budget {args.window_budget_ms:.0f} ms)")
+        if window_ms > args.window_budget_ms:
+            failures.append(f"first window took {window_ms:.1f} ms, budget {args.window_budget_ms:.0f} ms")
+        loaded = sorted({name for _, names in windows for name in names})
+        if loaded:
+            failures.append(f"loaded before the first window: {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        return 1
+    if skipped:
+        print("SKIPPED: first window not measured (no display)", file=sys.stderr)
+        return SKIPPED
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Timing suite for the transfer/purge engines on synthetic configs.
+
+    python -m benchmarks.bench_suite [--sizes 10000,100000,1000000] [--repeat 3]
+                                     [--output results.json] [--baseline old.json]
+
+For every size a source and a target file are generated (see
+benchmarks.generator) and the suite times the config index, every handler,
+transfer_values and stream_transfer_values end to end, purge_values, the
+robot model check done by the GUI and the numeric compare. The results are
+written as JSON; with --baseline the run is compared to an earlier one.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generator import generate_config
+from config_cache import config_cache
+from config_index import ConfigIndex
+from robot_model import clear_model_cache, detect_machine_model, detect_robot_model
+from stream_transfer import stream_transfer_values
+from utils.file_utils import read_lines
+from value_compare import compare_configs
+from value_purge import purge_values
+from value_transfer import transfer_values
+from sections import SECTIONS, build_e6axis_name_mapping, section_handler
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+def quiet_log(message, level="INFO", bold=False):
+    pass
+
+
+def time_case(func, setup=None, repeat=3):
+    """
+    Run setup() then func(setup result) repeat times; return the durations of func only.
+    """
+    durations = []
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        started = time.perf_counter()
+        func(state)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def generate_pair(directory, size, record_ratio, crlf):
+    """
+    Generate source.dat and target.dat of about size lines in directory.
+    """
+    records = max(1, int(size * record_ratio))
+    common = {"lines": size, "base": records, "tool": records, "load": records, "e6axis": records}
+    source = os.path.join(directory, "source.dat")
+    target = os.path.join(directory, "target.dat")
+    generate_config(source, crlf=crlf, seed=1, e6axis_prefix="xFFT_HOME", **common)
+    generate_config(target, crlf=crlf, seed=2, e6axis_prefix="XHOME", **common)
+    return source, target
+
+
+def run_size(size, repeat, record_ratio, crlf, directory):
+    source, target = generate_pair(directory, size, record_ratio, crlf)
+    work = os.path.join(directory, "work.dat")
+    source_lines = read_lines(source)
+    target_lines = read_lines(target)
+    source_index = ConfigIndex(source_lines)
+    target_index = ConfigIndex(target_lines)
+
+    def fresh_target():
+        shutil.copyfile(target, work)
+        config_cache.clear()
+        return work
+
+    name_mapping = build_e6axis_name_mapping(source_index, ["xFFT_HOME"], quiet_log)
+
+    def handler_case(section):
+        handler = section_handler(section)
+        # Mapowanie E6AXIS jest uzupełniane w miejscu, więc każdy przebieg dostaje kopię
+        return lambda content: handler(
+            [], content, quiet_log, source_index=source_index, target_index=target_index,
+            name_mapping=dict(name_mapping),
+        )
+
+    cases = [("index", lambda _: ConfigIndex(target_lines), None)]
+    for section in SECTIONS:
+        cases.append((f"handler:{section}", handler_case(section), lambda: list(target_lines)))
+    cases += [
+        ("transfer_values", lambda path: transfer_values(source, path, quiet_log), fresh_target),
+        ("stream_transfer_values", lambda path: stream_transfer_values(source, path, quiet_log), fresh_target),
+        ("purge_values", lambda path: purge_values(path, quiet_log), fresh_target),
+        (
+            "compare_robot_models",
+            lambda _: (detect_robot_model(source), detect_machine_model(target)),
+            clear_model_cache,
+        ),
+        ("compare_configs", lambda _: compare_configs(source, target), config_cache.clear),
+    ]
+
+    results = []
+    for name, func, setup in cases:
+        durations = time_case(func, setup, repeat)
+        results.append({
+            "size": size,
+            "bytes": os.path.getsize(target),
+            "case": name,
+            "best": min(durations),
+            "mean": sum(durations) / len(durations),
+            "repeat": repeat,
+        })
+        print(f"{size:>9} {name:26} {min(durations) * 1000:10.1f} ms", flush=True)
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_to_baseline(results, baseline_path):
+    """
+    Print best times of this run against a previous results file.
+    """
+    with open(baseline_path, 'r') as file:
+        baseline = {(r["size"], r["case"]): r["best"] for r in json.load(file)["results"]}
+    print(f"\n{'size':>9} {'case':26} {'baseline':>10} {'now':>10} {'ratio':>7}")
+    for result in results:
+        old = baseline.get((result["size"], result["case"]))
+        if old:
+            print(
+                f"{result['size']:>9} {result['case']:26} {old * 1000:8.1f}ms {result['best'] * 1000:8.1f}ms "
+                f"{result['best'] / old:6.2f}x"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma-separated file sizes in lines (default: 10000,100000,1000000)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the best is reported (default: 3)")
+    parser.add_argument(
+        "--record-ratio", type=float, default=0.02,
+        help="records per section as a share of the lines (default: 0.02)"
+    )
+    parser.add_argument("--crlf", action="store_true", help="generate CRLF files")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="kuka_ace_bench_") as directory:
+        for size in sizes:
+            results.extend(run_size(size, args.repeat, args.record_ratio, args.crlf, directory))
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "record_ratio": args.record_ratio,
+            "crlf": args.crlf,
+        },
+        "results": results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        compare_to_baseline(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
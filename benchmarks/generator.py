@@ -0,0 +1,166 @@
+"""
+Generator of synthetic but realistic KRL $config.dat files for the benchmarks.
+
+    python -m benchmarks.generator OUT.dat [--lines 100000] [--base 500] [--crlf] [--seed 1]
+
+Records are spread through the file between noise lines (comments, folds,
+other declarations), the ";KR ..." model comment sits near the top and the
+MACHINE_DEF line near the end, as in files exported from a controller.
+"""
+import argparse
+import random
+
+ROBOT_MODELS = ["KR 210", "KR 240", "KR 120", "KR 16"]
+
+
+def _number(rng, low, high):
+    return f"{rng.uniform(low, high):.3f}"
+
+
+def _frame(rng):
+    return (
+        f"X {_number(rng, -2000, 2000)},Y {_number(rng, -2000, 2000)},Z {_number(rng, 0, 2500)},"
+        f"A {_number(rng, -180, 180)},B {_number(rng, -90, 90)},C {_number(rng, -180, 180)}"
+    )
+
+
+def _load(rng):
+    return (
+        f"M {_number(rng, 0, 250)},CM {{{_frame(rng)}}},"
+        f"J {{X {_number(rng, 0, 20)},Y {_number(rng, 0, 20)},Z {_number(rng, 0, 20)}}}"
+    )
+
+
+def _e6axis(rng):
+    robot_axes = ",".join(f"A{i} {_number(rng, -180, 180)}" for i in range(1, 7))
+    external_axes = ",".join(f"E{i} 0.0" for i in range(1, 7))
+    return f"{robot_axes},{external_axes}"
+
+
+def _noise(rng, number, comment_noise):
+    if rng.random() < comment_noise:
+        return rng.choice([
+            f";FOLD generated block {number}",
+            ";ENDFOLD",
+            f"; cell {number % 97} calibration note",
+            "",
+        ])
+    return rng.choice([
+        f"DECL INT COUNTER_{number}=0",
+        f"DECL BOOL FLAG_{number}=FALSE",
+        f"DECL REAL OFFSET_{number}={_number(rng, -10, 10)}",
+        f"DECL FRAME FRAME_{number}={{{_frame(rng)}}}",
+    ])
+
+
+def generate_lines(
+    lines=10000,
+    base=32,
+    tool=16,
+    load=16,
+    e6axis=8,
+    comment_noise=0.3,
+    seed=0,
+    robot_model="KR 210",
+    e6axis_prefix="XHOME",
+):
+    """
+    Return the lines (without line endings) of a synthetic $config.dat.
+
+    Args:
+        lines (int): Approximate total number of lines; the records are padded
+            with noise lines up to this size (never fewer than the records need).
+        base (int): Number of BASE_DATA/BASE_NAME/BASE_TYPE triples.
+        tool (int): Number of TOOL_DATA/TOOL_NAME/TOOL_TYPE triples.
+        load (int): Number of LOAD_DATA records.
+        e6axis (int): Number of E6AXIS records ({e6axis_prefix}1..n).
+        comment_noise (float): Share of the noise lines that are comments/folds/blank.
+        seed (int): Random seed; the same arguments always give the same file.
+        robot_model (str): Model written to the ";KR" comment and MACHINE_DEF.
+        e6axis_prefix (str): Name prefix of the E6AXIS records (XHOME or xFFT_HOME).
+    """
+    rng = random.Random(seed)
+
+    records = []
+    for i in range(1, base + 1):
+        records.append(f"BASE_DATA[{i}]={{{_frame(rng)}}}")
+        records.append(f'BASE_NAME[{i},]="BASE_{i}"')
+        records.append(f"BASE_TYPE[{i}]=#{rng.choice(['NONE', 'BASE'])}")
+    for i in range(1, tool + 1):
+        records.append(f"TOOL_DATA[{i}]={{{_frame(rng)}}}")
+        records.append(f'TOOL_NAME[{i},]="TOOL_{i}"')
+        records.append(f"TOOL_TYPE[{i}]=#{rng.choice(['NONE', 'BASE'])}")
+    for i in range(1, load + 1):
+        records.append(f"LOAD_DATA[{i}]={{{_load(rng)}}}")
+    for i in range(1, e6axis + 1):
+        records.append(f"DECL E6AXIS {e6axis_prefix}{i}={{{_e6axis(rng)}}}")
+
+    header = [
+        "&ACCESS RVP",
+        "&PARAM TEMPLATE = C:\\KRC\\Roboter\\Template\\vorgabe",
+        "DEFDAT $CONFIG",
+        f";{robot_model} R2900",
+    ]
+    footer = [f'MACHINE_DEF[1]={{NAME[] "{robot_model}",COOP_KRC_INDEX 1}}', "ENDDAT"]
+
+    # Szum rozkładamy równomiernie między rekordami
+    noise_count = max(0, lines - len(header) - len(records) - len(footer))
+    slots = len(records) + 1
+    out = list(header)
+    number = 0
+    for slot in range(slots):
+        for _ in range(noise_count // slots + (1 if slot < noise_count % slots else 0)):
+            number += 1
+            out.append(_noise(rng, number, comment_noise))
+        if slot < len(records):
+            out.append(records[slot])
+    out.extend(footer)
+    return out
+
+
+def write_config(path, lines, crlf=False):
+    """
+    Write generated lines to path with LF or CRLF line endings.
+    """
+    newline = "\r\n" if crlf else "\n"
+    with open(path, 'w', newline='') as file:
+        file.write(newline.join(lines) + newline)
+
+
+def generate_config(path, crlf=False, **options):
+    """
+    Generate a synthetic $config.dat at path (options as for generate_lines).
+
+    Returns:
+        int: Number of lines written.
+    """
+    lines = generate_lines(**options)
+    write_config(path, lines, crlf)
+    return len(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="path of the generated file")
+    parser.add_argument("--lines", type=int, default=10000, help="approximate number of lines (default: 10000)")
+    parser.add_argument("--base", type=int, default=32, help="BASE_DATA records (default: 32)")
+    parser.add_argument("--tool", type=int, default=16, help="TOOL_DATA records (default: 16)")
+    parser.add_argument("--load", type=int, default=16, help="LOAD_DATA records (default: 16)")
+    parser.add_argument("--e6axis", type=int, default=8, help="E6AXIS records (default: 8)")
+    parser.add_argument("--e6axis-prefix", default="XHOME", help="E6AXIS name prefix (default: XHOME)")
+    parser.add_argument("--comment-noise", type=float, default=0.3, help="share of comment noise lines (default: 0.3)")
+    parser.add_argument("--robot-model", default="KR 210", help='robot model (default: "KR 210")')
+    parser.add_argument("--crlf", action="store_true", help="write CRLF line endings")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    count = generate_config(
+        args.output, crlf=args.crlf, lines=args.lines, base=args.base, tool=args.tool, load=args.load,
+        e6axis=args.e6axis, comment_noise=args.comment_noise, seed=args.seed,
+        robot_model=args.robot_model, e6axis_prefix=args.e6axis_prefix,
+    )
+    print(f"Wrote {count} lines to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
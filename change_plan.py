@@ -0,0 +1,132 @@
+"""
+Dry-run planning of a transfer: what would change, without writing anything.
+"""
+from config_cache import get_parsed_config
+from patterns import match_line
+from splice import splice_lines
+from value_transfer import apply_transfer
+
+# Liczba linii kontekstu w diffie (jak w diff -u)
+DIFF_CONTEXT = 3
+
+
+def plan_transfer(source_file, target_file, source_index=None, diff=True, **options):
+    """
+    Compute the changes transfer_values would make to target_file.
+
+    The target is parsed through the config cache and the handlers run on a
+    copy of its lines, so nothing is written and a following transfer reuses
+    the parsed target.
+
+    Args:
+        source_file (str): Path of the source $config.dat (ignored if source_index is given).
+        target_file (str): Path of the target $config.dat.
+        source_index (ConfigIndex): Already parsed source (used by fleet plans).
+        diff (bool): Whether to render the unified diff as well.
+        options: Section flags and e6axis_names, as for transfer_values.
+
+    Returns:
+        dict: target, changes (list of dicts with section, key, line, old, new),
+        errors and, if requested, diff (unified diff text).
+    """
+    errors = []
+
+    def log_callback(message, level="INFO", bold=False):
+        if level == "ERROR":
+            errors.append(message)
+
+    plan = {"target": target_file, "changes": [], "errors": errors}
+    if diff:
+        plan["diff"] = ""
+
+    try:
+        if source_index is None:
+            source_index = get_parsed_config(source_file).index
+        target = get_parsed_config(target_file)
+        updated = list(target.lines)
+        apply_transfer(source_index, updated, target.index, log_callback, **options)
+    except Exception as e:
+        errors.append(f"Error during planning: {e}")
+        return plan
+
+    # Ten sam splice co przy zapisie, więc plan pokazuje dokładnie to, co trafi do pliku
+    spliced = splice_lines(target.lines, updated)
+    planned = list(target.lines)
+    for line_no, line in spliced.items():
+        planned[line_no] = line
+
+    line_numbers = sorted(spliced)
+    for line_no in line_numbers:
+        section, key, old_value = match_line(target.lines[line_no])
+        new_match = match_line(planned[line_no])
+        plan["changes"].append({
+            "section": section,
+            "key": key,
+            "line": line_no + 1,
+            "old": old_value.strip(),
+            "new": new_match[2].strip() if new_match else planned[line_no].rstrip("\r\n"),
+        })
+
+    if diff:
+        plan["diff"] = unified_diff(target.lines, planned, line_numbers, target_file)
+    return plan
+
+
+def unified_diff(original, updated, line_numbers, name, context=DIFF_CONTEXT):
+    """
+    Render a unified diff of two line lists of the same length.
+
+    Only the hunks around line_numbers are built, so the cost depends on the
+    number of changes rather than on the file size (unlike difflib).
+    """
+    if not line_numbers:
+        return ""
+
+    # Grupujemy zmiany, których konteksty na siebie nachodzą
+    groups = [[line_numbers[0]]]
+    for line_no in line_numbers[1:]:
+        if line_no - groups[-1][-1] <= 2 * context:
+            groups[-1].append(line_no)
+        else:
+            groups.append([line_no])
+
+    out = [f"--- {name}\n", f"+++ {name} (planned)\n"]
+    for group in groups:
+        start = max(0, group[0] - context)
+        end = min(len(original), group[-1] + context + 1)
+        out.append(f"@@ -{start + 1},{end - start} +{start + 1},{end - start} @@\n")
+        changed = set(group)
+        line_no = start
+        while line_no < end:
+            if line_no not in changed:
+                out.append(" " + _diff_line(original[line_no]))
+                line_no += 1
+                continue
+            # Ciąg kolejnych zmienionych linii: najpierw usunięte, potem dodane
+            run_end = line_no
+            while run_end < end and run_end in changed:
+                run_end += 1
+            out.extend("-" + _diff_line(line) for line in original[line_no:run_end])
+            out.extend("+" + _diff_line(line) for line in updated[line_no:run_end])
+            line_no = run_end
+    return "".join(out)
+
+
+def _diff_line(line):
+    return line.rstrip("\r\n") + "\n"
+
+
+def format_plan(plan):
+    """
+    Return a short text summary of a plan (one line per changed record).
+    """
+    if plan["errors"]:
+        status = "FAILED"
+    elif plan["changes"]:
+        status = f"{len(plan['changes'])} change(s)"
+    else:
+        status = "no changes"
+    out = [f"{plan['target']}: {status}"]
+    for change in plan["changes"]:
+        out.append(f"  {change['section']}[{change['key']}] line {change['line']}: {change['old']} -> {change['new']}")
+    return "\n".join(out)
@@ -0,0 +1,524 @@
+"""
+Headless command-line entry point (no tkinter).
+
+Usage:
+    python -m cli transfer SOURCE TARGET [--no-e6axis] [--e6axis-names xFFT_HOME]
+    python -m cli purge TARGET [--no-base-name] [--no-modify-directly]
+    python -m cli batch SOURCE "cells/*/$config.dat" [--workers 8] [--json]
+    python -m cli plan SOURCE "cells/*/$config.dat" [--json]
+    python -m cli compare SOURCE "cells/*/$config.dat" [--abs-tol 0.01] [--tol TOOL_DATA.X=0.05]
+    python -m cli index fleet.db "cells/*/$config.dat" [--prune]
+    python -m cli query fleet.db --section TOOL_DATA --where "Z>300" [--robot KR210] [--json]
+    python -m cli project ROBOT_DIR_OR_ZIP [--workers 8] [--json]
+    python -m cli project-transfer SOURCE_DIR_OR_ZIP TARGET_DIR_OR_ZIP [--no-e6axis]
+    python -m cli project-purge TARGET_DIR_OR_ZIP [--no-base-name]
+    python -m cli transfer SOURCE TARGET --backup-store backups/
+    python -m cli backups backups/ [TARGET] [--json]
+    python -m cli restore backups/ TARGET [--sha256 PREFIX] [--output PATH]
+"""
+import argparse
+import json
+import sys
+import time
+
+from value_transfer import transfer_values
+from value_purge import purge_values
+from batch_transfer import compare_batch, expand_targets, plan_batch, transfer_batch
+from change_plan import format_plan
+from fleet_index import FleetIndex, parse_condition
+from value_compare import COMPARE_SECTIONS, Tolerances, format_comparison, parse_tolerance
+from stream_transfer import stream_transfer_values
+from progress import ProgressReporter, format_progress
+from project import load_project, purge_project, transfer_project
+from run_report import RunReport
+from utils.backup_store import BackupStore
+from utils.file_utils import prepare_target_file
+
+# (nazwa opcji CLI, nazwa argumentu funkcji transfer_values/purge_values)
+SECTION_FLAGS = [
+    ("base-data", "update_base_data_flag"),
+    ("base-name", "update_base_name_flag"),
+    ("base-type", "update_base_type_flag"),
+    ("tool-data", "update_tool_data_flag"),
+    ("tool-type", "update_tool_type_flag"),
+    ("tool-name", "update_tool_name_flag"),
+    ("load-data", "update_load_data_flag"),
+    ("e6axis", "update_e6axis_flag"),
+]
+
+
+class ConsoleLog:
+    """
+    log_callback compatible printer that remembers whether an error was logged.
+    """
+
+    def __init__(self, quiet=False):
+        self.quiet = quiet
+        self.errors = 0
+
+    def __call__(self, message, level="INFO", bold=False):
+        if level == "ERROR":
+            self.errors += 1
+        if self.quiet and level not in ("WARNING", "ERROR"):
+            return
+        stream = sys.stderr if level in ("WARNING", "ERROR") else sys.stdout
+        print(f"[{level}] {message}", file=stream)
+
+
+def print_progress(snapshot):
+    end = "\n" if snapshot["done"] else "\r"
+    print(format_progress(snapshot), end=end, file=sys.stderr, flush=True)
+
+
+def make_progress(args):
+    return ProgressReporter(callback=print_progress, min_interval=0.5) if args.progress else None
+
+
+def print_report(report, args):
+    """
+    Print the run report as a table (unless --quiet), as JSON to --report-json and the profile to stderr.
+    """
+    if not args.quiet:
+        print(report.format())
+    if args.report_json == "-":
+        print(report.to_json())
+    elif args.report_json:
+        with open(args.report_json, 'w') as file:
+            file.write(report.to_json())
+    if report.profile_text:
+        print(report.profile_text, file=sys.stderr)
+
+
+def add_section_arguments(parser):
+    """
+    Add the --<section>/--no-<section> flags to a subcommand.
+    """
+    for option, dest in SECTION_FLAGS:
+        parser.add_argument(
+            f"--{option}", dest=dest, action=argparse.BooleanOptionalAction, default=True,
+            help=f"process {option.upper().replace('-', '_')} (default: on)"
+        )
+
+
+def add_common_arguments(parser):
+    """
+    Add the section flags and the modify-directly option to a subcommand.
+    """
+    add_section_arguments(parser)
+    parser.add_argument(
+        "--modify-directly", action=argparse.BooleanOptionalAction, default=True,
+        help="edit the target in place instead of a timestamped copy (default: on)"
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print warnings and errors")
+    parser.add_argument("--progress", action="store_true", help="print progress to stderr")
+    parser.add_argument(
+        "--backup-store", metavar="DIR",
+        help="save the pre-edit content of every target in DIR (deduplicated, compressed; see the restore command) "
+             "and edit the target in place instead of a timestamped copy"
+    )
+
+
+def add_report_arguments(parser):
+    """
+    Add the run report options (see run_report.RunReport) to a subcommand.
+    """
+    parser.add_argument("--report-json", metavar="PATH", help="write the run report as JSON ('-' for stdout)")
+    parser.add_argument("--profile", action="store_true", help="run under cProfile and print the top functions to stderr")
+
+
+def open_backup_store(args):
+    return BackupStore(args.backup_store) if args.backup_store else None
+
+
+def section_flags(args):
+    return {dest: getattr(args, dest) for _, dest in SECTION_FLAGS}
+
+
+def run_transfer_command(args):
+    log = ConsoleLog(args.quiet)
+    target_file = prepare_target_file(args.target, args.modify_directly, log, open_backup_store(args))
+    if not target_file:
+        return 1
+
+    report = RunReport(profile=args.profile)
+    engine = stream_transfer_values if args.streaming else transfer_values
+    engine(
+        args.source, target_file, log,
+        e6axis_names=[name.strip() for name in args.e6axis_names.split(",")],
+        progress=make_progress(args),
+        report=report,
+        **section_flags(args)
+    )
+    print_report(report, args)
+    return 1 if log.errors else 0
+
+
+def run_purge_command(args):
+    log = ConsoleLog(args.quiet)
+    target_file = prepare_target_file(args.target, args.modify_directly, log, open_backup_store(args))
+    if not target_file:
+        return 1
+
+    report = RunReport(profile=args.profile)
+    try:
+        purge_values(target_file, log, progress=make_progress(args), report=report, **section_flags(args))
+    except Exception as e:
+        log(f"Error during purge: {e}", level="ERROR")
+    print_report(report, args)
+    return 1 if log.errors else 0
+
+
+def run_batch_command(args):
+    summaries = transfer_batch(
+        args.source, args.targets, workers=args.workers, modify_directly=args.modify_directly,
+        streaming=args.streaming, backup_store=args.backup_store,
+        e6axis_names=[name.strip() for name in args.e6axis_names.split(",")],
+        **section_flags(args)
+    )
+
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+    else:
+        for summary in summaries:
+            status = "FAILED" if summary["errors"] else "OK"
+            changed = ", ".join(summary["changed_sections"]) or "no changes"
+            print(f"{status:6} {summary['duration']:7.2f}s  {summary['target']}  ({changed})")
+            for error in summary["errors"]:
+                print(f"       {error}", file=sys.stderr)
+        print(f"{len(summaries)} target(s), {sum(1 for s in summaries if s['errors'])} failed")
+
+    if not summaries:
+        print("No target files matched.", file=sys.stderr)
+        return 1
+    return 1 if any(summary["errors"] for summary in summaries) else 0
+
+
+def run_plan_command(args):
+    plans = plan_batch(
+        args.source, args.targets, workers=args.workers, diff=not args.json,
+        e6axis_names=[name.strip() for name in args.e6axis_names.split(",")],
+        **section_flags(args)
+    )
+
+    if args.json:
+        print(json.dumps(plans, indent=2))
+    else:
+        for plan in plans:
+            sys.stdout.write(plan["diff"])
+        for plan in plans:
+            print(format_plan(plan) if args.verbose else format_plan(plan).splitlines()[0])
+            for error in plan["errors"]:
+                print(f"       {error}", file=sys.stderr)
+        print(
+            f"{len(plans)} target(s), {sum(1 for p in plans if p['changes'])} with changes, "
+            f"{sum(len(p['changes']) for p in plans)} change(s) in total"
+        )
+
+    if not plans:
+        print("No target files matched.", file=sys.stderr)
+        return 1
+    return 1 if any(plan["errors"] for plan in plans) else 0
+
+
+def run_compare_command(args):
+    try:
+        tolerances = Tolerances(args.abs_tol, args.rel_tol, dict(parse_tolerance(text) for text in args.tol))
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    sections = [section.strip().upper() for section in args.sections.split(",")]
+    unknown = [section for section in sections if section not in COMPARE_SECTIONS]
+    if unknown:
+        print(f"[ERROR] Unknown section(s): {', '.join(unknown)}", file=sys.stderr)
+        return 1
+
+    reports = compare_batch(
+        args.source, args.targets, workers=args.workers, tolerances=tolerances, sections=sections,
+        e6axis_names=[name.strip() for name in args.e6axis_names.split(",")],
+    )
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print(format_comparison(report))
+            for error in report["errors"]:
+                print(f"       {error}", file=sys.stderr)
+        outside = sum(1 for r in reports if r["differences"] or r["missing"])
+        print(f"{len(reports)} target(s), {outside} out of tolerance")
+
+    if not reports:
+        print("No target files matched.", file=sys.stderr)
+        return 1
+    return 1 if any(r["errors"] or r["differences"] or r["missing"] for r in reports) else 0
+
+
+def run_index_command(args):
+    log = ConsoleLog(args.quiet)
+    started = time.perf_counter()
+    with FleetIndex(args.database) as index:
+        stats = index.update(expand_targets(args.targets), prune=args.prune, log_callback=log)
+    print(
+        f"{stats['indexed']} indexed, {stats['touched']} touched, {stats['unchanged']} unchanged, "
+        f"{stats['removed']} removed, {stats['failed']} failed ({time.perf_counter() - started:.2f}s)"
+    )
+    return 1 if stats["failed"] else 0
+
+
+def run_query_command(args):
+    try:
+        conditions = [parse_condition(text) for text in args.where]
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    with FleetIndex(args.database) as index:
+        if args.files:
+            rows = index.files()
+        else:
+            rows = index.query(
+                section=args.section.upper() if args.section else None, key=args.key, value=args.value,
+                conditions=conditions, robot_model=args.robot, path=args.path, limit=args.limit,
+            )
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    elif args.files:
+        for row in rows:
+            print(f"{row['robot_model'] or '-':10} {row['records']:7} {row['path']}")
+        print(f"{len(rows)} file(s) ({elapsed * 1000:.1f} ms)")
+    else:
+        for row in rows:
+            print(f"{row['path']}:{row['line_no'] + 1}: {row['section']}[{row['key']}] {row['value']}")
+        print(f"{len(rows)} record(s) in {len({row['path'] for row in rows})} file(s) ({elapsed * 1000:.1f} ms)")
+    return 0 if rows else 1
+
+
+def run_project_command(args):
+    log = ConsoleLog()
+    started = time.perf_counter()
+    project = load_project(args.root, workers=args.workers, log_callback=log)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({
+            "root": project.root, "robot_model": project.robot_model, "machine_model": project.machine_model,
+            "files": project.summary(),
+        }, indent=2))
+    else:
+        for item in project.summary():
+            counts = ", ".join(f"{section} {count}" for section, count in item["records"].items()) or "no records"
+            print(f"{item['kind']:8} {item['file']}  ({counts})")
+        print(
+            f"{len(project.files)} file(s), robot {project.robot_model or '-'}, machine {project.machine_model or '-'} "
+            f"({elapsed:.2f}s)"
+        )
+    return 1 if log.errors else 0
+
+
+def run_project_transfer_command(args):
+    log = ConsoleLog(args.quiet)
+    source = load_project(args.source, workers=args.workers, log_callback=log)
+    target = load_project(args.target, workers=args.workers, log_callback=log)
+    changed = transfer_project(
+        source, target, log, modify_directly=args.modify_directly, backup_store=open_backup_store(args),
+        e6axis_names=[name.strip() for name in args.e6axis_names.split(",")],
+        **section_flags(args)
+    )
+    for relative, sections in changed.items():
+        print(f"{relative}: {', '.join(sections) or 'no changes'}")
+    return 1 if log.errors else 0
+
+
+def run_project_purge_command(args):
+    log = ConsoleLog(args.quiet)
+    target = load_project(args.target, workers=args.workers, log_callback=log)
+    purged = purge_project(
+        target, log, modify_directly=args.modify_directly, backup_store=open_backup_store(args), **section_flags(args)
+    )
+    print(f"{len(purged)} file(s) purged")
+    return 1 if log.errors else 0
+
+
+def run_backups_command(args):
+    store = BackupStore(args.store)
+    entries = store.entries(args.target)
+    stats = store.stats()
+
+    if args.json:
+        print(json.dumps({"entries": entries, "stats": stats}, indent=2))
+    else:
+        for entry in entries:
+            print(f"{entry['timestamp']}  {entry['sha256'][:12]}  {entry['size']:>10}  {entry['path']}")
+        print(
+            f"{stats['backups']} backup(s) of {stats['objects']} distinct version(s): "
+            f"{stats['backed_up_bytes']} bytes backed up, {stats['stored_bytes']} bytes stored"
+        )
+    return 0
+
+
+def run_restore_command(args):
+    store = BackupStore(args.store)
+    try:
+        entry = store.restore(args.target, sha256=args.sha256, destination=args.output)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    print(f"Restored {entry['path']} from {entry['timestamp']} ({entry['sha256'][:12]}) to {args.output or entry['path']}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="kuka-ace", description="KUKA ACE (Automated Config Edit) without the GUI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    transfer_parser = subparsers.add_parser("transfer", help="copy values from SOURCE into TARGET")
+    transfer_parser.add_argument("source", help="source $config.dat")
+    transfer_parser.add_argument("target", help="target $config.dat")
+    transfer_parser.add_argument(
+        "--e6axis-names", default="xFFT_HOME",
+        help="comma-separated E6AXIS source names (default: xFFT_HOME)"
+    )
+    transfer_parser.add_argument(
+        "--streaming", action="store_true",
+        help="stream the target line by line instead of loading it (for very large files)"
+    )
+    add_common_arguments(transfer_parser)
+    add_report_arguments(transfer_parser)
+    transfer_parser.set_defaults(func=run_transfer_command)
+
+    purge_parser = subparsers.add_parser("purge", help="reset values in TARGET to defaults")
+    purge_parser.add_argument("target", help="target $config.dat")
+    add_common_arguments(purge_parser)
+    add_report_arguments(purge_parser)
+    purge_parser.set_defaults(func=run_purge_command)
+
+    batch_parser = subparsers.add_parser("batch", help="copy values from SOURCE into many targets in parallel")
+    batch_parser.add_argument("source", help="source $config.dat")
+    batch_parser.add_argument("targets", nargs="+", help="target files or glob patterns")
+    batch_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    batch_parser.add_argument("--json", action="store_true", help="print the per-target summary as JSON")
+    batch_parser.add_argument(
+        "--e6axis-names", default="xFFT_HOME",
+        help="comma-separated E6AXIS source names (default: xFFT_HOME)"
+    )
+    batch_parser.add_argument(
+        "--streaming", action="store_true",
+        help="stream the target line by line instead of loading it (for very large files)"
+    )
+    add_common_arguments(batch_parser)
+    batch_parser.set_defaults(func=run_batch_command)
+
+    plan_parser = subparsers.add_parser("plan", help="show what a transfer would change (dry run, nothing is written)")
+    plan_parser.add_argument("source", help="source $config.dat")
+    plan_parser.add_argument("targets", nargs="+", help="target files or glob patterns")
+    plan_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    plan_parser.add_argument("--json", action="store_true", help="print the planned changes as JSON instead of a diff")
+    plan_parser.add_argument("-v", "--verbose", action="store_true", help="list every planned change in the summary")
+    plan_parser.add_argument(
+        "--e6axis-names", default="xFFT_HOME",
+        help="comma-separated E6AXIS source names (default: xFFT_HOME)"
+    )
+    add_section_arguments(plan_parser)
+    plan_parser.set_defaults(func=run_plan_command)
+
+    compare_parser = subparsers.add_parser("compare", help="compare numeric values of targets against SOURCE within tolerances")
+    compare_parser.add_argument("source", help="reference $config.dat")
+    compare_parser.add_argument("targets", nargs="+", help="target files or glob patterns")
+    compare_parser.add_argument("--abs-tol", type=float, default=0.0, help="default absolute tolerance (default: 0)")
+    compare_parser.add_argument("--rel-tol", type=float, default=0.0, help="default relative tolerance (default: 0)")
+    compare_parser.add_argument(
+        "--tol", action="append", default=[], metavar="AXIS=ABS[:REL]",
+        help="per-axis tolerance, e.g. X=0.05, A1=0.01 or TOOL_DATA.M=0:0.02 (repeatable)"
+    )
+    compare_parser.add_argument(
+        "--sections", default=",".join(COMPARE_SECTIONS),
+        help=f"comma-separated sections to compare (default: {','.join(COMPARE_SECTIONS)})"
+    )
+    compare_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    compare_parser.add_argument("--json", action="store_true", help="print the reports as JSON")
+    compare_parser.add_argument(
+        "--e6axis-names", default="xFFT_HOME",
+        help="comma-separated E6AXIS source names (default: xFFT_HOME)"
+    )
+    compare_parser.set_defaults(func=run_compare_command)
+
+    index_parser = subparsers.add_parser("index", help="parse config files into a SQLite index for fleet-wide queries")
+    index_parser.add_argument("database", help="SQLite database file (created if missing)")
+    index_parser.add_argument("targets", nargs="+", help="config files or glob patterns")
+    index_parser.add_argument("--prune", action="store_true", help="drop indexed files that no longer exist")
+    index_parser.add_argument("-q", "--quiet", action="store_true", help="only print warnings and errors")
+    index_parser.set_defaults(func=run_index_command)
+
+    query_parser = subparsers.add_parser("query", help="search the records of all indexed files")
+    query_parser.add_argument("database", help="SQLite database built with the index command")
+    query_parser.add_argument("--section", help="section name, e.g. TOOL_DATA or BASE_NAME")
+    query_parser.add_argument("--key", help="array index or E6AXIS name (wildcards allowed, e.g. 'XHOME*')")
+    query_parser.add_argument("--value", help="exact value text of names/types (wildcards allowed, e.g. 'FIX_*')")
+    query_parser.add_argument(
+        "--where", action="append", default=[], metavar="AXIS<op>NUMBER",
+        help="numeric condition on an axis, e.g. 'Z>300' or 'A1<=-90' (repeatable, all must hold)"
+    )
+    query_parser.add_argument("--robot", help="only files of this robot model, e.g. KR210")
+    query_parser.add_argument("--path", help="only files whose path matches this glob pattern")
+    query_parser.add_argument("--limit", type=int, default=None, help="maximum number of records")
+    query_parser.add_argument("--files", action="store_true", help="list the indexed files instead of records")
+    query_parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    query_parser.set_defaults(func=run_query_command)
+
+    project_parser = subparsers.add_parser(
+        "project", help="parse all .dat files of a robot directory or archive and list their records"
+    )
+    project_parser.add_argument("root", help="robot directory, KRC archive .zip or 'archive.zip!/KRC'")
+    project_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    project_parser.add_argument("--json", action="store_true", help="print the project summary as JSON")
+    project_parser.set_defaults(func=run_project_command)
+
+    project_transfer_parser = subparsers.add_parser(
+        "project-transfer", help="transfer $config.dat and program .dat files of a whole robot"
+    )
+    project_transfer_parser.add_argument("source", help="source robot directory or archive")
+    project_transfer_parser.add_argument("target", help="target robot directory or archive")
+    project_transfer_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    project_transfer_parser.add_argument(
+        "--e6axis-names", default="xFFT_HOME",
+        help="comma-separated E6AXIS source names for $config.dat (default: xFFT_HOME)"
+    )
+    add_common_arguments(project_transfer_parser)
+    project_transfer_parser.set_defaults(func=run_project_transfer_command)
+
+    project_purge_parser = subparsers.add_parser(
+        "project-purge", help="reset values in $config.dat and program .dat files of a whole robot"
+    )
+    project_purge_parser.add_argument("target", help="target robot directory or archive")
+    project_purge_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    add_common_arguments(project_purge_parser)
+    project_purge_parser.set_defaults(func=run_project_purge_command)
+
+    backups_parser = subparsers.add_parser("backups", help="list the backups in a backup store")
+    backups_parser.add_argument("store", help="backup store directory (see --backup-store)")
+    backups_parser.add_argument("target", nargs="?", help="only backups of this file")
+    backups_parser.add_argument("--json", action="store_true", help="print the entries and statistics as JSON")
+    backups_parser.set_defaults(func=run_backups_command)
+
+    restore_parser = subparsers.add_parser("restore", help="restore a file from a backup store")
+    restore_parser.add_argument("store", help="backup store directory (see --backup-store)")
+    restore_parser.add_argument("target", help="file to restore, as it was backed up")
+    restore_parser.add_argument(
+        "--sha256", metavar="PREFIX", help="version to restore, by hash prefix (default: the newest backup)"
+    )
+    restore_parser.add_argument("--output", metavar="PATH", help="write the backup here instead of over the target")
+    restore_parser.set_defaults(func=run_restore_command)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import sys
+import threading
+from collections import OrderedDict
+
+from config_index import ConfigIndex
+from robot_model import find_machine_model, find_robot_model
+from utils.file_utils import decode_lines, file_fingerprint, read_file
+
+
+# Przybliżony narzut jednego rekordu indeksu (Record, wpisy w słowniku i liście sekcji) bez tekstu wartości
+RECORD_OVERHEAD = 160
+
+
+class ParsedConfig:
+    """
+    A parsed config file: its lines (original line endings kept), the section
+    index and the detected robot models.
+    """
+
+    def __init__(self, lines, size, data=None):
+        """
+        Args:
+            lines (list): The decoded lines (see decode_lines).
+            size (int): File size when it was read.
+            data (bytes): The raw content; edits are spliced into it (see
+                splice.edit_file_lines), so the file is not read a second time.
+        """
+        self.lines = lines
+        self.data = data
+        self.index = ConfigIndex(lines)
+        self.size = size
+        self.memory = self._estimate_memory()
+        self._robot_model = None
+        self._machine_model = None
+        self._models_detected = False
+
+    def _estimate_memory(self):
+        """
+        Return an estimate of the bytes held by the lines, the raw content and the index.
+        """
+        memory = sys.getsizeof(self.lines) + sum(map(sys.getsizeof, self.lines))
+        if self.data is not None:
+            memory += sys.getsizeof(self.data)
+        for records in self.index.ordered.values():
+            memory += sum(sys.getsizeof(record.value) for record in records) + RECORD_OVERHEAD * len(records)
+        return memory
+
+    def _detect_models(self):
+        if not self._models_detected:
+            self._robot_model = find_robot_model(self.lines)
+            self._machine_model = find_machine_model(self.lines)
+            self._models_detected = True
+
+    @property
+    def robot_model(self):
+        self._detect_models()
+        return self._robot_model
+
+    @property
+    def machine_model(self):
+        self._detect_models()
+        return self._machine_model
+
+
+class ConfigCache:
+    """
+    Process-wide LRU cache of ParsedConfig objects.
+
+    Entries are keyed by file_fingerprint(), so a file that changed on disk is
+    simply parsed again. The cache is bounded both by the number of entries
+    and by the estimated memory of the parsed configs (ParsedConfig.memory:
+    lines, raw content and index, several times the file size).
+    """
+
+    def __init__(self, max_entries=32, max_bytes=512 * 1024 * 1024):
+        """
+        Args:
+            max_entries (int): Cached configs at most.
+            max_bytes (int): Cap on the summed ParsedConfig.memory estimates.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path):
+        """
+        Return the ParsedConfig for path, reading and parsing it on a miss.
+        """
+        key = file_fingerprint(path)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return parsed
+            self.misses += 1
+
+        # Linie z zachowanymi końcami (CRLF), żeby ich długości zgadzały się z bajtami pliku
+        data = read_file(key[0])
+        return self.add(key, ParsedConfig(decode_lines(data), key[2], data))
+
+    def add(self, key, parsed):
+        """
+        Store a config parsed elsewhere (e.g. in a worker process) under its file_fingerprint() key.
+
+        Returns:
+            ParsedConfig: The cached entry (an existing one for the same key wins).
+        """
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            # Starsze wersje tego samego pliku nie będą już potrzebne
+            for old_key in [k for k in self._entries if k[0] == key[0]]:
+                self._remove(old_key)
+            self._entries[key] = parsed
+            self._bytes += parsed.memory
+            self._evict()
+        return parsed
+
+    def _remove(self, key):
+        parsed = self._entries.pop(key)
+        self._bytes -= parsed.memory
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Return hit/miss statistics and the current cache occupancy.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+config_cache = ConfigCache()
+
+
+def get_parsed_config(path):
+    """
+    Return the cached ParsedConfig for path (see ConfigCache.get).
+    """
+    return config_cache.get(path)
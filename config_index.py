@@ -0,0 +1,108 @@
+import re
+from bisect import bisect_left
+from collections import namedtuple
+
+from patterns import SECTION_PATTERNS, match_line
+
+Record = namedtuple("Record", ["line_no", "key", "value"])
+
+_DIGITS = re.compile(r'(\d+)')
+
+
+def natural_key(name):
+    """
+    Sort key that orders numeric suffixes by value (HOME9 before HOME10).
+    """
+    # split z grupą przechwytującą: tekst na pozycjach parzystych, liczby na nieparzystych
+    return tuple(int(part) if position % 2 else part for position, part in enumerate(_DIGITS.split(name)))
+
+
+def _checked_records(records, cancel_token):
+    for record in records:
+        cancel_token.check()
+        yield record
+
+
+class PrefixIndex:
+    """
+    Sorted key list for prefix lookups with bisect (O(log n + matches) per lookup).
+    """
+
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+
+    def with_prefix(self, prefix):
+        """
+        Return all keys starting with prefix, in natural order (see natural_key).
+        """
+        keys = self.keys
+        matches = []
+        for position in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[position].startswith(prefix):
+                break
+            matches.append(keys[position])
+        matches.sort(key=natural_key)
+        return matches
+
+
+class ConfigIndex:
+    """
+    Index of all known $config.dat sections built in a single scan.
+
+    Each record is stored under (section, key), where key is the array index
+    for *_DATA/*_NAME/*_TYPE sections and the variable name for E6AXIS.
+    """
+
+    def __init__(self, lines):
+        """
+        Build the index from file content.
+
+        Args:
+            lines (iterable): The file content (a list from readlines() or an open file).
+        """
+        self.sections = {section: {} for section in SECTION_PATTERNS}
+        self.ordered = {section: [] for section in SECTION_PATTERNS}
+        self.line_count = 0
+        self._prefix_indexes = {}
+
+        for line_no, line in enumerate(lines):
+            matched = match_line(line)
+            if matched:
+                section, key, value = matched
+                record = Record(line_no, key, value)
+                # Przy zdublowanych kluczach wygrywa ostatni wpis (jak w starych handlerach)
+                self.sections[section][key] = record
+                self.ordered[section].append(record)
+            self.line_count = line_no + 1
+
+    def get(self, section, key):
+        """
+        Return the record stored under (section, key) or None.
+        """
+        return self.sections[section].get(key)
+
+    def records(self, section, cancel_token=None):
+        """
+        Return all records of a section in file order, including duplicates.
+
+        With a cancel_token the records are yielded one by one and the token is
+        checked before each of them (cooperative cancellation).
+        """
+        if cancel_token is None:
+            return self.ordered[section]
+        return _checked_records(self.ordered[section], cancel_token)
+
+    def keys(self, section):
+        """
+        Return all keys of a section in file order.
+        """
+        return list(self.sections[section].keys())
+
+    def prefix_index(self, section):
+        """
+        Return the PrefixIndex of a section's keys, built on first use.
+        """
+        index = self._prefix_indexes.get(section)
+        if index is None:
+            index = self._prefix_indexes[section] = PrefixIndex(self.sections[section])
+        return index
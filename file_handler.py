@@ -1,10 +1,11 @@
+from utils.file_utils import open_text, write_lines_atomic
+
 def read_file(file_path):
-    with open(file_path, 'r') as file:
+    with open_text(file_path) as file:
         return file.readlines()
 
 def write_file(file_path, lines):
-    with open(file_path, 'w') as file:
-        file.writelines(lines)
+    return write_lines_atomic(file_path, lines)
 
 def find_value_definition(lines, definition):
     for line in lines:
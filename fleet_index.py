@@ -0,0 +1,386 @@
+"""
+Persistent SQLite index of parsed $config.dat files for fleet-wide queries.
+
+Every file is parsed with the section registry (sections.SECTIONS) into one
+row per record, plus one row per numeric axis of the records that have a
+schema (BASE_DATA, TOOL_DATA, LOAD_DATA, E6AXIS). Re-indexing is
+incremental: a file whose mtime and size did not change is skipped, a file
+whose content hash did not change only gets its mtime updated, and only
+changed files are parsed again. Queries go through indexed tables, so
+searching the whole fleet does not touch the config files at all.
+"""
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config_index import ConfigIndex
+from robot_model import find_machine_model, find_robot_model
+from sections import SECTIONS
+from utils.file_utils import file_exists, file_fingerprint, read_file, split_lines, text_encoding
+
+# Wersja schematu bazy; przy zmianie baza jest budowana od nowa
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    robot_model TEXT,
+    machine_model TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    key TEXT NOT NULL,
+    line_no INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS axis_values (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    key TEXT NOT NULL,
+    axis TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_robot_model ON files (robot_model);
+"""
+
+# Indeksy tabel records/axis_values; przy dużej przebudowie tworzone raz, po wstawieniu wierszy
+RECORD_INDEXES = {
+    "records_section_key": "records (section, key)",
+    "records_file": "records (file_id, section, key)",
+    "axis_values_lookup": "axis_values (section, axis, value)",
+    "axis_values_record": "axis_values (file_id, section, key, axis)",
+}
+
+# Liczba plików zapisywanych w jednej transakcji
+COMMIT_BATCH = 64
+
+# Od tylu nowych plików indeksy są budowane od nowa zamiast aktualizowane wiersz po wierszu
+BULK_THRESHOLD = 64
+
+# Operatory dozwolone w warunkach --where
+OPERATORS = ("<=", ">=", "!=", "=", "<", ">")
+
+_CONDITION = re.compile(r'^\s*(\w+)\s*(<=|>=|!=|=|<|>)\s*(\S+)\s*$')
+
+
+def parse_condition(text):
+    """
+    Parse "AXIS<op>NUMBER" (e.g. "Z>300" or "A1<=-90") into (axis, op, number).
+    """
+    match = _CONDITION.match(text)
+    if not match:
+        raise ValueError(f"Invalid condition '{text}', expected AXIS<op>NUMBER with op one of {' '.join(OPERATORS)}")
+    axis, op, number = match.groups()
+    try:
+        return axis.upper(), op, float(number)
+    except ValueError:
+        raise ValueError(f"Invalid number in condition '{text}'") from None
+
+
+def parse_config_rows(data):
+    """
+    Parse the bytes of a config file into index rows.
+
+    Returns:
+        tuple: (robot model, machine model, [(section, key, line_no, value)],
+        [(section, key, axis, value)]); NaN axes are left out.
+    """
+    lines = split_lines(data.decode(text_encoding()))
+    index = ConfigIndex(lines)
+    records = []
+    axis_values = []
+    for name, spec in SECTIONS.items():
+        for record in index.sections.get(name, {}).values():
+            key = str(record.key)
+            records.append((name, key, record.line_no, record.value.strip()))
+            if spec.schema is None:
+                continue
+            parsed = spec.parse_value(record.value)
+            if parsed is None:
+                continue
+            for axis, value in zip(spec.schema.AXES, parsed.values):
+                if not math.isnan(value):
+                    axis_values.append((name, key, axis, value))
+    return find_robot_model(lines), find_machine_model(lines), records, axis_values
+
+
+def scan_file(path, known_sha1=None):
+    """
+    Read, hash and parse one config file (runs in a worker process).
+
+    Returns:
+        dict: path, mtime_ns, size, sha1 and rows (parse_config_rows) or
+        None for rows when the content hash equals known_sha1.
+    """
+    path, mtime_ns, size = file_fingerprint(path)
+    data = read_file(path)
+    sha1 = hashlib.sha1(data).hexdigest()
+    rows = None if sha1 == known_sha1 else parse_config_rows(data)
+    return {"path": path, "mtime_ns": mtime_ns, "size": size, "sha1": sha1, "rows": rows}
+
+
+def _scan_files(stale, workers):
+    """
+    Yield (path, scan_file result or the exception it raised) for [(path, known sha1)].
+    """
+    if len(stale) <= 1 or workers == 1:
+        for path, known_sha1 in stale:
+            try:
+                yield path, scan_file(path, known_sha1)
+            except (OSError, UnicodeDecodeError) as e:
+                yield path, e
+        return
+
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(scan_file, path, known_sha1) for path, known_sha1 in stale]
+        for (path, _), future in zip(stale, futures):
+            try:
+                yield path, future.result()
+            except Exception as e:
+                yield path, e
+
+
+class FleetIndex:
+    """
+    SQLite database of indexed config files.
+
+    Use as a context manager or call close(). One FleetIndex is meant for one
+    thread; separate processes may share the database file.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            with self.connection:
+                for table in ("axis_values", "records", "files"):
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self._create_indexes()
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _create_indexes(self):
+        for name, columns in RECORD_INDEXES.items():
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {columns}")
+
+    def _drop_indexes(self):
+        for name in RECORD_INDEXES:
+            self.connection.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def update(self, paths, prune=False, log_callback=None, workers=None):
+        """
+        Bring the index up to date with paths.
+
+        Files whose mtime or size changed are read, hashed and parsed in a
+        process pool (see scan_file); the rows are written here, in batches
+        of COMMIT_BATCH files per transaction. When at least BULK_THRESHOLD
+        files are new to the index, the record indexes are dropped first and
+        built once at the end, which is much faster than updating them for
+        every inserted row.
+
+        Args:
+            paths (list): Config files to index.
+            prune (bool): Also drop indexed files that no longer exist on disk.
+            log_callback (function): Receives one message per parsed, removed or failed file.
+            workers (int): Number of worker processes (default: CPU count).
+
+        Returns:
+            dict: Numbers of files indexed, touched (only mtime changed),
+            unchanged, removed and failed.
+        """
+        if log_callback is None:
+            log_callback = lambda message, level="INFO", bold=False: None
+        stats = {"indexed": 0, "touched": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        known = {
+            path: (file_id, mtime_ns, size, sha1)
+            for file_id, path, mtime_ns, size, sha1 in self.connection.execute(
+                "SELECT id, path, mtime_ns, size, sha1 FROM files"
+            )
+        }
+
+        stale = []
+        fingerprints = {}
+        for path in paths:
+            try:
+                fingerprint = file_fingerprint(path)
+            except OSError as e:
+                log_callback(f"Error indexing {path}: {e}", level="ERROR")
+                stats["failed"] += 1
+                continue
+            fingerprints[fingerprint[0]] = fingerprint
+        for path, mtime_ns, size in fingerprints.values():
+            entry = known.get(path)
+            if entry is not None and entry[1] == mtime_ns and entry[2] == size:
+                stats["unchanged"] += 1
+            else:
+                stale.append((path, entry[3] if entry else None))
+
+        bulk = sum(1 for _, known_sha1 in stale if known_sha1 is None) >= BULK_THRESHOLD
+        if bulk:
+            self._drop_indexes()
+        pending = 0
+        for path, scanned in _scan_files(stale, workers):
+            if isinstance(scanned, Exception):
+                log_callback(f"Error indexing {path}: {scanned}", level="ERROR")
+                stats["failed"] += 1
+                continue
+            stats[self._store(scanned, known.get(path), log_callback)] += 1
+            pending += 1
+            if pending >= COMMIT_BATCH:
+                self.connection.commit()
+                pending = 0
+
+        if prune:
+            for path, (file_id, *_) in known.items():
+                if not file_exists(path):
+                    self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                    log_callback(f"Removed {path} from the index.", level="INFO")
+                    stats["removed"] += 1
+        if bulk:
+            self._create_indexes()
+        self.connection.commit()
+
+        if stats["indexed"] or stats["removed"] or bulk:
+            # Statystyki dla planera zapytań; bez nich zapytania bez --section skanują całą flotę
+            self.connection.execute("ANALYZE")
+        return stats
+
+    def _store(self, scanned, known, log_callback):
+        """
+        Write the result of scan_file; returns the stats key ("indexed" or "touched").
+        """
+        if scanned["rows"] is None:
+            self.connection.execute(
+                "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                (scanned["mtime_ns"], scanned["size"], known[0]),
+            )
+            return "touched"
+
+        robot_model, machine_model, records, axis_values = scanned["rows"]
+        if known is not None:
+            self.connection.execute("DELETE FROM files WHERE id = ?", (known[0],))
+        file_id = self.connection.execute(
+            "INSERT INTO files (path, mtime_ns, size, sha1, robot_model, machine_model, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                scanned["path"], scanned["mtime_ns"], scanned["size"], scanned["sha1"],
+                robot_model, machine_model, time.time(),
+            ),
+        ).lastrowid
+        self.connection.executemany(
+            "INSERT INTO records (file_id, section, key, line_no, value) VALUES (?, ?, ?, ?, ?)",
+            [(file_id, *row) for row in records],
+        )
+        self.connection.executemany(
+            "INSERT INTO axis_values (file_id, section, key, axis, value) VALUES (?, ?, ?, ?, ?)",
+            [(file_id, *row) for row in axis_values],
+        )
+        log_callback(f"Indexed {scanned['path']}: {len(records)} record(s).", level="INFO")
+        return "indexed"
+
+    def files(self):
+        """
+        Return one dict per indexed file (path, robot_model, machine_model, size, records).
+        """
+        rows = self.connection.execute(
+            "SELECT f.path, f.robot_model, f.machine_model, f.size, "
+            "(SELECT COUNT(*) FROM records r WHERE r.file_id = f.id) "
+            "FROM files f ORDER BY f.path"
+        )
+        return [
+            {"path": path, "robot_model": robot, "machine_model": machine, "size": size, "records": count}
+            for path, robot, machine, size, count in rows
+        ]
+
+    def query(self, section=None, key=None, value=None, conditions=(), robot_model=None, path=None, limit=None):
+        """
+        Find records across all indexed files.
+
+        Args:
+            section (str): Section name, e.g. "TOOL_DATA".
+            key (str): Array index or E6AXIS name; GLOB wildcards allowed ("XHOME*").
+            value (str): Record value text (names, types); GLOB wildcards allowed ("FIX_*").
+            conditions (list): (axis, op, number) tuples from parse_condition, all
+                of which must hold for the same record.
+            robot_model (str): Only files of this robot model (e.g. "KR210").
+            path (str): Only files whose path matches this GLOB pattern.
+            limit (int): Maximum number of rows.
+
+        Returns:
+            list: One dict per record: path, robot_model, section, key, line_no, value.
+        """
+        joins = []
+        where = []
+        params = []
+        for number, (axis, op, threshold) in enumerate(conditions):
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown operator '{op}'")
+            alias = f"a{number}"
+            # section = r.section zamiast stałej, bo warunki bez --section dotyczą każdej sekcji z tą osią
+            joins.append(
+                f"JOIN axis_values {alias} ON {alias}.file_id = r.file_id AND {alias}.section = r.section "
+                f"AND {alias}.key = r.key AND {alias}.axis = ? AND {alias}.value {op} ?"
+            )
+            params.extend([axis, threshold])
+        if section is not None:
+            where.append("r.section = ?")
+            params.append(section)
+        if key is not None:
+            where.append("r.key GLOB ?" if _has_wildcards(key) else "r.key = ?")
+            params.append(key)
+        if value is not None:
+            where.append("r.value GLOB ?" if _has_wildcards(value) else "r.value = ?")
+            params.append(value)
+        if robot_model is not None:
+            where.append("f.robot_model = ?")
+            params.append(robot_model.replace(" ", "").upper())
+        if path is not None:
+            where.append("f.path GLOB ?")
+            params.append(path)
+
+        sql = (
+            "SELECT f.path, f.robot_model, r.section, r.key, r.line_no, r.value "
+            "FROM records r JOIN files f ON f.id = r.file_id " + " ".join(joins)
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY f.path, r.line_no"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            {"path": path, "robot_model": robot, "section": sec, "key": k, "line_no": line_no, "value": text}
+            for path, robot, sec, k, line_no, text in self.connection.execute(sql, params)
+        ]
+
+
+def _has_wildcards(pattern):
+    return any(char in pattern for char in "*?[")
@@ -0,0 +1,267 @@
+import collections
+import os
+import queue
+import threading
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job when its cancel token was triggered.
+
+    Like KeyboardInterrupt it derives from BaseException, so the engines'
+    generic "except Exception" error logging does not swallow it.
+    """
+
+
+class CancelToken:
+    """
+    Cooperative cancellation flag checked by the engines between records.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """
+        Raise JobCancelled if cancellation was requested.
+        """
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class Job:
+    """
+    A transfer or purge running in a background thread.
+
+    The function is called with an extra cancel_token keyword argument and is
+    expected to pass it down to the engine.
+    """
+
+    def __init__(self, name, func, *args, target=None, progress=None, **kwargs):
+        """
+        Args:
+            target (str): File the job writes; a JobExecutor never runs two
+                jobs with the same target at once.
+            progress (ProgressReporter): The job's own progress counters (the
+                func gets them through its arguments); the GUI polls them.
+        """
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.target = target_key(target) if target else None
+        self.progress = progress
+        self.cancel_token = CancelToken()
+        self.state = "queued"
+        self.error = None
+        self.result = None
+        self.thread = None
+        self._finished = threading.Event()
+
+    def run(self):
+        if self.cancel_token.cancelled:
+            # Anulowane jeszcze w kolejce - nie uruchamiamy wcale
+            self.state = "cancelled"
+            self._finished.set()
+            return
+        self.state = "running"
+        try:
+            self.result = self.func(*self.args, cancel_token=self.cancel_token, **self.kwargs)
+            self.state = "done"
+        except JobCancelled:
+            self.state = "cancelled"
+        except Exception as e:
+            self.error = e
+            self.state = "failed"
+        finally:
+            self._finished.set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def wait(self, timeout=None):
+        """
+        Block until the job finished; returns False on timeout.
+        """
+        return self._finished.wait(timeout)
+
+    @property
+    def finished(self):
+        return self.state in ("done", "failed", "cancelled")
+
+    def percent(self):
+        """
+        Return the completed percentage from the job's progress counters (None without them).
+        """
+        if self.progress is None:
+            return None
+        return 100.0 if self.state == "done" else round(self.progress.fraction() * 100.0, 1)
+
+
+def target_key(path):
+    """
+    Normalise a target path so that the same file always gives the same key.
+
+    Members of one archive share the archive's key: writing any of them
+    rebuilds the whole zip, so such jobs must not run at the same time.
+    """
+    from utils.file_utils import disk_path  # zipfile nie jest potrzebny przy starcie GUI
+
+    return os.path.normcase(os.path.realpath(disk_path(path)))
+
+
+class JobExecutor:
+    """
+    Bounded job queue owned by the application.
+
+    At most max_workers jobs run at once on reused worker threads; queued
+    jobs start in submission order, except that a job waits while another
+    job with the same target is running (so two jobs never write the same
+    file at once, and jobs on one target run in the order they were queued).
+    """
+
+    def __init__(self, max_workers=2, max_queued=100, history=50):
+        """
+        Args:
+            max_workers (int): Jobs running at the same time.
+            max_queued (int): Jobs waiting in the queue; submit() raises queue.Full beyond that.
+            history (int): Finished jobs kept for jobs().
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.history = history
+        self._queue = collections.deque()
+        self._jobs = []
+        self._running_targets = set()
+        self._workers = []
+        self._idle = 0
+        self._stopping = False
+        self._condition = threading.Condition()
+
+    def submit(self, job):
+        """
+        Queue a job; returns the job.
+        """
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("JobExecutor is shut down")
+            if len(self._queue) >= self.max_queued:
+                raise queue.Full(f"Job queue is full ({self.max_queued} jobs)")
+            self._queue.append(job)
+            self._jobs.append(job)
+            self._trim_history()
+            # Powiadomiony wątek liczy się jako bezczynny, dopóki się nie obudzi, więc
+            # porównujemy z długością kolejki, a nie tylko sprawdzamy, czy jakiś czeka
+            if len(self._queue) > self._idle and len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._work, name=f"job-worker-{len(self._workers) + 1}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._condition.notify()
+        return job
+
+    def _trim_history(self):
+        finished = [job for job in self._jobs if job.finished]
+        for job in finished[:max(0, len(finished) - self.history)]:
+            self._jobs.remove(job)
+
+    def _next_job(self):
+        """
+        Take the first queued job whose target is free (called with the lock held).
+        """
+        for job in self._queue:
+            if job.target is None or job.target not in self._running_targets:
+                self._queue.remove(job)
+                return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    if self._stopping:
+                        return
+                    self._idle += 1
+                    self._condition.wait()
+                    self._idle -= 1
+                    job = self._next_job()
+                if job.target is not None:
+                    self._running_targets.add(job.target)
+            job.thread = threading.current_thread()
+            try:
+                job.run()
+            finally:
+                with self._condition:
+                    self._running_targets.discard(job.target)
+                    # Zwolniony target może odblokować zadanie czekające w kolejce
+                    self._condition.notify_all()
+
+    def jobs(self):
+        """
+        Return the queued, running and recently finished jobs, oldest first.
+        """
+        with self._condition:
+            return list(self._jobs)
+
+    def shutdown(self, cancel=False, timeout=None):
+        """
+        Stop the workers after the queue is drained (or cancelled) and join them.
+
+        Args:
+            cancel (bool): Cancel the running and queued jobs instead of finishing them.
+            timeout (float): Seconds to wait for each worker (None: wait until done).
+        """
+        with self._condition:
+            self._stopping = True
+            if cancel:
+                for job in list(self._queue) + [job for job in self._jobs if job.state == "running"]:
+                    job.cancel()
+            self._condition.notify_all()
+            workers = list(self._workers)
+        for worker in workers:
+            worker.join(timeout)
+
+
+class JobTracker:
+    """
+    The jobs submitted from one GUI tab (used on the Tk thread only).
+
+    Each job has its own progress counters; the tab's progress bar follows
+    current() and its Cancel button stops every job of the tab.
+    """
+
+    def __init__(self):
+        self._jobs = []
+
+    def add(self, job):
+        self._jobs.append(job)
+        return job
+
+    def current(self):
+        """
+        Return the oldest running job, else the newest job (None if there is none).
+        """
+        # Zakończone zadania zapominamy, poza ostatnim - pasek postępu zostaje wtedy na jego wyniku
+        self._jobs = [job for job in self._jobs if not job.finished] or self._jobs[-1:]
+        return next((job for job in self._jobs if job.state == "running"), self._jobs[-1] if self._jobs else None)
+
+    def cancel(self):
+        """
+        Cancel the queued and running jobs of the tab; returns how many there were.
+        """
+        pending = [job for job in self._jobs if not job.finished]
+        for job in pending:
+            job.cancel()
+        return len(pending)
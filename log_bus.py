@@ -0,0 +1,86 @@
+import queue
+
+# Domyślne parametry opróżniania kolejki logów
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_INTERVAL_MS = 100
+
+LEVEL_COLORS = {
+    "INFO": "green",
+    "ERROR": "red",
+    "WARNING": "orange",
+    "DEBUG": "gray",
+}
+
+
+class LogBus:
+    """
+    Thread-safe log pipeline between worker threads and a Tk text widget.
+
+    Workers call log() (a drop-in log_callback), which only puts the record
+    on a queue. The Tk side drains the queue on an after() timer and inserts
+    each batch into the widget with a single insert() call.
+    """
+
+    def __init__(self, widget, batch_size=DEFAULT_BATCH_SIZE, interval_ms=DEFAULT_INTERVAL_MS, file_logger=None, colored=True):
+        """
+        Args:
+            widget: Text/ScrolledText widget that displays the log (state="disabled").
+            batch_size (int): Maximum number of records inserted per timer tick.
+            interval_ms (int): Delay between two drains of the queue.
+            file_logger (logging.Logger): Optional logger that also receives every record.
+            colored (bool): Whether records are colored by level.
+        """
+        self.widget = widget
+        self.batch_size = batch_size
+        self.interval_ms = interval_ms
+        self.file_logger = file_logger
+        self.colored = colored
+        self._queue = queue.SimpleQueue()
+
+        # Tagi konfigurujemy raz, a nie przy każdym komunikacie
+        if colored:
+            for level, color in LEVEL_COLORS.items():
+                widget.tag_config(level, foreground=color, font=("TkDefaultFont", 10, "normal"))
+                widget.tag_config(f"{level}_bold", foreground=color, font=("TkDefaultFont", 10, "bold"))
+
+        self.widget.after(self.interval_ms, self._drain)
+
+    def log(self, message, level="INFO", bold=False):
+        """
+        Queue a record; safe to call from any thread.
+        """
+        self._queue.put((message, level, bold))
+
+    __call__ = log
+
+    def _drain(self):
+        records = []
+        try:
+            while len(records) < self.batch_size:
+                records.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if records:
+            chunks = []
+            for message, level, bold in records:
+                chunks.append(f"[{level}] {message}\n")
+                chunks.append((f"{level}_bold" if bold else level) if self.colored else ())
+
+            self.widget.config(state="normal")
+            self.widget.insert("end", *chunks)
+            self.widget.config(state="disabled")
+            self.widget.see("end")
+
+            if self.file_logger is not None:
+                for message, level, _ in records:
+                    if level == "INFO":
+                        self.file_logger.info(message)
+                    elif level == "ERROR":
+                        self.file_logger.error(message)
+                    elif level == "WARNING":
+                        self.file_logger.warning(message)
+
+        # Przy zaległościach opróżniamy kolejkę szybciej
+        delay = 1 if len(records) == self.batch_size else self.interval_ms
+        self.widget.after(delay, self._drain)
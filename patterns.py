@@ -0,0 +1,105 @@
+"""
+Central registry of the compiled patterns used to parse KRL config files.
+
+Every line of a file goes through match_line(); the prefix pre-filter makes
+sure lines that cannot hold a known record never reach the regex engine.
+"""
+import re
+
+# Wzorce linii dla wszystkich obsługiwanych sekcji $config.dat
+SECTION_PATTERNS = {
+    "BASE_DATA": re.compile(r'BASE_DATA\[(\d+)\]=\{(.*)\}'),
+    "BASE_NAME": re.compile(r'BASE_NAME\[(\d+),\]=["](.*)["]'),
+    "BASE_TYPE": re.compile(r'BASE_TYPE\[(\d+)\]=#(\w+)'),
+    "TOOL_DATA": re.compile(r'TOOL_DATA\[(\d+)\]=\{(.*)\}'),
+    "TOOL_TYPE": re.compile(r'TOOL_TYPE\[(\d+)\]=#(\w+)'),
+    "TOOL_NAME": re.compile(r'TOOL_NAME\[(\d+),\]=["](.*)["]'),
+    "LOAD_DATA": re.compile(r'LOAD_DATA\[(\d+)\]=\{(.*)\}'),
+    "E6AXIS": re.compile(r'E6AXIS\s+([A-Za-z0-9_]+)\s*=\s*\{(.*)\}'),
+}
+
+# E6AXIS może być poprzedzone słowem DECL, więc tę sekcję szukamy w całej linii
+SEARCH_SECTIONS = {"E6AXIS"}
+
+# Sekcje zakotwiczone na początku linii rozróżnia już 6 pierwszych znaków;
+# prefiks -> krotka (sekcja, wzorzec, typ klucza), bo nowe sekcje mogą dzielić prefiks
+PREFIX_LENGTH = 6
+PREFIX_DISPATCH = {}
+# (sekcja, wzorzec, typ klucza) sekcji szukanych w całej linii; nazwa sekcji jest pre-filtrem
+SEARCH_DISPATCH = []
+
+# Wartość LOAD_DATA: "M 12.5,CM {X ..,Y ..,Z ..,A ..,B ..,C ..},J {X ..,Y ..,Z ..}"
+LOAD_DATA_VALUE_PATTERN = re.compile(r'M\s+([^,]+?)\s*,\s*CM\s*\{(.*?)\}\s*,\s*J\s*\{(.*?)\}')
+
+# Model robota w pliku źródłowym (np. "KR 210") oraz definicja maszyny w pliku docelowym
+ROBOT_MODEL_PATTERN = re.compile(r'KR\s*\d+')
+MACHINE_DEF_PATTERN = re.compile(r'MACHINE_DEF\[\d+\]=\{NAME\[\]\s*"KR\s*\d+')
+
+# Wersje bajtowe wzorców do przeszukiwania pliku przez mmap
+ROBOT_MODEL_BYTES_PATTERN = re.compile(rb'KR\s*\d+')
+MACHINE_DEF_BYTES_PATTERN = re.compile(rb'MACHINE_DEF\[\d+\]=\{NAME\[\]\s*"KR\s*\d+')
+
+
+def register_pattern(section, pattern, key_type=int, search=False):
+    """
+    Add a section pattern to the registry used by match_line and ConfigIndex.
+
+    Args:
+        section (str): Section name; anchored sections are dispatched on its
+            first PREFIX_LENGTH characters, which the line must start with.
+        pattern (re.Pattern): Pattern with the key as group 1 and the value as group 2.
+        key_type (type): int for array indexes, str for variable names.
+        search (bool): Search the whole line (e.g. after DECL) instead of
+            matching at its start; the section name must then appear in the line.
+    """
+    SECTION_PATTERNS[section] = pattern
+    entry = (section, pattern, key_type)
+    if search:
+        SEARCH_SECTIONS.add(section)
+        SEARCH_DISPATCH[:] = [item for item in SEARCH_DISPATCH if item[0] != section] + [entry]
+    else:
+        prefix = section[:PREFIX_LENGTH]
+        others = tuple(item for item in PREFIX_DISPATCH.get(prefix, ()) if item[0] != section)
+        PREFIX_DISPATCH[prefix] = others + (entry,)
+
+
+for _section, _pattern in list(SECTION_PATTERNS.items()):
+    register_pattern(_section, _pattern, str if _section in SEARCH_SECTIONS else int, _section in SEARCH_SECTIONS)
+
+
+def match_line(line):
+    """
+    Match a single line against all section patterns.
+
+    Returns:
+        tuple: (section, key, value) or None if the line holds no known record.
+    """
+    for section, pattern, key_type in PREFIX_DISPATCH.get(line[:PREFIX_LENGTH], ()):
+        match = pattern.match(line)
+        if match:
+            return section, key_type(match.group(1)), match.group(2)
+
+    for section, pattern, key_type in SEARCH_DISPATCH:
+        if section in line:
+            match = pattern.search(line)
+            if match:
+                return section, key_type(match.group(1)), match.group(2)
+    return None
+
+
+def match_record(line):
+    """
+    Like match_line, but return (section, match) so callers can use the spans
+    of the key (group 1) and value (group 2) within the line.
+    """
+    for section, pattern, key_type in PREFIX_DISPATCH.get(line[:PREFIX_LENGTH], ()):
+        match = pattern.match(line)
+        if match:
+            return section, match
+
+    for section, pattern, key_type in SEARCH_DISPATCH:
+        if section in line:
+            match = pattern.search(line)
+            if match:
+                return section, match
+    return None
@@ -0,0 +1,104 @@
+import time
+
+# Co ile linii sprawdzamy zegar w gorących pętlach
+CHECK_EVERY_LINES = 1024
+
+
+class ProgressReporter:
+    """
+    Rate-limited progress counters shared by the transfer/purge engines.
+
+    Engines report sections done, lines processed and bytes written; the
+    callback receives a snapshot dict at most once per min_interval seconds
+    (plus once when the run finishes). Without a callback every call is a
+    couple of integer additions.
+    """
+
+    def __init__(self, callback=None, min_interval=0.1):
+        """
+        Args:
+            callback (function): Called with snapshot() from the worker thread.
+            min_interval (float): Minimum number of seconds between two callbacks.
+        """
+        self.callback = callback
+        self.min_interval = min_interval
+        self.total_sections = 0
+        self.total_bytes = 0
+        self.sections_done = 0
+        self.lines_processed = 0
+        self.bytes_written = 0
+        self._next_check = CHECK_EVERY_LINES
+        self._last_emit = 0.0
+
+    def start(self, total_sections=0, total_bytes=0):
+        """
+        Reset the counters for a new run.
+
+        Args:
+            total_sections (int): Number of sections the run will process.
+            total_bytes (int): Expected output size (used by the streaming engine).
+        """
+        self.total_sections = total_sections
+        self.total_bytes = total_bytes
+        self.sections_done = 0
+        self.lines_processed = 0
+        self.bytes_written = 0
+        self._next_check = CHECK_EVERY_LINES
+        self._emit(force=True)
+
+    def add_lines(self, count=1, nbytes=0):
+        self.lines_processed += count
+        self.bytes_written += nbytes
+        if self.lines_processed >= self._next_check:
+            self._next_check = self.lines_processed + CHECK_EVERY_LINES
+            self._emit()
+
+    def add_bytes(self, nbytes):
+        self.bytes_written += nbytes
+        self._emit()
+
+    def section_done(self, count=1):
+        self.sections_done += count
+        self._emit()
+
+    def finish(self):
+        self.sections_done = self.total_sections
+        self._emit(force=True, done=True)
+
+    def fraction(self):
+        """
+        Return the completed fraction (0.0 - 1.0) of the current run.
+        """
+        if self.total_bytes:
+            return min(1.0, self.bytes_written / self.total_bytes)
+        if self.total_sections:
+            return min(1.0, self.sections_done / self.total_sections)
+        return 0.0
+
+    def snapshot(self, done=False):
+        return {
+            "percent": 100.0 if done else round(self.fraction() * 100.0, 1),
+            "sections_done": self.sections_done,
+            "total_sections": self.total_sections,
+            "lines_processed": self.lines_processed,
+            "bytes_written": self.bytes_written,
+            "done": done,
+        }
+
+    def _emit(self, force=False, done=False):
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last_emit >= self.min_interval:
+            self._last_emit = now
+            self.callback(self.snapshot(done))
+
+
+def format_progress(snapshot):
+    """
+    Return a one-line text form of a progress snapshot (used by the CLI).
+    """
+    return (
+        f"[{snapshot['percent']:5.1f}%] sections {snapshot['sections_done']}/{snapshot['total_sections']}, "
+        f"lines {snapshot['lines_processed']}, bytes written {snapshot['bytes_written']}"
+    )
@@ -0,0 +1,314 @@
+"""
+Project model of a whole robot archive: $config.dat, $machine.dat and the program .dat files.
+
+load_project() discovers the files of a robot directory or KRC archive zip
+and parses them concurrently in a process pool; the ParsedConfigs are merged
+into one Project, which can be queried across files and used to transfer or
+purge all of them at once (E6AXIS points of programs live in their .dat files).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from config_cache import ParsedConfig, config_cache
+from sections import SECTIONS
+from utils.archive_utils import find_members, is_archive_path, join_archive_path, split_archive_path
+from utils.file_utils import decode_lines, file_fingerprint, prepare_target_file, read_file
+from value_purge import purge_values
+from value_transfer import transfer_values
+
+# Rodzaje plików projektu
+CONFIG = "config"
+MACHINE = "machine"
+PROGRAM = "program"
+
+
+def file_kind(name):
+    """
+    Classify a .dat file by its name: CONFIG, MACHINE, PROGRAM or None.
+
+    Other system files ($option.dat, $robcor.dat, ...) are not part of the
+    project; every .dat file without a "$" prefix is a program data list.
+    """
+    name = name.lower()
+    if not name.endswith(".dat"):
+        return None
+    if name == "$config.dat":
+        return CONFIG
+    if name == "$machine.dat":
+        return MACHINE
+    return None if name.startswith("$") else PROGRAM
+
+
+def discover_files(root):
+    """
+    Find the project files under a directory, a .zip archive or a directory inside one ("backup.zip!/KRC").
+
+    Returns:
+        list: (path, relative path with "/" separators, kind), sorted by relative path.
+    """
+    if root.lower().endswith(".zip") and not is_archive_path(root):
+        root = join_archive_path(root, "")
+    if is_archive_path(root):
+        archive, prefix = split_archive_path(root)
+        prefix = prefix.rstrip("/")
+        paths = find_members(archive, f"{prefix}/*.dat" if prefix else "*.dat")
+        found = [(path, split_archive_path(path)[1][len(prefix):].lstrip("/")) for path in paths]
+    else:
+        found = []
+        for directory, _, names in os.walk(root):
+            for name in names:
+                path = os.path.join(directory, name)
+                found.append((path, os.path.relpath(path, root).replace(os.sep, "/")))
+
+    files = []
+    for path, relative in found:
+        kind = file_kind(relative.rsplit("/", 1)[-1])
+        if kind is not None:
+            files.append((path, relative, kind))
+    return sorted(files, key=lambda file: file[1].lower())
+
+
+def _load_file(path):
+    """
+    Read and parse one file (runs in a worker process); returns (fingerprint, ParsedConfig).
+    """
+    key = file_fingerprint(path)
+    data = read_file(key[0])
+    parsed = ParsedConfig(decode_lines(data), key[2], data)
+    parsed.robot_model  # Wykrywanie modeli też w procesie roboczym
+    return key, parsed
+
+
+class ProjectFile:
+    """
+    One parsed file of a project.
+    """
+
+    def __init__(self, path, relative, kind, fingerprint, parsed):
+        self.path = path
+        self.relative = relative
+        self.kind = kind
+        self.fingerprint = fingerprint
+        self.parsed = parsed
+
+    @property
+    def index(self):
+        return self.parsed.index
+
+    def record_counts(self):
+        """
+        Return {section: number of records} for the sections present in the file.
+        """
+        return {section: len(records) for section, records in self.index.ordered.items() if records}
+
+    def __repr__(self):
+        return f"ProjectFile({self.relative}, {self.kind})"
+
+
+class Project:
+    """
+    All parsed files of one robot, keyed by relative path (see discover_files).
+    """
+
+    def __init__(self, root, files):
+        self.root = root
+        self.files = {file.relative: file for file in files}
+
+    def _first(self, kind):
+        return next((file for file in self.files.values() if file.kind == kind), None)
+
+    @property
+    def config(self):
+        return self._first(CONFIG)
+
+    @property
+    def machine(self):
+        return self._first(MACHINE)
+
+    @property
+    def robot_model(self):
+        config = self.config
+        return config.parsed.robot_model if config else None
+
+    @property
+    def machine_model(self):
+        machine = self.machine
+        return machine.parsed.machine_model if machine else None
+
+    def get(self, relative):
+        """
+        Return the file with this relative path (compared case-insensitively) or None.
+        """
+        file = self.files.get(relative)
+        if file is None:
+            relative = relative.lower()
+            file = next((f for name, f in self.files.items() if name.lower() == relative), None)
+        return file
+
+    def records(self, section):
+        """
+        Yield (ProjectFile, Record) for every record of section in all files.
+        """
+        for file in self.files.values():
+            for record in file.index.ordered[section]:
+                yield file, record
+
+    def find(self, section, key):
+        """
+        Return [(ProjectFile, Record)] of the records stored under (section, key) in any file.
+        """
+        matches = []
+        for file in self.files.values():
+            record = file.index.get(section, key)
+            if record is not None:
+                matches.append((file, record))
+        return matches
+
+    def summary(self):
+        """
+        Return one dict per file: relative path, kind and record counts per section.
+        """
+        return [
+            {"file": file.relative, "kind": file.kind, "records": file.record_counts()}
+            for file in self.files.values()
+        ]
+
+
+def load_project(root, workers=None, log_callback=None):
+    """
+    Discover and parse all project files of root in a process pool.
+
+    Program .dat files without any known records are left out. Files that
+    cannot be read are logged and skipped. A single file (or workers=1) is
+    parsed in the calling process.
+
+    Args:
+        root (str): Robot directory, KRC archive .zip or directory inside one.
+        workers (int): Number of worker processes (default: CPU count).
+        log_callback (function): Receives errors of files that could not be parsed.
+
+    Returns:
+        Project: The merged project model.
+    """
+    if log_callback is None:
+        log_callback = lambda message, level="INFO", bold=False: None
+    found = discover_files(root)
+
+    if len(found) <= 1 or workers == 1:
+        results = []
+        for path, _, _ in found:
+            try:
+                results.append(_load_file(path))
+            except (OSError, UnicodeDecodeError) as e:
+                results.append(e)
+    else:
+        workers = min(workers or os.cpu_count() or 1, len(found))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_load_file, path) for path, _, _ in found]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+
+    files = []
+    for (path, relative, kind), result in zip(found, results):
+        if isinstance(result, Exception):
+            log_callback(f"Error parsing {path}: {result}", level="ERROR")
+            continue
+        fingerprint, parsed = result
+        if kind == PROGRAM and not any(parsed.index.ordered[section] for section in SECTIONS):
+            continue
+        files.append(ProjectFile(path, relative, kind, fingerprint, parsed))
+    return Project(root, files)
+
+
+def _pairs(source, target, log_callback):
+    """
+    Yield (source file, target file) pairs: the $config.dat files, and program files by relative path.
+    """
+    for target_file in target.files.values():
+        if target_file.kind == MACHINE:
+            continue
+        if target_file.kind == CONFIG:
+            source_file = source.config
+        else:
+            source_file = source.get(target_file.relative)
+        if source_file is None:
+            log_callback(f"No source for {target_file.relative}, skipped.", level="INFO")
+            continue
+        yield source_file, target_file
+
+
+def transfer_project(
+    source, target, log_callback, modify_directly=True, e6axis_names=["xFFT_HOME"], backup_store=None, **options
+):
+    """
+    Transfer every file of the source project into the matching target file.
+
+    $config.dat is transferred like a single file (with the E6AXIS name
+    mapping); program .dat files are paired by relative path and their
+    E6AXIS points are transferred under their own names. Files are written
+    one at a time, so several members of one archive never race. The
+    targets parsed by load_project are handed to the config cache, so they
+    are not read again.
+
+    Args:
+        source (Project): Source project (load_project).
+        target (Project): Target project.
+        log_callback (function): Function to log messages.
+        modify_directly (bool): Edit target files in place or timestamped copies.
+        e6axis_names (list): E6AXIS source names for $config.dat.
+        backup_store (BackupStore): Receives every target file before it is edited.
+        options: Section flags, as for transfer_values.
+
+    Returns:
+        dict: {relative path: changed sections} for every transferred file.
+    """
+    changed = {}
+    for source_file, target_file in _pairs(source, target, log_callback):
+        log_callback(f"Transferring {source_file.relative} -> {target_file.relative}", level="INFO", bold=True)
+        target_path = prepare_target_file(target_file.path, modify_directly, log_callback, backup_store)
+        if not target_path:
+            continue
+        if target_path == target_file.path:
+            config_cache.add(target_file.fingerprint, target_file.parsed)
+        changed[target_file.relative] = transfer_values(
+            source_file.path, target_path, log_callback,
+            e6axis_names=e6axis_names if target_file.kind == CONFIG else [],
+            source_index=source_file.index,
+            **options
+        )
+    return changed
+
+
+def purge_project(target, log_callback, modify_directly=True, backup_store=None, **options):
+    """
+    Purge every $config.dat and program .dat file of a project (see purge_values).
+
+    Each file is first saved to backup_store (BackupStore), if given. As in
+    transfer_project the files parsed by load_project are handed to the
+    config cache. A file that cannot be purged is logged as an error and
+    the remaining files are still purged.
+
+    Returns:
+        list: Relative paths of the purged files.
+    """
+    purged = []
+    for target_file in target.files.values():
+        if target_file.kind == MACHINE:
+            continue
+        log_callback(f"Purging {target_file.relative}", level="INFO", bold=True)
+        try:
+            target_path = prepare_target_file(target_file.path, modify_directly, log_callback, backup_store)
+            if not target_path:
+                continue
+            if target_path == target_file.path:
+                config_cache.add(target_file.fingerprint, target_file.parsed)
+            purge_values(target_path, log_callback, **options)
+        except Exception as e:
+            log_callback(f"Error purging {target_file.relative}: {e}", level="ERROR")
+            continue
+        purged.append(target_file.relative)
+    return purged
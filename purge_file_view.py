@@ -1,23 +1,23 @@
-import os
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog
-from handlers.base_data_handler import update_base_data
-from handlers.base_name_handler import update_base_name
-from handlers.base_type_handler import update_base_type
-from handlers.tool_data_handler import update_tool_data
-from handlers.tool_type_handler import update_tool_type
-from handlers.tool_name_handler import update_tool_name
-from handlers.load_data_handler import update_load_data
-from handlers.e6axis_handler import update_e6axis
-from utils.file_utils import prepare_target_file
+from jobs import JobTracker
+from log_bus import LogBus
+
+# Filtry okna wyboru pliku: pliki konfiguracyjne i archiwa KRC (.zip)
+CONFIG_FILE_TYPES = [("Config files and KRC archives", "*.dat *.zip"), ("All files", "*.*")]
 
 
 class PurgeFileView:
-    def __init__(self, parent):
+    def __init__(self, parent, executor=None):
         """
         Initialize the Purge File tab view.
+
+        Args:
+            executor (JobExecutor): The application's job queue (purges are queued there).
         """
         self.parent = parent
+        self.executor = executor
 
         # Initialize advanced options variables
         self.update_base_data = tk.BooleanVar(value=True)
@@ -29,6 +29,9 @@ class PurgeFileView:
         self.update_load_data = tk.BooleanVar(value=True)
         self.update_e6axis = tk.BooleanVar(value=True)
 
+        # Purge jobs submitted from this tab (see background_tasks.start_purge_in_thread)
+        self.jobs = JobTracker()
+
         self.create_view()
 
     def create_view(self):
@@ -68,6 +71,7 @@ class PurgeFileView:
         self.progress = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(left_frame, orient="horizontal", length=400, mode="determinate", variable=self.progress)
         self.progress_bar.pack(pady=10)
+        self.poll_progress()
 
         # Checkbox for opening file after purge
         self.open_file_after_purge = tk.BooleanVar(value=False)
@@ -79,6 +83,11 @@ class PurgeFileView:
         self.modify_directly_checkbox = tk.Checkbutton(left_frame, text="Modify target file directly", variable=self.modify_directly)
         self.modify_directly_checkbox.pack(pady=5)
 
+        # Checkbox for the backup store (replaces the timestamped copy, see utils.backup_store)
+        self.use_backup_store = tk.BooleanVar(value=False)
+        self.backup_store_checkbox = tk.Checkbutton(left_frame, text="Keep previous versions in the backup store", variable=self.use_backup_store)
+        self.backup_store_checkbox.pack(pady=5)
+
         # Button to open advanced options
         self.advanced_options_button = tk.Button(left_frame, text="Advanced Options", command=self.open_advanced_options)
         self.advanced_options_button.pack(pady=5)
@@ -87,9 +96,14 @@ class PurgeFileView:
         self.start_button = tk.Button(left_frame, text="Purge File", command=self.purge_file)
         self.start_button.pack(pady=10)
 
+        # Cancel button (stops this tab's queued and running purges, the files are left untouched)
+        self.cancel_button = tk.Button(left_frame, text="Cancel", command=self.cancel_purge)
+        self.cancel_button.pack(pady=5)
+
         # Logger display in the right frame
         self.log_display = tk.Text(right_frame, width=70, height=30, state="disabled", wrap="word")
         self.log_display.pack(fill="both", expand=True)
+        self.log_bus = LogBus(self.log_display, colored=False)
 
         # Footer with version and author
         footer_label = tk.Label(left_frame, text="Ver 0.2\nCreated By Kacper Borowiec", font=("Arial", 8), fg="gray")
@@ -98,9 +112,18 @@ class PurgeFileView:
     def select_target_file(self):
         """
         Open a file dialog to select the target file.
+
+        For a KRC archive .zip the $config.dat inside it is selected.
         """
-        file_path = filedialog.askopenfilename(title="Select Target File")
+        file_path = filedialog.askopenfilename(title="Select Target File", filetypes=CONFIG_FILE_TYPES)
         if file_path:
+            from utils.archive_utils import resolve_config_path
+
+            try:
+                file_path = resolve_config_path(file_path)
+            except OSError as e:
+                self.log_message(f"Error opening archive: {e}", level="ERROR")
+                return
             self.target_entry.delete(0, tk.END)
             self.target_entry.insert(0, file_path)
 
@@ -141,60 +164,61 @@ class PurgeFileView:
 
     def purge_file(self):
         """
-        Purge the selected file by setting all values to 0.0.
+        Purge the selected file by setting all values to 0.0 (runs as a background job).
         """
         target_file = self.target_entry.get()
         if not target_file:
             self.log_message("Please select a target file.", level="ERROR")
             return
 
-        self.log_message(f"Purging file: {target_file}", level="INFO")
+        section_flags = {
+            "update_base_data_flag": self.update_base_data.get(),
+            "update_base_name_flag": self.update_base_name.get(),
+            "update_base_type_flag": self.update_base_type.get(),
+            "update_tool_data_flag": self.update_tool_data.get(),
+            "update_tool_type_flag": self.update_tool_type.get(),
+            "update_tool_name_flag": self.update_tool_name.get(),
+            "update_load_data_flag": self.update_load_data.get(),
+            "update_e6axis_flag": self.update_e6axis.get(),
+        }
+        # Imported on first use so the purge engine does not delay the window
+        from background_tasks import start_purge_in_thread
+        from utils.backup_store import DEFAULT_DIRECTORY
 
         try:
-            # Prepare the target file
-            target_file = prepare_target_file(target_file, self.modify_directly.get(), self.log_message)
-
-            # Read the target file
-            with open(target_file, 'r') as file:
-                target_content = file.readlines()
-
-            # Process each handler based on the selected options
-            handlers = [
-                (update_base_data, self.update_base_data.get()),
-                (update_base_name, self.update_base_name.get()),
-                (update_base_type, self.update_base_type.get()),
-                (update_tool_data, self.update_tool_data.get()),
-                (update_tool_type, self.update_tool_type.get()),
-                (update_tool_name, self.update_tool_name.get()),
-                (update_load_data, self.update_load_data.get()),
-                (update_e6axis, self.update_e6axis.get())
-            ]
-
-            for handler, enabled in handlers:
-                if enabled:
-                    handler([], target_content, self.log_message, purge_mode=True)
-
-            # Write the updated content back to the file
-            with open(target_file, 'w') as file:
-                file.writelines(target_content)
-
-            self.log_message("Purge process completed successfully!", level="INFO")
-
-            # Open the file if the option is selected
-            if self.open_file_after_purge.get():
-                os.startfile(target_file)
-
-        except Exception as e:
-            self.log_message(f"Error during purge: {e}", level="ERROR")
-
-    def log_message(self, message, level="INFO"):
-        """
-        Log a message to the log display.
-        """
-        self.log_display.config(state="normal")
-        self.log_display.insert(tk.END, f"[{level}] {message}\n")
-        self.log_display.config(state="disabled")
-        self.log_display.see(tk.END)
+            self.jobs.add(start_purge_in_thread(
+                target_file, section_flags,
+                modify_directly=self.modify_directly.get(),
+                open_after=self.open_file_after_purge.get(),
+                log_message=self.log_message,
+                executor=self.executor,
+                backup_store=DEFAULT_DIRECTORY if self.use_backup_store.get() else None
+            ))
+        except queue.Full as e:
+            self.log_message(f"Purge not started: {e}", level="ERROR")
+
+    def cancel_purge(self):
+        """
+        Request cancellation of this tab's queued and running purges.
+        """
+        if self.jobs.cancel():
+            self.log_message("Cancelling purge...", level="WARNING")
+
+    def log_message(self, message, level="INFO", bold=False):
+        """
+        Log a message to the log display (queued, safe to call from any thread).
+        """
+        self.log_bus.log(message, level=level, bold=bold)
+
+    def poll_progress(self):
+        """
+        Show the progress of the current purge job (see JobTracker.current) in the progress bar.
+        """
+        job = self.jobs.current()
+        percent = job.percent() if job is not None else None
+        if percent is not None:
+            self.progress.set(percent)
+        self.parent.after(100, self.poll_progress)
 
     def animate_lights(self):
         """
@@ -0,0 +1,195 @@
+"""
+Compact typed records for the structured $config.dat values.
+
+A record keeps the original value text (usually the very string held by the
+ConfigIndex record it was parsed from, so it costs nothing extra) and the numbers in an
+array('d'); the individual text tokens are split out of the text only when
+a record has to be merged or written. Unchanged values are therefore
+written back exactly as they were read.
+"""
+import math
+from array import array
+
+from patterns import LOAD_DATA_VALUE_PATTERN
+
+NAN = math.nan
+
+
+class AxisRecord:
+    """
+    Base class of the "<axis> <value>, ..." records (FRAME, E6AXIS, J vector).
+    """
+
+    __slots__ = ("text", "values")
+
+    # Nazwy osi w kolejności pól struktury KRL
+    AXES = ()
+    AXIS_POSITIONS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.AXIS_POSITIONS = {axis: position for position, axis in enumerate(cls.AXES)}
+
+    def __init__(self, text, values):
+        """
+        Args:
+            text (str): The value text between the braces, e.g. "X 1.0,Y 2.0".
+            values (array): One float per AXES entry, NaN for axes missing in text.
+        """
+        self.text = text
+        self.values = values
+
+    @classmethod
+    def parse(cls, text, log_callback=None):
+        """
+        Parse the value text of a record; invalid tokens are skipped (and logged).
+        """
+        text = text.strip()
+        values = array('d', [NAN]) * len(cls.AXES)
+        positions = cls.AXIS_POSITIONS
+        # Pętla rozwinięta ręcznie - to najgorętsze miejsce przy porównywaniu całych flot
+        for value in text.split(','):
+            axis, _, token = value.strip().partition(' ')
+            position = positions.get(axis)
+            if position is not None:
+                try:
+                    values[position] = float(token)
+                    continue
+                except ValueError:
+                    pass
+            if log_callback is not None:
+                log_callback(f"Skipping invalid value: {value.strip()}", level="WARNING")
+        return cls(text, values)
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        """
+        Build a record from {axis: token}, formatted as "A 1.0, B 2.0".
+        """
+        return cls.parse(", ".join(f"{axis} {token}" for axis, token in tokens.items()))
+
+    def tokens(self):
+        """
+        Return {axis: original text token} in the order of the text.
+        """
+        tokens = {}
+        for value in self.text.split(','):
+            axis, _, token = value.strip().partition(' ')
+            token = token.strip()
+            if axis in self.AXIS_POSITIONS:
+                try:
+                    float(token)
+                except ValueError:
+                    continue
+                tokens[axis] = token
+        return tokens
+
+    def get(self, axis):
+        """
+        Return the value of an axis as a float (NaN if the record does not set it).
+        """
+        return self.values[self.AXIS_POSITIONS[axis]]
+
+    def merged(self, other):
+        """
+        Return a new record with the axes of other written over this one.
+        """
+        tokens = self.tokens()
+        tokens.update(other.tokens())
+        return self.from_tokens(tokens)
+
+    def format(self):
+        """
+        Return the tokens joined as "A 1.0, B 2.0" (the handlers' output format).
+        """
+        return ", ".join(f"{axis} {token}" for axis, token in self.tokens().items())
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.tokens() == other.tokens()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.format()})"
+
+
+class Frame(AxisRecord):
+    """
+    KRL FRAME: BASE_DATA, TOOL_DATA and the CM part of LOAD_DATA.
+    """
+
+    __slots__ = ()
+    AXES = ("X", "Y", "Z", "A", "B", "C")
+
+
+class Vector(AxisRecord):
+    """
+    X/Y/Z vector, e.g. the J (inertia) part of LOAD_DATA.
+    """
+
+    __slots__ = ()
+    AXES = ("X", "Y", "Z")
+
+
+class E6Axis(AxisRecord):
+    """
+    KRL E6AXIS: robot axes A1-A6 and external axes E1-E6.
+    """
+
+    __slots__ = ()
+    AXES = ("A1", "A2", "A3", "A4", "A5", "A6", "E1", "E2", "E3", "E4", "E5", "E6")
+
+
+class LoadData:
+    """
+    KRL LOAD: mass M, centre of mass CM (frame) and inertia J (vector).
+    """
+
+    __slots__ = ("text", "mass", "cm", "j")
+
+    # Kolumny wartości liczbowych (patrz values)
+    AXES = ("M",) + tuple(f"CM_{axis}" for axis in Frame.AXES) + tuple(f"J_{axis}" for axis in Vector.AXES)
+
+    def __init__(self, text, mass, cm, j):
+        self.text = text
+        self.mass = mass
+        self.cm = cm
+        self.j = j
+
+    @classmethod
+    def parse(cls, text, log_callback=None):
+        """
+        Parse a LOAD_DATA value; returns None (and logs) if it is malformed.
+        """
+        text = text.strip()
+        match = LOAD_DATA_VALUE_PATTERN.match(text)
+        try:
+            mass = float(match.group(1)) if match else None
+        except ValueError:
+            mass = None
+        if mass is None:
+            if log_callback is not None:
+                log_callback(f"Skipping invalid LOAD_DATA value: {text}", level="WARNING")
+            return None
+        return cls(text, mass, Frame.parse(match.group(2), log_callback), Vector.parse(match.group(3), log_callback))
+
+    @property
+    def values(self):
+        """
+        Return M, CM and J as one array('d') in the order of AXES.
+        """
+        return array('d', [self.mass]) + self.cm.values + self.j.values
+
+    def format(self):
+        """
+        Return the original value text (a load is always transferred as a whole).
+        """
+        return self.text
+
+    def __eq__(self, other):
+        if not isinstance(other, LoadData):
+            return NotImplemented
+        return self.mass == other.mass and self.cm == other.cm and self.j == other.j
+
+    def __repr__(self):
+        return f"LoadData(M {self.mass}, CM {{{self.cm.format()}}}, J {{{self.j.format()}}})"
@@ -0,0 +1,168 @@
+import mmap
+import threading
+from collections import OrderedDict
+
+from patterns import (
+    MACHINE_DEF_BYTES_PATTERN, MACHINE_DEF_PATTERN, ROBOT_MODEL_BYTES_PATTERN, ROBOT_MODEL_PATTERN
+)
+from utils.file_utils import file_fingerprint, read_file, split_archive_path
+
+
+def find_robot_model(lines):
+    """
+    Return the first "KR nnn" model found in the lines (normalised, e.g. "KR210") or None.
+    """
+    for line in lines:
+        match = ROBOT_MODEL_PATTERN.search(line)
+        if match:
+            return match.group(0).replace(" ", "").upper()
+    return None
+
+
+def find_machine_model(lines):
+    """
+    Return the model named by the first MACHINE_DEF[...] entry (normalised) or None.
+    """
+    for line in lines:
+        if "MACHINE_DEF" not in line:
+            continue
+        match = MACHINE_DEF_PATTERN.search(line)
+        if match:
+            return match.group(0).split('"')[1].replace(" ", "").upper()
+    return None
+
+
+# Początek pliku z komentarzem ";KR ..." i koniec pliku z MACHINE_DEF, przeszukiwane w pierwszej kolejności
+HEADER_WINDOW = 64 * 1024
+TAIL_WINDOW = 64 * 1024
+
+_MODEL_CACHE_SIZE = 256
+_model_cache = OrderedDict()
+_model_cache_lock = threading.Lock()
+
+
+def _search_file(path, search):
+    """
+    Run search(buffer) over a memory-mapped file; only the pages the search touches are read.
+
+    An archive member cannot be mapped, so it is searched in memory.
+    """
+    if split_archive_path(path):
+        return search(read_file(path))
+    with open(path, 'rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None  # Pusty plik nie może być zmapowany
+        with buffer:
+            return search(buffer)
+
+
+def _search_robot_model(buffer):
+    # Komentarz ";KR ..." stoi w nagłówku: cały plik przeszukujemy tylko, gdy w oknie nic nie ma
+    window = min(len(buffer), HEADER_WINDOW)
+    match = ROBOT_MODEL_BYTES_PATTERN.search(buffer, 0, window)
+    if match is not None:
+        # Granica okna mogła uciąć numer modelu, więc trafienie dopasowujemy jeszcze raz bez niej
+        match = ROBOT_MODEL_BYTES_PATTERN.match(buffer, match.start())
+    elif window < len(buffer):
+        match = ROBOT_MODEL_BYTES_PATTERN.search(buffer)
+    if match:
+        return match.group(0).decode("latin-1").replace(" ", "").upper()
+    return None
+
+
+def _find_machine_def(buffer, start, end):
+    # Regex uruchamiamy tylko w miejscach, gdzie faktycznie występuje "MACHINE_DEF["
+    position = buffer.find(b"MACHINE_DEF[", start, end)
+    while position != -1:
+        match = MACHINE_DEF_BYTES_PATTERN.match(buffer, position)
+        if match:
+            return match.group(0).decode("latin-1").split('"')[1].replace(" ", "").upper()
+        position = buffer.find(b"MACHINE_DEF[", position + 1, end)
+    return None
+
+
+def _block_start(buffer, position):
+    """
+    Return the start of the block of consecutive MACHINE_DEF[ lines that contains position.
+    """
+    line_start = buffer.rfind(b"\n", 0, position) + 1
+    while line_start:
+        previous = buffer.rfind(b"\n", 0, line_start - 1) + 1
+        if not buffer[previous:line_start].lstrip().startswith(b"MACHINE_DEF["):
+            break
+        line_start = previous
+    return line_start
+
+
+def _search_machine_model(buffer):
+    # MACHINE_DEF stoi na końcu pliku: najpierw okno końcowe, reszta pliku tylko, gdy tam go nie ma
+    start = max(0, len(buffer) - TAIL_WINDOW)
+    position = buffer.find(b"MACHINE_DEF[", start)
+    if position != -1:
+        # Blok MACHINE_DEF mógł zacząć się przed oknem - szukamy od jego pierwszej linii
+        return _find_machine_def(buffer, _block_start(buffer, position), len(buffer))
+    if start:
+        return _find_machine_def(buffer, 0, start + len(b"MACHINE_DEF[") - 1)
+    return None
+
+
+def _detect(path, kind, search):
+    key = (kind,) + file_fingerprint(path)
+    with _model_cache_lock:
+        if key in _model_cache:
+            _model_cache.move_to_end(key)
+            return _model_cache[key]
+
+    model = _search_file(key[1], search)
+
+    with _model_cache_lock:
+        _model_cache[key] = model
+        while len(_model_cache) > _MODEL_CACHE_SIZE:
+            _model_cache.popitem(last=False)
+    return model
+
+
+def clear_model_cache():
+    """
+    Forget all cached detection results (used by the benchmarks for cold runs).
+    """
+    with _model_cache_lock:
+        _model_cache.clear()
+
+
+def detect_models(source_file, target_file, cancel_token=None):
+    """
+    Return (robot model of source_file, machine model of target_file), as compared by the GUI.
+
+    Runs as a background job (hence cancel_token), because the fallback
+    searches read the whole file.
+    """
+    return detect_robot_model(source_file), detect_machine_model(target_file)
+
+
+def detect_robot_model(path):
+    """
+    Return the first "KR nnn" model in the file.
+
+    Only the first HEADER_WINDOW bytes are searched unless they hold no model.
+
+    Results are cached per file fingerprint (path, mtime, size).
+    """
+    return _detect(path, "robot", _search_robot_model)
+
+
+def detect_machine_model(path):
+    """
+    Return the model of the first MACHINE_DEF[...] line in the file.
+
+    The MACHINE_DEF[...] entries of a config form one block of consecutive
+    lines near its end. The last TAIL_WINDOW bytes are searched first; a hit
+    there is traced back to the first line of its block, however far it
+    reaches before the window. The rest of the file is only searched if the
+    window holds no MACHINE_DEF.
+
+    Results are cached per file fingerprint (path, mtime, size).
+    """
+    return _detect(path, "machine", _search_machine_model)
@@ -0,0 +1,161 @@
+import json
+import time
+from contextlib import contextmanager
+
+from patterns import match_line
+from utils.file_utils import text_encoding
+
+# Liczniki zbierane dla każdej fazy/sekcji
+COUNTERS = ("lines_scanned", "records_matched", "records_changed", "bytes_written")
+
+# Liczba funkcji w wydruku cProfile
+PROFILE_LIMIT = 30
+
+
+class RunReport:
+    """
+    Wall time and counters of one transfer or purge run, per phase.
+
+    Phases are "read", one per section handler (BASE_DATA, ...), "splice"
+    and "write"; each records wall_time plus lines scanned, records matched,
+    records changed and bytes written. Like ProgressReporter, an engine
+    creates a throwaway report when none is passed in.
+    """
+
+    def __init__(self, profile=False):
+        """
+        Args:
+            profile (bool): Also run cProfile for the whole run (see profile_text).
+        """
+        self.profile = profile
+        self.engine = None
+        self.target = None
+        self.phases = {}
+        self.wall_time = 0.0
+        self.profile_text = None
+        self._started = None
+        self._profiler = None
+
+    def start(self, engine, target):
+        """
+        Begin a run of engine ("transfer", "stream_transfer", "purge") on target.
+        """
+        self.engine = engine
+        self.target = target
+        self.phases = {}
+        self.profile_text = None
+        self._started = time.perf_counter()
+        if self.profile:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def finish(self):
+        if self._started is None:
+            return
+        if self._profiler is not None:
+            import io
+            import pstats
+
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LIMIT)
+            self.profile_text = out.getvalue()
+            self._profiler = None
+        self.wall_time = time.perf_counter() - self._started
+        self._started = None
+
+    def stats(self, name):
+        """
+        Return the counters dict of a phase, creating it on first use.
+        """
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = {"wall_time": 0.0, **{counter: 0 for counter in COUNTERS}}
+        return stats
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the body of a with-block as phase name; yields the phase's counters dict.
+        """
+        stats = self.stats(name)
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats["wall_time"] += time.perf_counter() - started
+
+    def count(self, name, **counters):
+        """
+        Add to the counters of a phase, e.g. count("BASE_DATA", records_changed=1).
+        """
+        stats = self.stats(name)
+        for counter, value in counters.items():
+            stats[counter] += value
+
+    def count_spliced(self, original, spliced):
+        """
+        Add records_changed and bytes_written of spliced lines ({line_no: line}) to their sections.
+
+        Returns:
+            set: Names of the sections that have at least one spliced line.
+        """
+        encoding = text_encoding()
+        sections = set()
+        for line_no, line in spliced.items():
+            section = match_line(original[line_no])[0]
+            sections.add(section)
+            self.count(section, records_changed=1, bytes_written=len(line.encode(encoding)))
+        return sections
+
+    def to_dict(self):
+        report = {
+            "engine": self.engine,
+            "target": self.target,
+            "wall_time": self.wall_time,
+            "phases": self.phases,
+        }
+        if self.profile_text is not None:
+            report["profile"] = self.profile_text
+        return report
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def summary(self):
+        """
+        Return a one-line summary: total time, the slowest phases and what changed.
+        """
+        slowest = sorted(self.phases.items(), key=lambda item: item[1]["wall_time"], reverse=True)[:3]
+        parts = ", ".join(
+            f"{name} {stats['wall_time'] * 1000:.1f} ms ({_share(stats['wall_time'], self.wall_time)})"
+            for name, stats in slowest
+        )
+        changed = sum(stats["records_changed"] for stats in self.phases.values())
+        written = self.phases.get("write", {}).get("bytes_written", 0)
+        return (
+            f"{self.engine} {self.wall_time * 1000:.1f} ms [{parts}]; "
+            f"{changed} record(s) changed, {written} bytes written"
+        )
+
+    def format(self):
+        """
+        Return the report as a text table (one row per phase).
+        """
+        out = [
+            f"Run report: {self.engine} {self.target} ({self.wall_time * 1000:.1f} ms)",
+            f"  {'phase':12} {'time ms':>9} {'share':>6} {'lines':>9} {'matched':>8} {'changed':>8} {'bytes':>10}",
+        ]
+        for name, stats in self.phases.items():
+            out.append(
+                f"  {name:12} {stats['wall_time'] * 1000:9.1f} {_share(stats['wall_time'], self.wall_time):>6} "
+                f"{stats['lines_scanned']:9} {stats['records_matched']:8} {stats['records_changed']:8} "
+                f"{stats['bytes_written']:10}"
+            )
+        return "\n".join(out)
+
+
+def _share(part, total):
+    return f"{part / total:.0%}" if total else "-"
@@ -0,0 +1,337 @@
+"""
+Declarative registry of the $config.dat sections the editor transfers and purges.
+
+Each section is a SectionSpec: line pattern, key type, value schema, purge
+value and merge policy. Registering a spec also registers its pattern with
+patterns.match_line, so a new section is picked up by the same single scan
+that builds a ConfigIndex; apply_sections then processes all enabled
+sections on the indexed records, without another pass over the file.
+"""
+from config_index import ConfigIndex, PrefixIndex
+from patterns import SECTION_PATTERNS, register_pattern
+from progress import ProgressReporter
+from records import E6Axis, Frame, LoadData
+from run_report import RunReport
+
+# Domyślna struktura LOAD_DATA
+DEFAULT_LOAD_DATA = "M -1.00000,CM {X 0.0,Y 0.0,Z 0.0,A 0.0,B 0.0,C 0.0},J {X 0.0,Y 0.0,Z 0.0}"
+
+
+class SectionSpec:
+    """
+    Description of one section: how its lines are matched, parsed, built and purged.
+    """
+
+    def __init__(
+        self, name, pattern, line_format, purge_value, key_type=int, schema=None, merge="replace",
+        search=False, mapped=False, purge_format=None, bold_updates=False,
+    ):
+        """
+        Args:
+            name (str): Section name, e.g. "BASE_DATA".
+            pattern (re.Pattern): Line pattern, key in group 1 and value in group 2.
+            line_format (str): Line written for a record, with {key} and {value}.
+            purge_value (str): Value written by purge.
+            key_type (type): int for array indexes, str for variable names.
+            schema (type): Record class with parse()/format() (Frame, LoadData, E6Axis);
+                None for plain text values (names, types).
+            merge (str): "replace" writes the source value as is, "merge" writes
+                the source axes over the target record (axes missing in the source stay).
+            search (bool): The record may appear anywhere in the line (e.g. after DECL).
+            mapped (bool): Target names are mapped to source names (E6AXIS name mapping).
+            purge_format (str): Line written by purge (default: line_format).
+            bold_updates (bool): Log updated records in bold, as the GUI shows them.
+        """
+        if merge not in ("replace", "merge"):
+            raise ValueError(f"Unknown merge policy '{merge}' for {name}")
+        if merge == "merge" and schema is None:
+            raise ValueError(f"Merge policy 'merge' needs a schema ({name})")
+        self.name = name
+        self.pattern = pattern
+        self.line_format = line_format
+        self.purge_value = purge_value
+        self.key_type = key_type
+        self.schema = schema
+        self.merge = merge
+        self.search = search
+        self.mapped = mapped
+        self.purge_format = purge_format or line_format
+        self.bold_updates = bold_updates
+
+    @property
+    def flag(self):
+        """
+        Name of the transfer_values/purge_values argument that enables the section.
+        """
+        return f"update_{self.name.lower()}_flag"
+
+    def label(self, key):
+        return f"{self.name}[{key}]" if self.key_type is int else f"{self.name} {key}"
+
+    def parse_value(self, text, log_callback=None):
+        """
+        Parse a value text with the schema; None if it is malformed.
+        """
+        if self.schema is None:
+            return text.strip()
+        return self.schema.parse(text, log_callback)
+
+    def parse_source(self, source_index, log_callback):
+        """
+        Parse all records of the section into {key: value}; malformed values are left out.
+        """
+        source_data = {}
+        for record in source_index.sections[self.name].values():
+            value = self.parse_value(record.value, log_callback)
+            if value is not None:
+                source_data[record.key] = value
+        return source_data
+
+    def build_line(self, key, target_value, source_value):
+        """
+        Return the line for key with source_value applied to the target value text.
+        """
+        if self.merge == "merge":
+            source_value = self.schema.parse(target_value).merged(source_value)
+        value = source_value if self.schema is None else source_value.format()
+        return self.line_format.format(key=key, value=value)
+
+    def purge_line(self, key):
+        return self.purge_format.format(key=key, value=self.purge_value)
+
+    def __repr__(self):
+        return f"SectionSpec({self.name})"
+
+
+# Zarejestrowane sekcje w kolejności przetwarzania
+SECTIONS = {}
+
+
+def register_section(spec):
+    """
+    Add (or replace) a section; its pattern joins the single scan of match_line.
+
+    Register sections before files are parsed: ConfigIndex objects built
+    earlier (e.g. in config_cache) do not know the new section.
+    """
+    register_pattern(spec.name, spec.pattern, spec.key_type, spec.search)
+    SECTIONS[spec.name] = spec
+    return spec
+
+
+for _spec in [
+    SectionSpec(
+        "BASE_DATA", SECTION_PATTERNS["BASE_DATA"], "BASE_DATA[{key}]={{ {value} }}\n",
+        "X 0.0, Y 0.0, Z 0.0, A 0.0, B 0.0, C 0.0", schema=Frame,
+        purge_format="BASE_DATA[{key}]={{{value}}}\n", bold_updates=True,
+    ),
+    SectionSpec("BASE_NAME", SECTION_PATTERNS["BASE_NAME"], 'BASE_NAME[{key},]="{value}"\n', " ", bold_updates=True),
+    SectionSpec("BASE_TYPE", SECTION_PATTERNS["BASE_TYPE"], "BASE_TYPE[{key}]=#{value}\n", "NONE", bold_updates=True),
+    SectionSpec(
+        "TOOL_DATA", SECTION_PATTERNS["TOOL_DATA"], "TOOL_DATA[{key}]={{ {value} }}\n",
+        "X 0.0, Y 0.0, Z 0.0, A 0.0, B 0.0, C 0.0", schema=Frame, merge="merge",
+        purge_format="TOOL_DATA[{key}]={{{value}}}\n", bold_updates=True,
+    ),
+    SectionSpec("TOOL_TYPE", SECTION_PATTERNS["TOOL_TYPE"], "TOOL_TYPE[{key}]=#{value}\n", "NONE", bold_updates=True),
+    SectionSpec("TOOL_NAME", SECTION_PATTERNS["TOOL_NAME"], 'TOOL_NAME[{key},]="{value}"\n', " ", bold_updates=True),
+    SectionSpec(
+        "LOAD_DATA", SECTION_PATTERNS["LOAD_DATA"], "LOAD_DATA[{key}]={{ {value} }}\n", DEFAULT_LOAD_DATA,
+        schema=LoadData,
+    ),
+    SectionSpec(
+        "E6AXIS", SECTION_PATTERNS["E6AXIS"], "E6AXIS {key}={{ {value} }}\n",
+        "A1 0.0, A2 0.0, A3 0.0, A4 0.0, A5 0.0, A6 0.0, E1 0.0, E2 0.0, E3 0.0, E4 0.0, E5 0.0, E6 0.0",
+        key_type=str, schema=E6Axis, merge="merge", search=True, mapped=True,
+    ),
+]:
+    register_section(_spec)
+
+
+def enabled_sections(flags):
+    """
+    Return the specs enabled by {section name: bool}; sections not in flags are enabled.
+    """
+    return [spec for name, spec in SECTIONS.items() if flags.get(name, True)]
+
+
+def build_e6axis_name_mapping(source_index, e6axis_names, log_callback):
+    """
+    Build the target -> source E6AXIS name mapping for a transfer.
+
+    Args:
+        source_index (ConfigIndex): Index of the source file.
+        e6axis_names (list): Source names entered in the GUI (e.g., ["xFFT_HOME"]).
+        log_callback (function): Function to log messages.
+    """
+    # Pobierz nazwę wpisaną w GUI (np. xFFT_HOME)
+    base_source = e6axis_names[0].strip()
+    # Bazowa nazwa targetu – tutaj zakładamy XHOME
+    base_target = "XHOME"
+
+    log_callback(f"Processing E6AXIS with source prefix: {base_source} -> target prefix: {base_target}", level="INFO")
+
+    # Stwórz początkowe mapowanie: XHOME -> HOME
+    name_mapping = {base_target: "HOME"}
+
+    # Automatycznie utwórz mapowania indeksowane
+    # Pasujące klucze ze źródła, już posortowane numerycznie (HOME9 przed HOME10)
+    indexed_keys = source_index.prefix_index("E6AXIS").with_prefix(base_source)
+
+    for key in indexed_keys:
+        # Wyciągamy numer z końca (np. xFFT_HOME3 -> "3")
+        idx = key[len(base_source):]
+        # Tworzymy target key, np. XHOME3
+        target_key = f"{base_target}{idx}"
+        name_mapping[target_key] = key
+
+    log_callback(f"Generated name_mapping: {name_mapping}", level="DEBUG")
+    return name_mapping
+
+
+def resolve_e6axis_mapping(name_mapping, source_data, log_callback, prefix_index=None):
+    """
+    Check the source names of name_mapping against source_data (adds indexed names in place).
+
+    A source name missing from source_data is expanded to its indexed names
+    in numeric order (XHOME -> HOME missing, HOME1, HOME2 present: XHOME1 ->
+    HOME1, XHOME2 -> HOME2); mappings already present are kept. A source
+    name without indexed names is only reported when a target record needs
+    it (see update_section), as most targets do not use every mapped name.
+
+    Args:
+        name_mapping (dict): Target -> source names.
+        prefix_index (PrefixIndex): Index of the source_data keys, e.g.
+            source_index.prefix_index("E6AXIS") (built from source_data if None).
+    """
+    if prefix_index is None:
+        prefix_index = PrefixIndex(source_data)
+    for target_key, source_key in list(name_mapping.items()):
+        if source_key in source_data:
+            continue
+        # Check for indexed names (e.g., HOME1, HOME2), in numeric order
+        indexed_keys = prefix_index.with_prefix(source_key)
+        if not indexed_keys:
+            log_callback(f"Source key '{source_key}' (for {target_key}) not in source file.", level="DEBUG")
+            continue
+        log_callback(f"Found indexed keys for '{source_key}': {indexed_keys}", level="INFO")
+        for idx, indexed_key in enumerate(indexed_keys, start=1):
+            name_mapping.setdefault(f"{target_key}{idx}", indexed_key)
+    return name_mapping
+
+
+def update_section(
+    spec, target_content, target_index, log_callback, source_data=None, purge_mode=False, name_mapping=None,
+    cancel_token=None,
+):
+    """
+    Update or purge the records of one section in target_content (in place).
+
+    Args:
+        spec (SectionSpec): The section.
+        target_content (list): Target lines; records are replaced by whole new lines.
+        target_index (ConfigIndex): Index of target_content.
+        source_data (dict): Parsed source records (spec.parse_source); unused in purge mode.
+        name_mapping (dict): Target -> source names for mapped sections.
+        cancel_token (CancelToken): Checked before every record.
+
+    Returns:
+        dict: {target key: value} of every record written.
+    """
+    written = {}
+    if purge_mode:
+        for record in target_index.records(spec.name, cancel_token):
+            target_content[record.line_no] = spec.purge_line(record.key)
+            log_callback(f"Purged {spec.label(record.key)}.", level="INFO")
+            written[record.key] = spec.purge_value
+        return written
+
+    for record in target_index.records(spec.name, cancel_token):
+        key = record.key
+        source_key = name_mapping.get(key, key) if spec.mapped and name_mapping else key
+        if source_key in source_data:
+            target_content[record.line_no] = spec.build_line(key, record.value, source_data[source_key])
+            origin = f"source key {source_key}" if source_key != key else "source file"
+            log_callback(f"Updated {spec.label(key)} with values from {origin}.", level="INFO", bold=spec.bold_updates)
+            written[key] = source_data[source_key]
+        elif source_key != key:
+            log_callback(
+                f"Error: Source key '{source_key}' for {spec.label(key)} not found in source file.", level="ERROR"
+            )
+    return written
+
+
+def apply_sections(
+    specs, target_content, target_index, log_callback, source_index=None, purge_mode=False, name_mapping=None,
+    progress=None, cancel_token=None, report=None,
+):
+    """
+    The generic engine: transfer (or purge) every section in specs.
+
+    The target was scanned once into target_index; each section only visits
+    its own indexed records, so enabling more sections costs no extra pass.
+
+    Args:
+        specs (list): Enabled SectionSpecs (see enabled_sections).
+        source_index (ConfigIndex): Index of the source; unused in purge mode.
+        name_mapping (dict): Target -> source names for mapped sections (E6AXIS);
+            resolved against the source in place.
+        report (RunReport): Receives the wall time, target lines visited and
+            records matched (present in target and source) per section.
+
+    Returns:
+        dict: {section: {target key: value}} of the records written, for every section in specs.
+    """
+    if progress is None:
+        progress = ProgressReporter()
+    if report is None:
+        report = RunReport()
+
+    written = {}
+    for spec in specs:
+        with report.phase(spec.name) as stats:
+            log_callback(f"Processing {spec.name}...", level="INFO")
+            source_data = None
+            if not purge_mode:
+                source_data = spec.parse_source(source_index, log_callback)
+                log_callback(f"Parsed source_data: {source_data}", level="INFO")
+                if spec.mapped and name_mapping is not None:
+                    resolve_e6axis_mapping(name_mapping, source_data, log_callback, source_index.prefix_index(spec.name))
+            written[spec.name] = update_section(
+                spec, target_content, target_index, log_callback, source_data, purge_mode, name_mapping, cancel_token
+            )
+            # Sekcja przegląda tylko swoje linie z indeksu; dopasowane są rekordy obecne w obu plikach
+            stats["lines_scanned"] += len(target_index.ordered[spec.name])
+            stats["records_matched"] += len(written[spec.name])
+        progress.section_done()
+    return written
+
+
+def section_handler(name):
+    """
+    Return a handler function for one section with the old handlers' signature.
+
+    handler(source_content, target_content, log_callback, purge_mode=False,
+    source_index=None, target_index=None, cancel_token=None, name_mapping=None)
+    returns {target key: value} of the records written. Callers running
+    several handlers on the same content should pass source_index and
+    target_index; without them every call scans the content again.
+    """
+    spec = SECTIONS[name]
+
+    def handler(
+        source_content, target_content, log_callback, purge_mode=False, source_index=None, target_index=None,
+        cancel_token=None, name_mapping=None,
+    ):
+        if target_index is None:
+            target_index = ConfigIndex(target_content)
+        if source_index is None and not purge_mode:
+            source_index = ConfigIndex(source_content)
+        if spec.mapped and name_mapping is None:
+            name_mapping = {"HOME": "XHOME"}
+        return apply_sections(
+            [spec], target_content, target_index, log_callback, source_index, purge_mode, name_mapping,
+            cancel_token=cancel_token,
+        )[name]
+
+    handler.__name__ = f"update_{name.lower()}"
+    return handler
@@ -0,0 +1,216 @@
+"""
+Byte-range splice editing of config files.
+
+Handlers still produce whole new lines; splice_record_line() keeps only the
+new value, writes it with the spacing of the original value and puts it into
+the original line, so everything around it (DECL, spacing, CRLF) stays as it
+was. SpliceEditor then records the edited
+lines as (offset, length, replacement) splices against the original bytes
+and writes the untouched spans as memoryview slices.
+"""
+import re
+from itertools import accumulate
+
+from patterns import match_record
+from utils.file_utils import file_size, read_file, text_encoding, write_chunks_atomic
+
+# Spacje wokół separatorów nie zmieniają wartości ("{X 1.0,Y 2.0}" == "{ X 1.0, Y 2.0 }")
+SEPARATOR_SPACING_PATTERN = re.compile(r'\s*([,{}])\s*')
+# Separator razem z otaczającymi go spacjami, np. ", " albo " {"
+SEPARATOR_SPAN_PATTERN = re.compile(r'(\s*[,{}]\s*)')
+
+
+def normalize_value(section, value):
+    """
+    Return a comparison key for a record value that ignores formatting-only differences.
+    """
+    value = SEPARATOR_SPACING_PATTERN.sub(r'\1', value)
+    # W nazwach spacje są częścią wartości (" " to nazwa po wyczyszczeniu)
+    return value if section.endswith("_NAME") else value.strip()
+
+
+def restyle_value(old_value, new_value):
+    """
+    Return new_value written with the spacing of old_value around its separators (",", "{", "}").
+
+    With the same structure the separators are taken over one by one;
+    otherwise (e.g. a merge added axes) every separator gets the spacing of
+    the first one of its kind in old_value. Leading and trailing spaces of
+    the value come from old_value, so "{X 1.0,Y 2.0}" stays compact.
+    """
+    old_separators = SEPARATOR_SPAN_PATTERN.split(old_value.strip())[1::2]
+    new_parts = SEPARATOR_SPAN_PATTERN.split(new_value.strip())
+    new_separators = new_parts[1::2]
+    if [separator.strip() for separator in old_separators] != [separator.strip() for separator in new_separators]:
+        by_kind = {}
+        for separator in old_separators:
+            by_kind.setdefault(separator.strip(), separator)
+        old_separators = [by_kind.get(separator.strip(), separator) for separator in new_separators]
+    new_parts[1::2] = old_separators
+    leading = old_value[:len(old_value) - len(old_value.lstrip())]
+    trailing = old_value[len(old_value.rstrip()):]
+    return leading + "".join(new_parts) + trailing
+
+
+def _line_ending(line):
+    return line[len(line.rstrip("\r\n")):]
+
+
+def splice_record_line(old_line, new_line):
+    """
+    Return old_line with its value replaced by the value of new_line.
+
+    The new value keeps the spacing of the old one (see restyle_value). If
+    both values are equal up to formatting, old_line itself is returned
+    (callers can test for that with "is"). Lines that hold no known record
+    are replaced as a whole, keeping the original line ending.
+    """
+    old = match_record(old_line)
+    new = match_record(new_line)
+    if old is None or new is None or old[0] != new[0]:
+        content = new_line.rstrip("\r\n")
+        if content == old_line.rstrip("\r\n"):
+            return old_line
+        return content + _line_ending(old_line)
+
+    section, old_match = old
+    new_value = new[1].group(2)
+    if normalize_value(section, old_match.group(2)) == normalize_value(section, new_value):
+        return old_line
+    if not section.endswith("_NAME"):
+        new_value = restyle_value(old_match.group(2), new_value)
+    return old_line[:old_match.start(2)] + new_value + old_line[old_match.end(2):]
+
+
+def splice_lines(original, updated, line_numbers=None):
+    """
+    Merge handler output back into the original lines.
+
+    Args:
+        original (list): Original lines (line endings kept).
+        updated (list): The same lines after the handlers ran (same length).
+        line_numbers (list): Lines to look at; by default every line that differs.
+
+    Returns:
+        dict: {line_no: spliced line} for every line whose value really changed.
+    """
+    if line_numbers is None:
+        line_numbers = [
+            line_no for line_no, (old, new) in enumerate(zip(original, updated)) if old is not new and old != new
+        ]
+    spliced = {}
+    for line_no in line_numbers:
+        line = splice_record_line(original[line_no], updated[line_no])
+        if line is not original[line_no]:
+            spliced[line_no] = line
+    return spliced
+
+
+class SpliceEditor:
+    """
+    Edits recorded as (offset, length, replacement) splices against an original buffer.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (bytes): The original file content.
+        """
+        self.data = data
+        self.splices = []
+
+    def __len__(self):
+        return len(self.splices)
+
+    def replace(self, offset, length, replacement):
+        """
+        Replace data[offset:offset + length] with replacement (bytes).
+
+        Splices that would not change anything are dropped.
+        """
+        if self.data[offset:offset + length] != replacement:
+            self.splices.append((offset, length, replacement))
+
+    def chunks(self):
+        """
+        Yield the edited content: memoryview slices of the untouched spans
+        interleaved with the replacements.
+        """
+        view = memoryview(self.data)
+        position = 0
+        for offset, length, replacement in sorted(self.splices, key=lambda splice: splice[0]):
+            if offset < position:
+                raise ValueError(f"Overlapping splice at byte {offset}")
+            if offset > position:
+                yield view[position:offset]
+            yield replacement
+            position = offset + length
+        if position < len(self.data):
+            yield view[position:]
+
+    def getvalue(self):
+        return b"".join(self.chunks())
+
+    def write(self, path):
+        """
+        Atomically write the edited content to path; nothing is written without splices.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        if not self.splices:
+            return False
+        write_chunks_atomic(path, self.chunks())
+        return True
+
+
+def line_offsets(lines, encoding=None):
+    """
+    Return the byte offset of the start of every line (plus the total length at the end).
+
+    Without an encoding the lines are taken to be ASCII (one byte per character).
+    """
+    if encoding is None:
+        return list(accumulate(map(len, lines), initial=0))
+    return list(accumulate((len(line.encode(encoding)) for line in lines), initial=0))
+
+
+def edit_file_lines(path, original, spliced, expected_size=None, data=None):
+    """
+    Apply {line_no: new line} to the file the original lines were read from.
+
+    Only the changed lines are encoded; the rest of the file is copied from
+    its original bytes.
+
+    Args:
+        path (str): File to edit (replaced atomically).
+        original (list): The lines the file was parsed into (see decode_lines).
+        spliced (dict): {line_no: new line}, e.g. from splice_lines().
+        expected_size (int): Size the file had when it was parsed; a mismatch
+            means it was changed in between and raises OSError.
+        data (bytes): The content the original lines were decoded from; the
+            splices are applied to it and the file is not read again.
+
+    Returns:
+        bool: True if the file was written.
+    """
+    if not spliced:
+        return False
+
+    if data is None:
+        data = read_file(path)
+        current_size = len(data)
+    else:
+        current_size = file_size(path)
+    if expected_size is None:
+        expected_size = len(data)
+    if current_size != expected_size:
+        raise OSError(f"{path} changed on disk since it was read")
+
+    encoding = text_encoding()
+    offsets = line_offsets(original, None if data.isascii() else encoding)
+    editor = SpliceEditor(data)
+    for line_no, line in spliced.items():
+        start = offsets[line_no]
+        editor.replace(start, offsets[line_no + 1] - start, line.encode(encoding))
+    return editor.write(path)
@@ -0,0 +1,174 @@
+import os
+
+from config_index import ConfigIndex
+from patterns import match_line
+from progress import ProgressReporter
+from run_report import RunReport
+from splice import splice_record_line
+from utils.file_utils import commit_temp_file, file_size, make_temp_file, open_text, text_encoding
+from sections import SECTIONS, build_e6axis_name_mapping, enabled_sections, resolve_e6axis_mapping
+
+
+def _encoded_size(line, encoding):
+    # Linie ASCII (prawie wszystkie) mają tyle bajtów co znaków, bez kodowania
+    return len(line) if line.isascii() else len(line.encode(encoding))
+
+
+def rewrite_lines(lines, source_data, name_mapping, changed, log_callback, progress, cancel_token=None, report=None):
+    """
+    Yield the target lines with every matching record rewritten from source_data.
+
+    Args:
+        lines (iterable): Target lines (usually the open target file).
+        source_data (dict): {section: parsed source records} for the enabled sections.
+        name_mapping (dict): E6AXIS target -> source name mapping.
+        changed (set): Receives the names of the sections whose lines actually changed.
+        log_callback (function): Function to log messages.
+        progress (ProgressReporter): Receives lines processed and bytes written (encoded, not characters).
+        cancel_token (CancelToken): Checked before every matched record.
+        report (RunReport): Receives target lines visited, records matched (present in target and
+            source), records changed and bytes written per section.
+    """
+    if report is None:
+        report = RunReport()
+    encoding = text_encoding()
+    for line in lines:
+        matched = match_line(line)
+        if matched and matched[0] in source_data:
+            section, key, value = matched
+            if cancel_token is not None:
+                cancel_token.check()
+            report.count(section, lines_scanned=1)
+            spec = SECTIONS[section]
+            source_key = name_mapping.get(key, key) if spec.mapped else key
+            section_data = source_data[section]
+            if source_key in section_data:
+                report.count(section, records_matched=1)
+                # Nowa wartość trafia do oryginalnej linii (DECL, odstępy i CRLF bez zmian)
+                new_line = splice_record_line(line, spec.build_line(key, value, section_data[source_key]))
+                nbytes = _encoded_size(new_line, encoding)
+                progress.add_lines(1, nbytes)
+                yield new_line
+                # Sekcja liczy się jako zmieniona tylko gdy linia faktycznie się różni
+                if new_line is not line:
+                    changed.add(section)
+                    report.count(section, records_changed=1, bytes_written=nbytes)
+                origin = f"source key {source_key}" if source_key != key else "source file"
+                log_callback(
+                    f"Updated {spec.label(key)} with values from {origin}.", level="INFO", bold=spec.bold_updates
+                )
+                continue
+            if source_key != key:
+                log_callback(
+                    f"Error: Source key '{source_key}' for {spec.label(key)} not found in source file.", level="ERROR"
+                )
+        progress.add_lines(1, _encoded_size(line, encoding))
+        yield line
+
+
+def stream_transfer_values(
+    source_file,
+    target_file,
+    log_callback,
+    update_base_data_flag=True,
+    update_base_name_flag=True,
+    update_base_type_flag=True,
+    update_tool_data_flag=True,
+    update_tool_type_flag=True,
+    update_tool_name_flag=True,
+    update_load_data_flag=True,
+    update_e6axis_flag=True,
+    e6axis_names=["xFFT_HOME"],
+    source_index=None,
+    progress=None,
+    cancel_token=None,
+    report=None,
+):
+    """
+    Streaming variant of transfer_values for very large files.
+
+    The source is reduced to its record map; the target is never held in
+    memory but piped line by line into a temporary file in the same
+    directory, which is fsynced and atomically replaces the target only if
+    at least one line actually changed.
+
+    Returns:
+        list: Names of the sections that changed in the target.
+    """
+    changed_sections = []
+    if progress is None:
+        progress = ProgressReporter()
+    if report is None:
+        report = RunReport()
+    report.start("stream_transfer", target_file)
+    try:
+        log_callback("Starting streaming value transfer...", level="INFO")
+
+        with report.phase("read") as stats:
+            if source_index is None:
+                with open_text(source_file) as src:
+                    source_index = ConfigIndex(src)
+            stats["lines_scanned"] += source_index.line_count
+        log_callback(f"Source records indexed. Lines: {source_index.line_count}", level="INFO")
+
+        specs = enabled_sections({
+            "BASE_DATA": update_base_data_flag,
+            "BASE_NAME": update_base_name_flag,
+            "BASE_TYPE": update_base_type_flag,
+            "TOOL_DATA": update_tool_data_flag,
+            "TOOL_TYPE": update_tool_type_flag,
+            "TOOL_NAME": update_tool_name_flag,
+            "LOAD_DATA": update_load_data_flag,
+            "E6AXIS": update_e6axis_flag,
+        })
+        source_data = {}
+        for spec in specs:
+            with report.phase(spec.name):
+                source_data[spec.name] = spec.parse_source(source_index, log_callback)
+
+        name_mapping = {}
+        if update_e6axis_flag and e6axis_names:
+            name_mapping = build_e6axis_name_mapping(source_index, e6axis_names, log_callback)
+            resolve_e6axis_mapping(
+                name_mapping, source_data["E6AXIS"], log_callback, source_index.prefix_index("E6AXIS")
+            )
+
+        # Postęp liczony po bajtach - liczba linii targetu nie jest znana z góry
+        progress.start(total_sections=len(source_data), total_bytes=file_size(target_file))
+
+        changed = set()
+        fd, temp_file = make_temp_file(target_file)
+        try:
+            # newline='' - końce linii przechodzą przez silnik bez tłumaczenia
+            with report.phase("stream") as stats, open_text(target_file, newline='') as tgt, \
+                    os.fdopen(fd, 'w', newline='') as out:
+                out.writelines(rewrite_lines(
+                    tgt, source_data, name_mapping, changed, log_callback, progress, cancel_token, report
+                ))
+                out.flush()
+                stats["lines_scanned"] += progress.lines_processed
+                if changed:
+                    os.fsync(out.fileno())
+
+            if changed:
+                with report.phase("write") as stats:
+                    commit_temp_file(temp_file, target_file)
+                    stats["bytes_written"] += file_size(target_file)
+                log_callback(f"Final updated target file saved: {target_file}", level="INFO")
+            else:
+                os.remove(temp_file)
+                log_callback("No changes were made to the target file.", level="INFO")
+        except BaseException:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+        changed_sections = [spec.name for spec in specs if spec.name in changed]
+        log_callback("Transfer process completed.", level="INFO")
+    except Exception as e:
+        log_callback(f"Error during value transfer: {e}", level="ERROR")
+    finally:
+        report.finish()
+
+    progress.finish()
+    return changed_sections
@@ -0,0 +1,45 @@
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import generate_config, generate_lines  # noqa: E402
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """
+    Return a factory writing a synthetic $config.dat (benchmarks.generator) into tmp_path.
+    """
+    def make(name, lines=400, **options):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        generate_config(str(path), lines=lines, **options)
+        return str(path)
+    return make
+
+
+@pytest.fixture
+def source_config(make_config):
+    """
+    A source with xFFT_HOME E6AXIS points, as the default e6axis_names expect.
+    """
+    return make_config("source/$config.dat", seed=1, e6axis_prefix="xFFT_HOME")
+
+
+@pytest.fixture
+def make_archive(tmp_path):
+    """
+    Return a factory writing a KRC archive zip with one generated $config.dat per robot.
+    """
+    def make(name, robots=("R1", "R2"), lines=400, **options):
+        path = tmp_path / name
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for seed, robot in enumerate(robots, start=10):
+                content = "\n".join(generate_lines(lines=lines, seed=seed, **options)) + "\n"
+                archive.writestr(f"KRC/{robot}/System/$config.dat", content)
+        return str(path)
+    return make
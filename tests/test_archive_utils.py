@@ -0,0 +1,51 @@
+import zipfile
+
+from utils.archive_utils import find_members, resolve_config_path
+from utils.file_utils import read_file, remove_file, write_member_atomic
+
+
+def raw_members(path):
+    """
+    Return {name: (compressed bytes, CRC, compression)} of every member.
+    """
+    members = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as file:
+        for info in archive.infolist():
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = int.from_bytes(file.read(2), "little"), int.from_bytes(file.read(2), "little")
+            file.seek(name_length + extra_length, 1)
+            members[info.filename] = (file.read(info.compress_size), info.CRC, info.compress_type)
+    return members
+
+
+def test_rewriting_a_member_copies_the_others_raw(make_archive):
+    archive = make_archive("backup.zip", robots=("R1", "R2", "R3"))
+    before = raw_members(archive)
+    member = f"{archive}!/KRC/R2/System/$config.dat"
+
+    write_member_atomic(member, b"DEFDAT $CONFIG\r\nENDDAT\r\n")
+
+    after = raw_members(archive)
+    assert list(after) == list(before)
+    assert read_file(member) == b"DEFDAT $CONFIG\r\nENDDAT\r\n"
+    assert after["KRC/R2/System/$config.dat"][2] == zipfile.ZIP_DEFLATED
+    for name in ("KRC/R1/System/$config.dat", "KRC/R3/System/$config.dat"):
+        assert after[name] == before[name]
+    with zipfile.ZipFile(archive) as zip_file:
+        assert zip_file.testzip() is None
+
+
+def test_adding_and_removing_members(make_archive):
+    archive = make_archive("backup.zip", robots=("R1",))
+
+    write_member_atomic(f"{archive}!/KRC/R1/Program/extra.dat", b"DEFDAT EXTRA\nENDDAT\n")
+    assert len(find_members(archive, "*.dat")) == 2
+
+    remove_file(f"{archive}!/KRC/R1/Program/extra.dat")
+    assert find_members(archive, "*.dat") == [f"{archive}!/KRC/R1/System/$config.dat"]
+
+
+def test_resolve_config_path_prefers_r1(make_archive):
+    archive = make_archive("backup.zip", robots=("R2", "R1"))
+
+    assert resolve_config_path(archive) == f"{archive}!/KRC/R1/System/$config.dat"
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from utils.backup_store import BackupStore
+from utils.file_utils import read_file
+
+
+def test_identical_content_is_stored_once(tmp_path, make_config):
+    path = make_config("$config.dat")
+    store = BackupStore(str(tmp_path / "backups"))
+
+    first = store.backup(path)
+    second = store.backup(path)
+
+    assert first["stored"] > 0 and second["stored"] == 0
+    assert store.stats()["backups"] == 2 and store.stats()["objects"] == 1
+
+
+def test_restore_brings_back_a_version_and_can_be_undone(tmp_path, make_config):
+    path = make_config("$config.dat")
+    original = read_file(path)
+    store = BackupStore(str(tmp_path / "backups"), compression="zlib")
+    entry = store.backup(path)
+    with open(path, 'ab') as file:
+        file.write(b"; edited\n")
+    edited = read_file(path)
+
+    store.restore(path, sha256=entry["sha256"][:8])
+
+    assert read_file(path) == original
+    # Restore zapisuje najpierw bieżącą wersję, więc można go cofnąć
+    store.restore(path, sha256=store.entries(path)[-1]["sha256"])
+    assert read_file(path) == edited
+
+
+def test_archive_members_are_backed_up_and_restored(tmp_path, make_archive):
+    archive = make_archive("backup.zip")
+    member = f"{archive}!/KRC/R2/System/$config.dat"
+    original = read_file(member)
+    store = BackupStore(str(tmp_path / "backups"))
+    store.backup(member)
+
+    store.restore(member, destination=str(tmp_path / "restored.dat"))
+
+    assert read_file(str(tmp_path / "restored.dat")) == original
+
+
+def test_missing_backup_and_unknown_codec_are_errors(tmp_path):
+    with pytest.raises(ValueError):
+        BackupStore(str(tmp_path / "backups"), compression="gzip")
+    with pytest.raises(FileNotFoundError):
+        BackupStore(str(tmp_path / "backups")).find(str(tmp_path / "$config.dat"))
+
+
+def test_store_replaces_the_timestamped_copy(tmp_path, make_config):
+    from utils.file_utils import prepare_target_file
+
+    path = make_config("target/$config.dat")
+    store = BackupStore(str(tmp_path / "backups"))
+
+    for _ in range(3):
+        assert prepare_target_file(path, False, lambda message, level="INFO", bold=False: None, store) == path
+
+    assert os.listdir(os.path.dirname(path)) == ["$config.dat"]
+    assert store.stats()["objects"] == 1
+
+
+def test_gui_purge_job_backs_up_into_the_store(tmp_path, make_config):
+    from background_tasks import start_purge_in_thread
+
+    path = make_config("target/$config.dat")
+    original = read_file(path)
+    job = start_purge_in_thread(
+        path, {}, modify_directly=False, open_after=False, log_message=lambda message, level="INFO", bold=False: None,
+        backup_store=str(tmp_path / "backups")
+    )
+
+    assert job.wait(10) and job.state == "done"
+    assert os.listdir(os.path.dirname(path)) == ["$config.dat"]
+    assert read_file(path) != original
+    store = BackupStore(str(tmp_path / "backups"))
+    assert store.read(store.find(path)["sha256"]) == original
@@ -0,0 +1,49 @@
+import zipfile
+
+from batch_transfer import group_targets, plan_batch, transfer_batch
+
+
+def members(path):
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_members_of_one_archive_share_a_group(tmp_path):
+    archive = str(tmp_path / "a.zip")
+    targets = [
+        f"{archive}!/KRC/R1/System/$config.dat", str(tmp_path / "x.dat"), f"{archive}!/KRC/R2/System/$config.dat"
+    ]
+
+    assert group_targets(targets) == [[targets[0], targets[2]], [targets[1]]]
+
+
+def test_batch_keeps_the_edits_of_every_archive_member(source_config, make_archive):
+    archive = make_archive("backup.zip")
+    before = members(archive)
+
+    summaries = transfer_batch(source_config, [f"{archive}!/KRC/*/System/$config.dat"], workers=2)
+
+    assert [summary["errors"] for summary in summaries] == [[], []]
+    assert all(summary["changed_sections"] for summary in summaries)
+    after = members(archive)
+    assert after.keys() == before.keys()
+    assert all(after[name] != before[name] for name in before)
+
+
+def test_batch_over_plain_files(source_config, make_config):
+    targets = [make_config(f"cell{i}/$config.dat", seed=i) for i in range(2, 5)]
+
+    summaries = transfer_batch(source_config, targets, workers=2)
+
+    assert [summary["target"] for summary in summaries] == sorted(targets)
+    assert all(summary["changed_sections"] and not summary["errors"] for summary in summaries)
+
+
+def test_plan_batch_writes_nothing(source_config, make_archive):
+    archive = make_archive("backup.zip")
+    before = members(archive)
+
+    plans = plan_batch(source_config, [f"{archive}!/KRC/*/System/$config.dat"], workers=2)
+
+    assert all(plan["changes"] and not plan["errors"] for plan in plans)
+    assert members(archive) == before
@@ -0,0 +1,21 @@
+from change_plan import plan_transfer
+from utils.file_utils import read_lines
+from value_transfer import transfer_values
+
+
+def test_plan_lists_exactly_the_lines_a_transfer_writes(source_config, make_config):
+    target = make_config("target/$config.dat", seed=2, crlf=True)
+    before = read_lines(target)
+
+    plan = plan_transfer(source_config, target)
+    assert read_lines(target) == before
+
+    transfer_values(source_config, target, lambda message, level="INFO", bold=False: None)
+    after = read_lines(target)
+
+    written = [line_no + 1 for line_no, (old, new) in enumerate(zip(before, after)) if old != new]
+    assert plan["errors"] == []
+    assert [change["line"] for change in plan["changes"]] == written
+    assert [f"+{after[line - 1].rstrip()}" for line in written] == [
+        line.rstrip() for line in plan["diff"].splitlines() if line.startswith("+") and not line.startswith("+++")
+    ]
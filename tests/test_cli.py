@@ -0,0 +1,45 @@
+import os
+
+import cli
+
+
+def read(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def test_transfer_with_default_e6axis_names_exits_0(source_config, make_config, capsys):
+    target = make_config("target/$config.dat", seed=2)
+    before = read(target)
+
+    assert cli.main(["transfer", source_config, target, "-q"]) == 0
+
+    assert read(target) != before
+    assert "[ERROR]" not in capsys.readouterr().err
+
+
+def test_streaming_transfer_exits_0(source_config, make_config, capsys):
+    target = make_config("target/$config.dat", seed=2)
+
+    assert cli.main(["transfer", source_config, target, "-q", "--streaming"]) == 0
+    assert "[ERROR]" not in capsys.readouterr().err
+
+
+def test_transfer_of_missing_target_exits_1(source_config, tmp_path):
+    assert cli.main(["transfer", source_config, str(tmp_path / "missing.dat"), "-q"]) == 1
+
+
+def test_purge_exits_0(make_config):
+    target = make_config("target/$config.dat", seed=2)
+
+    assert cli.main(["purge", target, "-q"]) == 0
+
+
+def test_project_transfer_exits_0(source_config, make_config, capsys):
+    target = make_config("target/$config.dat", seed=2)
+    before = read(target)
+
+    assert cli.main(["project-transfer", os.path.dirname(source_config), os.path.dirname(target), "-q"]) == 0
+
+    assert read(target) != before
+    assert "[ERROR]" not in capsys.readouterr().err
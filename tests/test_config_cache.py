@@ -0,0 +1,65 @@
+import os
+
+from config_cache import ConfigCache
+
+
+def test_unchanged_file_is_parsed_once(make_config):
+    path = make_config("$config.dat")
+    cache = ConfigCache()
+
+    first = cache.get(path)
+
+    assert cache.get(path) is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_changed_mtime_or_size_invalidates_the_entry(make_config):
+    path = make_config("$config.dat")
+    cache = ConfigCache()
+    first = cache.get(path)
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = cache.get(path)
+    assert second is not first
+
+    with open(path, 'a') as file:
+        file.write("; appended\n")
+    third = cache.get(path)
+    assert third is not second
+    assert third.size == os.path.getsize(path)
+    # Starsze wersje tego samego pliku są usuwane
+    assert cache.stats()["entries"] == 1
+
+
+def test_archive_member_is_keyed_by_the_archive_mtime(make_archive):
+    archive = make_archive("backup.zip")
+    cache = ConfigCache()
+    member = f"{archive}!/KRC/R1/System/$config.dat"
+    first = cache.get(member)
+
+    stat = os.stat(archive)
+    os.utime(archive, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(member) is not first
+
+
+def test_cache_is_bounded_by_entries(make_config):
+    cache = ConfigCache(max_entries=2)
+    for index in range(3):
+        cache.get(make_config(f"robot{index}/$config.dat"))
+
+    assert cache.stats()["entries"] == 2 and cache.evictions == 1
+
+
+def test_memory_cap_charges_the_parsed_size(make_config):
+    path = make_config("$config.dat", lines=2000)
+    cache = ConfigCache()
+    parsed = cache.get(path)
+
+    assert parsed.memory > 2 * os.path.getsize(path)
+    assert cache.stats()["bytes"] == parsed.memory
+
+    capped = ConfigCache(max_bytes=parsed.memory - 1)
+    capped.get(path)
+    assert capped.stats()["entries"] == 0 and capped.evictions == 1
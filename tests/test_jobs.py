@@ -0,0 +1,112 @@
+import threading
+
+from jobs import Job, JobCancelled, JobExecutor, JobTracker
+from progress import ProgressReporter
+
+
+def blocking_job(name, started, release, target=None, order=None, progress=None):
+    def run(cancel_token):
+        if order is not None:
+            order.append(name)
+        started.set()
+        while not release.wait(0.01):
+            cancel_token.check()
+        return name
+    return Job(name, run, target=target, progress=progress)
+
+
+def test_back_to_back_submits_start_max_workers():
+    executor = JobExecutor(max_workers=2)
+    release = threading.Event()
+    started = [threading.Event(), threading.Event()]
+    try:
+        # Pierwszy wątek czeka bezczynnie, zanim przyjdą dwa kolejne zadania naraz
+        executor.submit(Job("warm-up", lambda cancel_token: None)).wait(5)
+        jobs = [executor.submit(blocking_job(f"job{i}", started[i], release)) for i in range(2)]
+        assert all(event.wait(5) for event in started)
+        assert [job.state for job in jobs] == ["running", "running"]
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_jobs_on_one_target_run_in_order(tmp_path):
+    executor = JobExecutor(max_workers=3)
+    release = threading.Event()
+    order = []
+    target = str(tmp_path / "$config.dat")
+    try:
+        jobs = [
+            executor.submit(blocking_job(f"job{i}", threading.Event(), release, target=target, order=order))
+            for i in range(3)
+        ]
+        release.set()
+        assert all(job.wait(5) for job in jobs)
+        assert order == ["job0", "job1", "job2"]
+    finally:
+        executor.shutdown()
+
+
+def test_members_of_one_archive_share_a_target(tmp_path):
+    archive = str(tmp_path / "backup.zip")
+    first = Job("r1", lambda cancel_token: None, target=f"{archive}!/KRC/R1/System/$config.dat")
+    second = Job("r2", lambda cancel_token: None, target=f"{archive}!/KRC/R2/System/$config.dat")
+    assert first.target == second.target
+
+
+def test_cancel_running_and_queued_jobs(tmp_path):
+    executor = JobExecutor(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+    try:
+        running = executor.submit(blocking_job("running", started, release))
+        queued = executor.submit(blocking_job("queued", threading.Event(), release))
+        assert started.wait(5)
+        queued.cancel()
+        running.cancel()
+        assert running.wait(5) and queued.wait(5)
+        assert (running.state, queued.state) == ("cancelled", "cancelled")
+        assert running.result is None
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_cancelled_job_raises_inside_func():
+    def run(cancel_token):
+        cancel_token.cancel()
+        cancel_token.check()
+    job = Job("self-cancelling", run).start()
+    assert job.wait(5)
+    assert job.state == "cancelled"
+    assert issubclass(JobCancelled, BaseException) and not issubclass(JobCancelled, Exception)
+
+
+def test_tracker_follows_own_progress_and_cancels_all():
+    executor = JobExecutor(max_workers=2)
+    release = threading.Event()
+    started = [threading.Event(), threading.Event()]
+    tracker = JobTracker()
+    try:
+        progress = [ProgressReporter(), ProgressReporter()]
+        progress[0].start(total_sections=4)
+        progress[0].section_done(1)
+        first = tracker.add(executor.submit(blocking_job("first", started[0], release, progress=progress[0])))
+        second = tracker.add(executor.submit(blocking_job("second", started[1], release, progress=progress[1])))
+        assert all(event.wait(5) for event in started)
+        assert tracker.current() is first
+        assert first.percent() == 25.0
+
+        assert tracker.cancel() == 2
+        assert first.wait(5) and second.wait(5)
+        assert tracker.current() is second
+        assert tracker.cancel() == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_job_without_progress_has_no_percent():
+    job = Job("plain", lambda cancel_token: None).start()
+    assert job.wait(5)
+    assert job.percent() is None
@@ -0,0 +1,66 @@
+import os
+
+import cli
+import project
+from config_cache import config_cache
+from project import load_project, purge_project
+
+
+def read(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def make_robot(make_config):
+    paths = [
+        make_config("robot/System/$config.dat", seed=2),
+        make_config("robot/Program/a.dat", lines=100, seed=3),
+        make_config("robot/Program/b.dat", lines=100, seed=4),
+    ]
+    return os.path.dirname(os.path.dirname(paths[0])), paths
+
+
+def test_project_purge_resets_every_file(make_config, capsys):
+    root, paths = make_robot(make_config)
+    before = [read(path) for path in paths]
+
+    assert cli.main(["project-purge", root, "-q", "--workers", "1"]) == 0
+
+    assert all(read(path) != old for path, old in zip(paths, before))
+    assert "3 file(s) purged" in capsys.readouterr().out
+
+
+def test_project_purge_uses_the_parsed_files(make_config):
+    root, _ = make_robot(make_config)
+    target = load_project(root, workers=1)
+    config_cache.clear()
+    before = config_cache.stats()
+
+    purge_project(target, lambda message, level="INFO", bold=False: None)
+
+    after = config_cache.stats()
+    assert after["hits"] - before["hits"] == 3
+    assert after["misses"] == before["misses"]
+
+
+def test_project_purge_goes_on_after_a_failing_file(make_config, monkeypatch):
+    root, paths = make_robot(make_config)
+    target = load_project(root, workers=1)
+    purge_values = project.purge_values
+
+    def purge_or_fail(path, *args, **kwargs):
+        if path.endswith("a.dat"):
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+        return purge_values(path, *args, **kwargs)
+
+    monkeypatch.setattr(project, "purge_values", purge_or_fail)
+    errors = []
+
+    def log(message, level="INFO", bold=False):
+        if level == "ERROR":
+            errors.append(message)
+
+    purged = purge_project(target, log)
+
+    assert purged == ["Program/b.dat", "System/$config.dat"]
+    assert len(errors) == 1 and errors[0].startswith("Error purging Program/a.dat")
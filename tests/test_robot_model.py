@@ -0,0 +1,72 @@
+import robot_model
+from robot_model import HEADER_WINDOW, TAIL_WINDOW, detect_machine_model, detect_robot_model
+
+
+def write(tmp_path, data):
+    path = tmp_path / "$config.dat"
+    path.write_bytes(data)
+    robot_model.clear_model_cache()
+    return str(path)
+
+
+def test_models_of_generated_config(make_config):
+    path = make_config("$config.dat", lines=20000, robot_model="KR 210")
+
+    assert detect_robot_model(path) == "KR210"
+    assert detect_machine_model(path) == "KR210"
+
+
+def test_robot_model_cut_by_header_window(tmp_path):
+    path = write(tmp_path, b"x" * (HEADER_WINDOW - 4) + b";KR 210\n")
+
+    assert detect_robot_model(path) == "KR210"
+
+
+def test_robot_model_after_header_window(tmp_path):
+    path = write(tmp_path, b"x\n" * HEADER_WINDOW + b";KR 16\n")
+
+    assert detect_robot_model(path) == "KR16"
+
+
+def test_robot_model_is_case_sensitive(tmp_path):
+    path = write(tmp_path, b";kr 16 (lowercase is not a model)\n;KR 6\n")
+
+    assert detect_robot_model(path) == "KR6"
+
+
+def test_machine_def_before_tail_window(tmp_path):
+    path = write(tmp_path, b'MACHINE_DEF[1]={NAME[] "KR 6",COOP_KRC_INDEX 1}\n' + b"x\n" * TAIL_WINDOW)
+
+    assert detect_machine_model(path) == "KR6"
+
+
+def test_no_models(tmp_path):
+    path = write(tmp_path, b"x\n" * TAIL_WINDOW)
+
+    assert detect_robot_model(path) is None
+    assert detect_machine_model(path) is None
+
+
+def test_machine_def_block_longer_than_tail_window_gives_its_first_entry(tmp_path):
+    first = b'MACHINE_DEF[1]={NAME[] "KR 6",COOP_KRC_INDEX 1}\r\n'
+    others = b"".join(
+        b'MACHINE_DEF[%d]={NAME[] "KR 210",COOP_KRC_INDEX %d}\r\n' % (index, index) for index in range(2, 3000)
+    )
+    assert len(others) > TAIL_WINDOW
+    path = write(tmp_path, b"DEFDAT $MACHINE\r\n" + b"x\r\n" * TAIL_WINDOW + first + others + b"ENDDAT\r\n")
+
+    assert detect_machine_model(path) == "KR6"
+
+
+def test_detect_models_runs_as_a_job(make_config):
+    from jobs import Job, JobExecutor
+
+    source = make_config("source/$config.dat", robot_model="KR 16")
+    target = make_config("target/$config.dat", robot_model="KR 210")
+    executor = JobExecutor()
+    try:
+        job = executor.submit(Job("detect robot models", robot_model.detect_models, source, target))
+        assert job.wait(5)
+        assert job.result == ("KR16", "KR210")
+    finally:
+        executor.shutdown()
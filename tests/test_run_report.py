@@ -0,0 +1,39 @@
+import os
+
+from progress import ProgressReporter
+from run_report import RunReport
+from stream_transfer import stream_transfer_values
+from utils.file_utils import text_encoding
+from value_transfer import transfer_values
+
+
+def quiet(message, level="INFO", bold=False):
+    pass
+
+
+def test_section_counters_count_records_present_in_both(source_config, make_config):
+    target = make_config("target/$config.dat", seed=2, base=40)
+    report = RunReport()
+    progress = ProgressReporter()
+
+    transfer_values(source_config, target, quiet, report=report, progress=progress)
+
+    base_data = report.phases["BASE_DATA"]
+    assert base_data["lines_scanned"] == 40
+    assert base_data["records_matched"] == 32
+    assert report.phases["write"]["bytes_written"] == os.path.getsize(target)
+    assert progress.bytes_written == os.path.getsize(target)
+
+
+def test_streaming_counts_encoded_bytes(source_config, make_config):
+    target = make_config("target/$config.dat", seed=2, base=40)
+    with open(target, 'a', encoding=text_encoding()) as file:
+        file.write(";Zusätzliche Größe\n")
+    report = RunReport()
+    progress = ProgressReporter()
+
+    stream_transfer_values(source_config, target, quiet, report=report, progress=progress)
+
+    assert report.phases["BASE_DATA"]["lines_scanned"] == 40
+    assert report.phases["BASE_DATA"]["records_matched"] == 32
+    assert progress.bytes_written == os.path.getsize(target)
@@ -0,0 +1,73 @@
+from config_index import ConfigIndex
+from sections import SECTIONS, apply_sections, build_e6axis_name_mapping, resolve_e6axis_mapping
+
+
+class Log:
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, message, level="INFO", bold=False):
+        self.records.append((level, bold, message))
+
+    def errors(self):
+        return [message for level, _, message in self.records if level == "ERROR"]
+
+
+SOURCE = [
+    "BASE_DATA[1]={X 1.0,Y 2.0,Z 3.0,A 0.0,B 0.0,C 0.0}\n",
+    "DECL E6AXIS xFFT_HOME1={A1 1.0,A2 -90.0}\n",
+    "DECL E6AXIS xFFT_HOME2={A1 2.0,A2 -90.0}\n",
+]
+TARGET = [
+    "BASE_DATA[1]={X 0.0,Y 0.0,Z 0.0,A 0.0,B 0.0,C 0.0}\n",
+    "DECL E6AXIS XHOME1={A1 0.0,A2 0.0}\n",
+    "DECL E6AXIS XHOME2={A1 0.0,A2 0.0}\n",
+]
+
+
+def transfer(source, target, log):
+    source_index = ConfigIndex(source)
+    target_content = list(target)
+    name_mapping = build_e6axis_name_mapping(source_index, ["xFFT_HOME"], log)
+    written = apply_sections(
+        list(SECTIONS.values()), target_content, ConfigIndex(target), log, source_index, name_mapping=name_mapping
+    )
+    return written, target_content
+
+
+def test_default_e6axis_mapping_logs_no_errors():
+    log = Log()
+
+    written, _ = transfer(SOURCE, TARGET, log)
+
+    assert log.errors() == []
+    assert set(written["E6AXIS"]) == {"XHOME1", "XHOME2"}
+
+
+def test_missing_source_name_is_an_error_only_when_the_target_needs_it():
+    log = Log()
+
+    transfer(SOURCE, TARGET + ["DECL E6AXIS XHOME={A1 0.0,A2 0.0}\n"], log)
+
+    assert log.errors() == ["Error: Source key 'HOME' for E6AXIS XHOME not found in source file."]
+
+
+def test_missing_source_name_expands_to_indexed_names():
+    mapping = resolve_e6axis_mapping({"XHOME": "HOME"}, {"HOME1": 1, "HOME2": 2, "HOME10": 10}, Log())
+
+    assert mapping == {"XHOME": "HOME", "XHOME1": "HOME1", "XHOME2": "HOME2", "XHOME3": "HOME10"}
+
+
+def test_explicit_mappings_win_over_indexed_names():
+    mapping = resolve_e6axis_mapping({"XHOME": "HOME", "XHOME1": "xFFT_HOME1"}, {"HOME1": 1, "xFFT_HOME1": 2}, Log())
+
+    assert mapping["XHOME1"] == "xFFT_HOME1"
+
+
+def test_updates_of_frames_are_logged_in_bold():
+    log = Log()
+
+    transfer(SOURCE, TARGET, log)
+
+    bold = {message.split()[1] for level, bold, message in log.records if bold}
+    assert bold == {"BASE_DATA[1]"}
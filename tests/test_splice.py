@@ -0,0 +1,116 @@
+import pytest
+
+from splice import edit_file_lines, line_offsets, restyle_value, splice_record_line
+from utils.file_utils import text_encoding
+
+
+def test_compact_crlf_line_keeps_its_format():
+    line = splice_record_line("BASE_DATA[1]={X 1.0,Y 2.0}\r\n", "BASE_DATA[1]={ X 3.0, Y 4.0 }\n")
+
+    assert line == "BASE_DATA[1]={X 3.0,Y 4.0}\r\n"
+
+
+def test_spaced_line_keeps_its_format():
+    line = splice_record_line("BASE_DATA[1]={ X 1.0, Y 2.0 }\n", "BASE_DATA[1]={X 3.0,Y 4.0}\n")
+
+    assert line == "BASE_DATA[1]={ X 3.0, Y 4.0 }\n"
+
+
+def test_nested_load_data_keeps_its_format():
+    line = splice_record_line(
+        "LOAD_DATA[1]={M -1.0,CM {X 0.0,Y 0.0},J {X 0.0}}\n",
+        "LOAD_DATA[1]={ M 5.0, CM { X 1.0, Y 0.0 }, J { X 0.0 } }\n",
+    )
+
+    assert line == "LOAD_DATA[1]={M 5.0,CM {X 1.0,Y 0.0},J {X 0.0}}\n"
+
+
+def test_added_axes_use_the_spacing_of_their_kind():
+    assert restyle_value("A1 1.0,A2 2.0", " A1 5.0, A2 6.0, E1 0.0 ") == "A1 5.0,A2 6.0,E1 0.0"
+
+
+def test_decl_prefix_is_kept():
+    line = splice_record_line("DECL E6AXIS XHOME1={A1 1.0,A2 -90.0}\n", "E6AXIS XHOME1={ A1 5.0, A2 -90.0 }\n")
+
+    assert line == "DECL E6AXIS XHOME1={A1 5.0,A2 -90.0}\n"
+
+
+def test_formatting_only_change_returns_the_original_line():
+    line = "BASE_DATA[1]={X 1.0,Y 2.0}\r\n"
+
+    assert splice_record_line(line, "BASE_DATA[1]={ X 1.0, Y 2.0 }\n") is line
+
+
+def test_names_are_not_restyled():
+    assert splice_record_line('BASE_NAME[1,]="a , b"\n', 'BASE_NAME[1,]=" "\n') == 'BASE_NAME[1,]=" "\n'
+
+
+def write_lines(path, lines):
+    data = "".join(lines).encode(text_encoding())
+    path.write_bytes(data)
+    return len(data)
+
+
+def test_line_offsets_count_crlf_and_encoded_bytes():
+    lines = ["; zażółć\r\n", "BASE_DATA[1]={X 1.0}\r\n"]
+
+    assert line_offsets(lines) == [0, 10, 32]
+    assert line_offsets(lines, "utf-8") == [0, 14, 36]
+
+
+def test_edit_file_lines_splices_crlf_file_with_non_ascii_comments(tmp_path):
+    path = tmp_path / "$config.dat"
+    original = [
+        "; Narzędzie główne\r\n",
+        "BASE_DATA[1]={X 1.0,Y 2.0}\r\n",
+        "; żółw\r\n",
+        "BASE_DATA[2]={X 5.0,Y 6.0}\r\n",
+    ]
+    size = write_lines(path, original)
+    spliced = {3: splice_record_line(original[3], "BASE_DATA[2]={X 7.5,Y 6.0}\n")}
+
+    assert edit_file_lines(str(path), original, spliced, expected_size=size)
+
+    expected = original[:3] + ["BASE_DATA[2]={X 7.5,Y 6.0}\r\n"]
+    assert path.read_bytes() == "".join(expected).encode(text_encoding())
+
+
+def test_edit_file_lines_refuses_a_file_changed_since_it_was_read(tmp_path):
+    path = tmp_path / "$config.dat"
+    original = ["BASE_DATA[1]={X 1.0}\r\n"]
+    size = write_lines(path, original)
+    path.write_bytes(b"BASE_DATA[1]={X 10.0}\r\n")
+
+    with pytest.raises(OSError):
+        edit_file_lines(str(path), original, {0: "BASE_DATA[1]={X 2.0}\r\n"}, expected_size=size)
+
+
+def test_edit_file_lines_splices_into_the_bytes_it_was_given(tmp_path, monkeypatch):
+    path = tmp_path / "$config.dat"
+    original = ["BASE_DATA[1]={X 1.0}\r\n", "BASE_DATA[2]={X 2.0}\r\n"]
+    write_lines(path, original)
+    data = path.read_bytes()
+    monkeypatch.setattr("splice.read_file", lambda path: pytest.fail("file read again"))
+
+    assert edit_file_lines(str(path), original, {1: "BASE_DATA[2]={X 3.0}\r\n"}, data=data)
+
+    assert path.read_bytes() == b"BASE_DATA[1]={X 1.0}\r\nBASE_DATA[2]={X 3.0}\r\n"
+
+
+def test_purge_refuses_a_file_changed_while_it_was_purged(make_config, monkeypatch):
+    import value_purge
+
+    path = make_config("$config.dat")
+    apply_sections = value_purge.apply_sections
+
+    def apply_and_change_file(*args, **kwargs):
+        result = apply_sections(*args, **kwargs)
+        with open(path, 'a') as file:
+            file.write("; edited meanwhile\n")
+        return result
+
+    monkeypatch.setattr(value_purge, "apply_sections", apply_and_change_file)
+
+    with pytest.raises(OSError):
+        value_purge.purge_values(path, lambda message, level="INFO", bold=False: None)
+    assert open(path).read().endswith("; edited meanwhile\n")
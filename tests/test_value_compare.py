@@ -0,0 +1,80 @@
+import math
+from array import array
+
+import pytest
+
+import value_compare
+from config_index import ConfigIndex
+from value_compare import Tolerances, compare_configs, compare_indexes, out_of_tolerance, parse_tolerance
+
+NAN = math.nan
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    """
+    Run a test once with the pure-Python pass and once with the NumPy pass.
+    """
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(value_compare, "np", None)
+    return request.param
+
+
+def rows(*values):
+    return [array('d', row) for row in values]
+
+
+def test_tolerance_is_absolute_plus_relative_to_the_source(backend):
+    source = rows([10.0, 100.0], [10.0, 100.0])
+    target = rows([10.5, 101.0], [10.6, 101.5])
+
+    # |t - s| <= 0.5 + 0.01 * |s|: 0.5 <= 0.6 and 1.0 <= 1.5, 0.6 <= 0.6, 1.5 <= 1.5 are all within
+    assert out_of_tolerance(source, target, [0.5, 0.5], [0.01, 0.01]) == []
+    assert out_of_tolerance(source, target, [0.5, 0.5], [0.0, 0.0]) == [(0, 1), (1, 0), (1, 1)]
+
+
+def test_nan_on_both_sides_is_equal_on_one_side_is_a_difference(backend):
+    source = rows([NAN, 1.0, NAN])
+    target = rows([NAN, NAN, 1.0])
+
+    assert out_of_tolerance(source, target, [1.0] * 3, [0.0] * 3) == [(0, 1), (0, 2)]
+
+
+def test_records_missing_on_either_side_are_reported(backend):
+    source = ConfigIndex([
+        "BASE_DATA[1]={X 1.0,Y 2.0,Z 3.0,A 0.0,B 0.0,C 0.0}\n",
+        "BASE_DATA[2]={X 1.0,Y 2.0,Z 3.0,A 0.0,B 0.0,C 0.0}\n",
+    ])
+    target = ConfigIndex([
+        "BASE_DATA[1]={X 1.5,Y 2.0,Z 3.0,A 0.0,B 0.0,C 0.0}\n",
+        "BASE_DATA[3]={X 1.0,Y 2.0,Z 3.0,A 0.0,B 0.0,C 0.0}\n",
+    ])
+
+    report = compare_indexes(source, target, sections=["BASE_DATA"])
+
+    assert report["compared"] == {"BASE_DATA": 1}
+    assert [(d["key"], d["axis"], d["delta"]) for d in report["differences"]] == [(1, "X", 0.5)]
+    assert {(m["key"], m["missing_in"]) for m in report["missing"]} == {(3, "source"), (2, "target")}
+
+
+def test_specific_overrides_win():
+    tolerances = Tolerances(0.1, overrides=dict([parse_tolerance("X=0.05"), parse_tolerance("TOOL_DATA.X=0:0.01")]))
+
+    assert tolerances.get("BASE_DATA", "Y") == (0.1, 0.0)
+    assert tolerances.get("BASE_DATA", "X") == (0.05, 0.0)
+    assert tolerances.get("TOOL_DATA", "X") == (0.0, 0.01)
+
+
+def test_numpy_and_python_passes_agree(source_config, make_config, monkeypatch):
+    pytest.importorskip("numpy")
+    tolerances = Tolerances(0.5, 0.001)
+    targets = [make_config(f"target{seed}/$config.dat", seed=seed) for seed in range(2, 5)]
+
+    vectorised = [compare_configs(source_config, target, tolerances) for target in targets]
+    monkeypatch.setattr(value_compare, "np", None)
+    plain = [compare_configs(source_config, target, tolerances) for target in targets]
+
+    assert vectorised == plain
+    assert any(report["differences"] for report in plain)
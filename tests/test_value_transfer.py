@@ -0,0 +1,26 @@
+from config_index import ConfigIndex
+from patterns import match_line
+from utils.file_utils import read_lines
+from value_transfer import transfer_values
+
+
+def quiet_log(message, level="INFO", bold=False):
+    pass
+
+
+def test_default_e6axis_names_transfer_onto_a_crlf_target(source_config, make_config):
+    target = make_config("target/$config.dat", seed=2, crlf=True)
+    before = read_lines(target)
+
+    changed = transfer_values(source_config, target, quiet_log)
+
+    after = read_lines(target)
+    assert "E6AXIS" in changed and "BASE_DATA" in changed
+    assert len(after) == len(before)
+    assert all(line.endswith("\r\n") for line in after)
+    source = ConfigIndex(read_lines(source_config))
+    target_index = ConfigIndex(after)
+    for index in range(1, 9):
+        assert target_index.get("E6AXIS", f"XHOME{index}").value == source.get("E6AXIS", f"xFFT_HOME{index}").value
+    # Zmieniają się tylko linie z rekordami
+    assert all(old == new or match_line(old) for old, new in zip(before, after))
@@ -1,10 +1,11 @@
 import os
-import re
+import queue
 import tkinter as tk
 from tkinter import filedialog, scrolledtext, ttk
-from background_tasks import start_transfer_in_thread
+from jobs import Job, JobExecutor, JobTracker
+from log_bus import LogBus
 from utils.logger import setup_logger
-from purge_file_view import PurgeFileView  # Import the PurgeFileView class
+from purge_file_view import CONFIG_FILE_TYPES, PurgeFileView  # Import the PurgeFileView class
 
 # Setup logger
 logger = setup_logger("file_transfer.log")
@@ -26,6 +27,10 @@ class FileTransferApp:
 
         self.root.geometry("800x600")  # Adjusted window size for layout
 
+        # Wspólna kolejka zadań: ograniczona liczba wątków, jeden zapis naraz na plik docelowy
+        self.executor = JobExecutor(max_workers=2)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Create a Notebook widget for tabs
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill="both", expand=True)
@@ -38,7 +43,59 @@ class FileTransferApp:
         # Create the second tab: Purge File
         self.purge_file_frame = tk.Frame(self.notebook)
         self.notebook.add(self.purge_file_frame, text="Purge File")
-        PurgeFileView(self.purge_file_frame)  # Use the PurgeFileView class
+        PurgeFileView(self.purge_file_frame, self.executor)  # Use the PurgeFileView class
+
+        # Create the third tab: queued, running and finished jobs
+        self.jobs_frame = tk.Frame(self.notebook)
+        self.notebook.add(self.jobs_frame, text="Jobs")
+        self.create_jobs_tab(self.jobs_frame)
+
+    def create_jobs_tab(self, parent):
+        """
+        Create the job list (refreshed from the executor on the Tk thread).
+        """
+        self.jobs_list = tk.Listbox(parent, font=("Courier", 9))
+        self.jobs_list.pack(fill="both", expand=True, padx=10, pady=10)
+        # Jobs in the order of the list rows, so a selected row can be cancelled
+        self.listed_jobs = []
+        self.cancel_job_button = tk.Button(parent, text="Cancel selected job", command=self.cancel_selected_job)
+        self.cancel_job_button.pack(pady=5)
+        self.poll_jobs()
+
+    def poll_jobs(self):
+        """
+        Show the state and progress of every job in the job list.
+        """
+        self.listed_jobs = self.executor.jobs()
+        rows = []
+        for job in self.listed_jobs:
+            percent = job.percent()
+            progress = f"{percent:5.1f}%" if percent is not None and not job.finished else "      "
+            rows.append(f"{job.state:10} {progress} {job.name}" + (f"  ({job.error})" if job.error else ""))
+        if list(self.jobs_list.get(0, tk.END)) != rows:
+            selection = self.jobs_list.curselection()
+            self.jobs_list.delete(0, tk.END)
+            for row in rows:
+                self.jobs_list.insert(tk.END, row)
+            for index in selection:
+                if index < len(rows):
+                    self.jobs_list.selection_set(index)
+        self.root.after(500, self.poll_jobs)
+
+    def cancel_selected_job(self):
+        """
+        Cancel the job selected in the job list (queued jobs never start).
+        """
+        for index in self.jobs_list.curselection():
+            if index < len(self.listed_jobs) and not self.listed_jobs[index].finished:
+                self.listed_jobs[index].cancel()
+
+    def on_close(self):
+        """
+        Cancel the queued and running jobs, wait for the workers and close the window.
+        """
+        self.executor.shutdown(cancel=True, timeout=5)
+        self.root.destroy()
 
     def create_copy_paste_tab(self, parent):
         """
@@ -86,6 +143,8 @@ class FileTransferApp:
         self.robot_model_label.pack(pady=5)
         self.robot_model_canvas = tk.Canvas(left_frame, width=50, height=50)
         self.robot_model_canvas.pack(pady=5)
+        # Latest model detection job (see compare_robot_models)
+        self.model_job = None
 
         # Display models in files
         self.models_info_label = tk.Label(left_frame, text="", justify="left", fg="blue", wraplength=300)
@@ -96,6 +155,11 @@ class FileTransferApp:
         self.checkbox = tk.Checkbutton(left_frame, text="Modify target file directly", variable=self.modify_directly)
         self.checkbox.pack(pady=5)
 
+        # Checkbox for the backup store (replaces the timestamped copy, see utils.backup_store)
+        self.use_backup_store = tk.BooleanVar(value=False)
+        self.backup_store_checkbox = tk.Checkbutton(left_frame, text="Keep previous versions in the backup store", variable=self.use_backup_store)
+        self.backup_store_checkbox.pack(pady=5)
+
         # Checkbox for opening file after process
         self.open_file_after_process = tk.BooleanVar(value=False)
         self.open_file_checkbox = tk.Checkbutton(left_frame, text="Open file as soon as the process finish", variable=self.open_file_after_process)
@@ -109,14 +173,25 @@ class FileTransferApp:
         self.start_button = tk.Button(left_frame, text="Start Transfer", command=self.start_transfer)
         self.start_button.pack(pady=10)
 
+        # Cancel button (stops this tab's queued and running transfers, their targets are left untouched)
+        self.transfer_jobs = JobTracker()
+        self.cancel_button = tk.Button(left_frame, text="Cancel", command=self.cancel_transfer)
+        self.cancel_button.pack(pady=5)
+
         # Progress bar
         self.progress = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(left_frame, orient="horizontal", length=400, mode="determinate", variable=self.progress)
         self.progress_bar.pack(pady=10)
 
+        # Every job has its own progress counters; the Tk thread polls those of the current job
+        self.poll_progress()
+
         # Logger display in the right frame
         self.log_display = scrolledtext.ScrolledText(right_frame, width=70, height=30, state="disabled", wrap="word")
         self.log_display.pack(fill="both", expand=True)
+
+        # Workers only queue log records; the Tk side inserts them in batches
+        self.log_bus = LogBus(self.log_display, file_logger=logger)
         
         # Initialize advanced options variables
         self.update_base_data = tk.BooleanVar(value=True)
@@ -139,15 +214,31 @@ class FileTransferApp:
         self.version_label = tk.Label(footer_frame, text="Ver 0.2", fg="gray", anchor="e")
         self.version_label.pack(side="right", padx=5)
 
+    def select_config_file(self, title):
+        """
+        Ask for a config file; for a KRC archive .zip return the path of the $config.dat inside it.
+        """
+        file_path = filedialog.askopenfilename(title=title, filetypes=CONFIG_FILE_TYPES)
+        if not file_path:
+            return file_path
+
+        from utils.archive_utils import resolve_config_path
+
+        try:
+            return resolve_config_path(file_path)
+        except OSError as e:
+            self.log_message_with_color(f"Error opening archive: {e}", level="ERROR")
+            return ""
+
     def select_source_file(self):
-        file_path = filedialog.askopenfilename(title="Select Source File")
+        file_path = self.select_config_file("Select Source File")
         if file_path:
             self.source_entry.delete(0, tk.END)
             self.source_entry.insert(0, file_path)
             self.compare_robot_models()
 
     def select_target_file(self):
-        file_path = filedialog.askopenfilename(title="Select Target File")
+        file_path = self.select_config_file("Select Target File")
         if file_path:
             self.target_entry.delete(0, tk.END)
             self.target_entry.insert(0, file_path)
@@ -160,34 +251,47 @@ class FileTransferApp:
         if not source_file or not target_file:
             return
 
+        # Import przy pierwszym użyciu, żeby nie opóźniać pojawienia się okna
+        from robot_model import detect_models
+
+        # Extract robot models in the job queue (a file without a model is read to its end)
         try:
-            # Extract robot model from source file
-            with open(source_file, 'r') as src:
-                source_content = src.read()
-            source_match = re.search(r'kr\s*\d+', source_content, re.IGNORECASE)  # Case-insensitive search
-            source_model = source_match.group(0).replace(" ", "").upper() if source_match else None  # Convert to uppercase
-
-            # Extract robot model from target file
-            with open(target_file, 'r') as tgt:
-                target_content = tgt.read()
-            target_match = re.search(r'MACHINE_DEF\[\d+\]=\{NAME\[\]\s*"KR\s*\d+', target_content)
-            target_model = target_match.group(0).split('"')[1].replace(" ", "").upper() if target_match else None  # Convert to uppercase
-
-            # Compare models and update the canvas
-            self.robot_model_canvas.delete("all")
-            if source_model and target_model and source_model == target_model:
-                self.robot_model_canvas.create_rectangle(0, 0, 50, 50, fill="green")
-                self.log_message_with_color("Robot models match.", level="INFO")
-            else:
-                self.robot_model_canvas.create_rectangle(0, 0, 50, 50, fill="red")
-                self.log_message_with_color("Robot models do not match.", level="WARNING")
-
-            # Update models info label
-            self.models_info_label.config(
-                text=f"Source File Model: {source_model or 'Not Found'}\nTarget File Model: {target_model or 'Not Found'}"
-            )
-        except Exception as e:
-            self.log_message_with_color(f"Error comparing robot models: {e}", level="ERROR")
+            self.model_job = self.executor.submit(Job("detect robot models", detect_models, source_file, target_file))
+        except queue.Full as e:
+            self.log_message_with_color(f"Robot models not compared: {e}", level="ERROR")
+            return
+        self.root.after(50, self.show_robot_models, self.model_job)
+
+    def show_robot_models(self, job):
+        """
+        Show the result of a model detection job once it finished (on the Tk thread).
+        """
+        if job is not self.model_job:
+            return  # Wynik nieaktualny - w międzyczasie wybrano inny plik
+        if not job.finished:
+            self.root.after(50, self.show_robot_models, job)
+            return
+        if job.state == "failed":
+            self.log_message_with_color(f"Error comparing robot models: {job.error}", level="ERROR")
+            return
+        if job.state != "done":
+            return
+
+        source_model, target_model = job.result
+
+        # Compare models and update the canvas
+        self.robot_model_canvas.delete("all")
+        if source_model and target_model and source_model == target_model:
+            self.robot_model_canvas.create_rectangle(0, 0, 50, 50, fill="green")
+            self.log_message_with_color("Robot models match.", level="INFO")
+        else:
+            self.robot_model_canvas.create_rectangle(0, 0, 50, 50, fill="red")
+            self.log_message_with_color("Robot models do not match.", level="WARNING")
+
+        # Update models info label
+        self.models_info_label.config(
+            text=f"Source File Model: {source_model or 'Not Found'}\nTarget File Model: {target_model or 'Not Found'}"
+        )
 
     def open_advanced_options(self):
         """
@@ -236,24 +340,34 @@ class FileTransferApp:
         target_file = self.target_entry.get()
 
         if not source_file or not target_file:
-            self.log_message("Please select both source and target files.")
+            self.log_message_with_color("Please select both source and target files.", level="ERROR")
             return
 
-        # Start the transfer in a separate thread
-        start_transfer_in_thread(
-            source_file, target_file,
-            update_base_data_flag=self.update_base_data.get(),
-            update_base_name_flag=self.update_base_name.get(),
-            update_base_type_flag=self.update_base_type.get(),
-            update_tool_data_flag=self.update_tool_data.get(),
-            update_tool_type_flag=self.update_tool_type.get(),
-            update_tool_name_flag=self.update_tool_name.get(),
-            update_load_data_flag=self.update_load_data.get(),
-            update_e6axis_flag=self.update_e6axis.get(),
-            e6axis_names=[name.strip() for name in self.e6axis_names.get().split(",")],
-            modify_directly=self.modify_directly.get(),
-            log_message=self.log_message_with_color
-        )
+        # Silnik transferu (sekcje, rekordy, cache) ładowany dopiero przy pierwszym transferze
+        from background_tasks import start_transfer_in_thread
+        from utils.backup_store import DEFAULT_DIRECTORY
+
+        # Queue the transfer (jobs on the same target file run one after another)
+        try:
+            self.transfer_jobs.add(start_transfer_in_thread(
+                source_file, target_file,
+                update_base_data_flag=self.update_base_data.get(),
+                update_base_name_flag=self.update_base_name.get(),
+                update_base_type_flag=self.update_base_type.get(),
+                update_tool_data_flag=self.update_tool_data.get(),
+                update_tool_type_flag=self.update_tool_type.get(),
+                update_tool_name_flag=self.update_tool_name.get(),
+                update_load_data_flag=self.update_load_data.get(),
+                update_e6axis_flag=self.update_e6axis.get(),
+                e6axis_names=[name.strip() for name in self.e6axis_names.get().split(",")],
+                modify_directly=self.modify_directly.get(),
+                log_message=self.log_message_with_color,
+                executor=self.executor,
+                backup_store=DEFAULT_DIRECTORY if self.use_backup_store.get() else None
+            ))
+        except queue.Full as e:
+            self.log_message_with_color(f"Transfer not started: {e}", level="ERROR")
+            return
 
         # Open the file if the option is selected
         if self.open_file_after_process.get():
@@ -262,43 +376,36 @@ class FileTransferApp:
             except Exception as e:
                 self.log_message_with_color(f"Error opening file: {e}", level="ERROR")
 
+    def cancel_transfer(self):
+        """
+        Request cancellation of this tab's queued and running transfers.
+        """
+        if self.transfer_jobs.cancel():
+            self.log_message_with_color("Cancelling transfer...", level="WARNING")
+
     def log_message_with_color(self, message, level="INFO", bold=False):
         """
         Log a message to the log display with a specific color and optional bold formatting.
 
+        Safe to call from worker threads: the record is queued on the log bus
+        and written to the display and the log file on the Tk thread.
+
         Args:
             message (str): The message to log.
             level (str): The log level ("INFO", "ERROR", "WARNING").
             bold (bool): Whether to make the text bold.
         """
-        self.log_display.config(state="normal")
-
-        # Map log levels to colors
-        colors = {
-            "INFO": "green",
-            "ERROR": "red",
-            "WARNING": "orange"
-        }
-        color = colors.get(level, "black")  # Default to black if level is unknown
-
-        # Add the log level prefix to the message
-        formatted_message = f"[{level}] {message}\n"
-
-        # Insert the message with the appropriate color and bold formatting
-        tag_name = f"{level}_bold" if bold else level
-        self.log_display.insert(tk.END, formatted_message, tag_name)
-        self.log_display.tag_config(tag_name, foreground=color, font=("TkDefaultFont", 10, "bold" if bold else "normal"))
-
-        self.log_display.config(state="disabled")
-        self.log_display.see(tk.END)
-
-        # Log to the file using the logger
-        if level == "INFO":
-            logger.info(message)
-        elif level == "ERROR":
-            logger.error(message)
-        elif level == "WARNING":
-            logger.warning(message)
+        self.log_bus.log(message, level=level, bold=bold)
+
+    def poll_progress(self):
+        """
+        Show the progress of the current transfer job (see JobTracker.current) in the progress bar.
+        """
+        job = self.transfer_jobs.current()
+        percent = job.percent() if job is not None else None
+        if percent is not None:
+            self.progress.set(percent)
+        self.root.after(100, self.poll_progress)
 
     def animate_lights(self):
         # Animation logic for the lights
@@ -0,0 +1,228 @@
+"""
+Config files inside KRC archive zips, addressed as "archive.zip!/KRC/R1/System/$config.dat".
+
+A member is read by streaming it out of the zip; nothing is extracted to
+disk. Writing a member rebuilds the archive: every other member is copied
+as its raw compressed bytes (local header, data and data descriptor), so
+it is never decompressed or recompressed, and only the edited member is
+compressed again.
+"""
+import copy
+import fnmatch
+import glob
+import os
+import shutil
+import struct
+import time
+import zipfile
+from contextlib import contextmanager
+
+# Separator archiwum i ścieżki wewnątrz niego: archive.zip!/KRC/R1/System/$config.dat
+ARCHIVE_SEPARATOR = "!/"
+
+# Położenie $config.dat w archiwum KRC, wybierane, gdy archiwum zawiera kilka takich plików
+CONFIG_MEMBER = "KRC/R1/System/$config.dat"
+
+# Metody kompresji, którymi zipfile potrafi zapisać zmieniony plik
+_WRITABLE_COMPRESSION = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA)
+
+_COPY_CHUNK = 1024 * 1024
+_DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+_ZIP64_EXTRA_ID = 0x0001
+
+
+def split_archive_path(path):
+    """
+    Return (archive path, member name) for "archive.zip!/member", None for a plain path.
+    """
+    archive, separator, member = path.partition(ARCHIVE_SEPARATOR)
+    if not separator or not archive.lower().endswith(".zip"):
+        return None
+    return archive, member.replace("\\", "/").lstrip("/")
+
+
+def is_archive_path(path):
+    return split_archive_path(path) is not None
+
+
+def join_archive_path(archive, member):
+    return f"{archive}{ARCHIVE_SEPARATOR}{member}"
+
+
+@contextmanager
+def _open_archive(archive):
+    try:
+        zip_file = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile as e:
+        raise OSError(f"{archive} is not a valid zip archive: {e}") from None
+    with zip_file:
+        yield zip_file
+
+
+def _get_info(zip_file, archive, member):
+    try:
+        return zip_file.getinfo(member)
+    except KeyError:
+        raise FileNotFoundError(f"No such file in archive {archive}: {member}") from None
+
+
+def member_info(path):
+    """
+    Return the ZipInfo of an archive path (FileNotFoundError if the member does not exist).
+    """
+    archive, member = split_archive_path(path)
+    with _open_archive(archive) as zip_file:
+        return _get_info(zip_file, archive, member)
+
+
+@contextmanager
+def open_member(path):
+    """
+    Open an archive member for reading as a binary stream (decompressed on the fly).
+    """
+    archive, member = split_archive_path(path)
+    with _open_archive(archive) as zip_file:
+        with zip_file.open(_get_info(zip_file, archive, member)) as stream:
+            yield stream
+
+
+def read_member(path):
+    with open_member(path) as stream:
+        return stream.read()
+
+
+def find_members(archive, pattern):
+    """
+    Return the archive paths of all members matching a glob pattern, e.g. "*/$config.dat".
+
+    The match is case-insensitive, as KRC archives come from Windows controllers.
+    """
+    pattern = pattern.lower()
+    with _open_archive(archive) as zip_file:
+        return [
+            join_archive_path(archive, info.filename) for info in zip_file.infolist()
+            if not info.is_dir() and fnmatch.fnmatchcase(info.filename.lower(), pattern)
+        ]
+
+
+def resolve_config_path(path):
+    """
+    Return path itself, or for a KRC archive .zip the archive path of its $config.dat.
+
+    CONFIG_MEMBER is preferred when the archive holds several; otherwise the
+    shortest member path wins. Raises FileNotFoundError if there is none.
+    """
+    if not path.lower().endswith(".zip"):
+        return path
+    members = find_members(path, "*$config.dat")
+    if not members:
+        raise FileNotFoundError(f"No $config.dat in archive {path}")
+    return min(members, key=lambda member: (
+        split_archive_path(member)[1].lower() != CONFIG_MEMBER.lower(), len(member), member
+    ))
+
+
+def expand_archive_pattern(pattern):
+    """
+    Expand glob patterns on both sides of "!/", e.g. "backups/*.zip!/KRC/*/System/$config.dat".
+    """
+    archive, member = split_archive_path(pattern)
+    archives = sorted(glob.glob(archive, recursive=True)) if glob.has_magic(archive) else [archive]
+    if not glob.has_magic(member):
+        return [join_archive_path(path, member) for path in archives]
+    return [path for archive in archives for path in find_members(archive, member)]
+
+
+def _local_header_size(source, info):
+    """
+    Return (size of the local file header with name and extra field, whether it has a zip64 extra).
+    """
+    source.seek(info.header_offset)
+    header = source.read(zipfile.sizeFileHeader)
+    if len(header) != zipfile.sizeFileHeader or header[:4] != zipfile.stringFileHeader:
+        raise OSError(f"Bad local file header of {info.filename}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    source.seek(name_length, os.SEEK_CUR)
+    extra = source.read(extra_length)
+    zip64 = False
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack("<HH", extra[position:position + 4])
+        zip64 = zip64 or header_id == _ZIP64_EXTRA_ID
+        position += 4 + length
+    return zipfile.sizeFileHeader + name_length + extra_length, zip64
+
+
+def _copy_raw(source, zip_out, info):
+    """
+    Append one member of source (an open binary file) to zip_out without recompressing it.
+    """
+    header_size, zip64 = _local_header_size(source, info)
+    length = header_size + info.compress_size
+    if info.flag_bits & 0x08:
+        # Deskryptor danych po skompresowanej treści: opcjonalna sygnatura, CRC i dwa rozmiary
+        source.seek(info.header_offset + length)
+        signature = source.read(4)
+        length += (4 if signature == _DATA_DESCRIPTOR_SIGNATURE else 0) + (20 if zip64 else 12)
+
+    new_info = copy.copy(info)
+    new_info.header_offset = zip_out.fp.tell()
+    source.seek(info.header_offset)
+    while length:
+        chunk = source.read(min(length, _COPY_CHUNK))
+        if not chunk:
+            raise OSError(f"Unexpected end of archive in {info.filename}")
+        zip_out.fp.write(chunk)
+        length -= len(chunk)
+
+    # zipfile nie ma publicznego API do kopiowania surowych danych, więc
+    # rejestrujemy wpis tak, jak robi to ZipFile.write(); close() zapisze katalog centralny
+    zip_out.filelist.append(new_info)
+    zip_out.NameToInfo[new_info.filename] = new_info
+    zip_out.start_dir = zip_out.fp.tell()
+
+
+def _write_member(zip_out, member, data, old_info):
+    info = zipfile.ZipInfo(member, date_time=time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    if old_info is not None:
+        if old_info.compress_type in _WRITABLE_COMPRESSION:
+            info.compress_type = old_info.compress_type
+        info.external_attr = old_info.external_attr
+        info.create_system = old_info.create_system
+        info.comment = old_info.comment
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        info.file_size = len(data)
+        with zip_out.open(info, 'w') as out:
+            out.write(data)
+    else:
+        info.file_size = os.fstat(data.fileno()).st_size
+        with zip_out.open(info, 'w') as out:
+            shutil.copyfileobj(data, out, _COPY_CHUNK)
+
+
+def rewrite_archive(archive, out, member, data):
+    """
+    Write a copy of archive to out with one member replaced, added or removed.
+
+    Every other member keeps its position and is copied raw. A replaced
+    member keeps its position, compression method and attributes.
+
+    Args:
+        archive (str): Path of the existing zip.
+        out (file): Seekable binary file the new zip is written to.
+        member (str): Name of the member inside the archive.
+        data: New content (bytes or a binary file opened for reading); None removes the member.
+    """
+    with _open_archive(archive) as zip_in, zipfile.ZipFile(out, 'w') as zip_out:
+        zip_out.comment = zip_in.comment
+        written = False
+        with open(archive, 'rb') as source:
+            for info in zip_in.infolist():
+                if info.filename != member:
+                    _copy_raw(source, zip_out, info)
+                elif data is not None:
+                    _write_member(zip_out, member, data, info)
+                    written = True
+        if data is not None and not written:
+            _write_member(zip_out, member, data, None)
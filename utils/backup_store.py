@@ -0,0 +1,187 @@
+"""
+Content-addressed, compressed store of pre-edit copies of target files.
+
+Every backup hashes the file (SHA-256) and stores its content once, as
+objects/<2 hex>/<hash>.xz (LZMA) or .zz (zlib), no matter how many runs back
+up the same content; index.jsonl records one (path, timestamp, hash, size)
+line per backup. Disk usage grows with the number of distinct file
+versions, not with the number of runs.
+"""
+import datetime
+import hashlib
+import json
+import lzma
+import os
+import zlib
+
+from utils.file_utils import file_exists, file_fingerprint, read_file, write_chunks_atomic, write_file_atomic
+
+# Kodeki: rozszerzenie pliku obiektu, kompresja, dekompresja
+CODECS = {
+    "lzma": (".xz", lzma.compress, lzma.decompress),
+    "zlib": (".zz", lambda data: zlib.compress(data, 9), zlib.decompress),
+}
+
+INDEX_FILE = "index.jsonl"
+
+# Katalog magazynu używany przez GUI
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), "KUKA_ACE", "backups")
+
+
+class BackupStore:
+    """
+    A backup directory; safe to share between the processes of a batch run.
+
+    Objects are written atomically under their hash, so two processes
+    storing the same content write the same file, and index lines are
+    appended with a single O_APPEND write each.
+    """
+
+    def __init__(self, directory, compression="lzma"):
+        """
+        Args:
+            directory (str): Store directory (created if missing).
+            compression (str): Codec for new objects, "lzma" or "zlib"; objects
+                already stored with the other codec stay readable.
+        """
+        if compression not in CODECS:
+            raise ValueError(f"Unknown compression '{compression}', expected one of {', '.join(CODECS)}")
+        self.directory = directory
+        self.compression = compression
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+
+    def _object_path(self, sha256, codec):
+        return os.path.join(self.directory, "objects", sha256[:2], sha256 + CODECS[codec][0])
+
+    def _find_object(self, sha256):
+        """
+        Return (object path, codec) of a stored hash or None.
+        """
+        for codec in CODECS:
+            path = self._object_path(sha256, codec)
+            if os.path.exists(path):
+                return path, codec
+        return None
+
+    def backup(self, path):
+        """
+        Store the current content of path (a file or an archive member) and record it in the index.
+
+        Returns:
+            dict: The index entry: path, timestamp, sha256, size and stored
+            (compressed bytes written, 0 if the content was already stored).
+        """
+        path = file_fingerprint(path)[0]
+        data = read_file(path)
+        sha256 = hashlib.sha256(data).hexdigest()
+        stored = 0
+        if self._find_object(sha256) is None:
+            object_path = self._object_path(sha256, self.compression)
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            compressed = CODECS[self.compression][1](data)
+            write_chunks_atomic(object_path, [compressed])
+            stored = len(compressed)
+
+        entry = {
+            "path": path,
+            "timestamp": datetime.datetime.now().isoformat(timespec="microseconds"),
+            "sha256": sha256,
+            "size": len(data),
+            "stored": stored,
+        }
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+        return entry
+
+    def entries(self, path=None):
+        """
+        Return the index entries, oldest first; only those of path if given.
+        """
+        if path is not None:
+            path = _normalise(path)
+        entries = []
+        try:
+            with open(self.index_path, 'r', encoding="utf-8") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if path is None or _normalise(entry["path"]) == path:
+                        entries.append(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def find(self, path, sha256=None):
+        """
+        Return the newest entry of path, or the one whose hash starts with sha256.
+
+        Raises FileNotFoundError if there is no such backup and ValueError if
+        the hash prefix matches several different versions.
+        """
+        entries = self.entries(path)
+        if sha256 is not None:
+            entries = [entry for entry in entries if entry["sha256"].startswith(sha256.lower())]
+            if len({entry["sha256"] for entry in entries}) > 1:
+                raise ValueError(f"Hash prefix '{sha256}' matches several backups of {path}")
+        if not entries:
+            raise FileNotFoundError(f"No backup of {path}" + (f" with hash {sha256}" if sha256 else ""))
+        return entries[-1]
+
+    def read(self, sha256):
+        """
+        Return the content stored under a full hash, checked against it.
+        """
+        found = self._find_object(sha256)
+        if found is None:
+            raise FileNotFoundError(f"Backup object {sha256} is missing from {self.directory}")
+        object_path, codec = found
+        with open(object_path, 'rb') as file:
+            data = CODECS[codec][2](file.read())
+        if hashlib.sha256(data).hexdigest() != sha256:
+            raise OSError(f"Backup object {sha256} is corrupted")
+        return data
+
+    def restore(self, path, sha256=None, destination=None):
+        """
+        Write a backed-up version of path to destination (default: path itself).
+
+        The current content of destination is backed up first, so a restore
+        can itself be undone.
+
+        Returns:
+            dict: The index entry that was restored.
+        """
+        entry = self.find(path, sha256)
+        data = self.read(entry["sha256"])
+        destination = destination or entry["path"]
+        if file_exists(destination):
+            self.backup(destination)
+        write_file_atomic(destination, data)
+        return entry
+
+    def stats(self):
+        """
+        Return the number of backups and objects, bytes backed up and bytes stored on disk.
+        """
+        entries = self.entries()
+        objects = {}
+        for entry in entries:
+            if entry["sha256"] not in objects:
+                found = self._find_object(entry["sha256"])
+                objects[entry["sha256"]] = os.path.getsize(found[0]) if found else 0
+        return {
+            "backups": len(entries),
+            "objects": len(objects),
+            "backed_up_bytes": sum(entry["size"] for entry in entries),
+            "stored_bytes": sum(objects.values()),
+        }
+
+
+def _normalise(path):
+    return os.path.normcase(os.path.abspath(path))
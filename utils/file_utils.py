@@ -0,0 +1,307 @@
+import io
+import locale
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from shutil import copyfile, copymode
+
+from utils.archive_utils import (
+    join_archive_path, member_info, open_member, read_member, rewrite_archive, split_archive_path
+)
+
+
+def prepare_target_file(target_file, modify_directly, log_message, backup_store=None):
+    """
+    Return the path of the file that should be edited.
+
+    When modify_directly is False the target is copied next to the original
+    with a timestamp suffix and the copy is returned instead. For a target
+    inside an archive ("archive.zip!/...") the copy is a new member of the
+    same archive.
+
+    Args:
+        target_file (str): Path of the selected target file.
+        modify_directly (bool): Whether the target should be edited in place.
+        log_message (function): Function to log messages.
+        backup_store (BackupStore): Store that receives the pre-edit content of
+            the target (see utils.backup_store). It replaces the timestamped
+            copy: the target is then always edited in place.
+
+    Returns:
+        str: Path of the file to edit, or None if the copy or backup failed.
+    """
+    if backup_store is not None:
+        try:
+            entry = backup_store.backup(target_file)
+            log_message(f"Backed up {target_file} ({entry['sha256'][:12]}).", level="INFO")
+        except OSError as e:
+            log_message(f"Error backing up target file: {e}", level="ERROR")
+            return None
+        return target_file
+
+    if modify_directly:
+        return target_file
+
+    try:
+        base, ext = os.path.splitext(target_file)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        new_target_file = f"{base}_{timestamp}{ext}"
+        if split_archive_path(target_file):
+            write_chunks_atomic(new_target_file, [read_member(target_file)])
+        else:
+            copyfile(target_file, new_target_file)
+        log_message(f"Created copy of target file: {new_target_file}", level="INFO")
+        return new_target_file
+    except OSError as e:
+        log_message(f"Error creating copy of target file: {e}", level="ERROR")
+        return None
+
+
+def file_fingerprint(path):
+    """
+    Return (absolute path, mtime_ns, size) identifying the current file version.
+
+    For an archive path the mtime is the archive's and the size the member's
+    uncompressed size.
+    """
+    archive = split_archive_path(path)
+    if archive:
+        path = join_archive_path(os.path.abspath(archive[0]), archive[1])
+        return path, os.stat(archive[0]).st_mtime_ns, member_info(path).file_size
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def text_encoding():
+    """
+    Return the encoding open() uses for text files by default.
+    """
+    return locale.getpreferredencoding(False)
+
+
+def split_lines(text):
+    """
+    Split text into lines on "\n" only, keeping the line endings ("\r\n" stays intact).
+
+    Unlike readlines() in text mode nothing is translated, so the lengths of
+    the lines add up to the length of the text.
+    """
+    lines = text.split("\n")
+    last = lines.pop()
+    lines = [line + "\n" for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def disk_path(path):
+    """
+    Return the file on disk that holds path: the archive for an archive path, path itself otherwise.
+    """
+    archive = split_archive_path(path)
+    return archive[0] if archive else path
+
+
+def file_size(path):
+    """
+    Return the size of a file; for an archive path the member's uncompressed size.
+    """
+    if split_archive_path(path):
+        return member_info(path).file_size
+    return os.path.getsize(path)
+
+
+def read_file(path):
+    """
+    Return the content of a file (or of an archive member) as bytes.
+    """
+    if split_archive_path(path):
+        return read_member(path)
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+@contextmanager
+def open_text(path, newline=None):
+    """
+    Open a file (or an archive member, streamed from the zip) for reading as text.
+    """
+    if not split_archive_path(path):
+        with open(path, 'r', newline=newline) as file:
+            yield file
+        return
+    with open_member(path) as stream, io.TextIOWrapper(stream, encoding=text_encoding(), newline=newline) as file:
+        yield file
+
+
+def decode_lines(data):
+    """
+    Decode file content (bytes) into split_lines() lines (line endings preserved).
+    """
+    return split_lines(data.decode(text_encoding()))
+
+
+def read_lines(path):
+    """
+    Read a text file into split_lines() lines (line endings preserved).
+    """
+    return decode_lines(read_file(path))
+
+
+def encode_lines(lines):
+    """
+    Encode text lines exactly as open(path, 'w').writelines(lines) would write them.
+    """
+    text = "".join(lines)
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode(text_encoding())
+
+
+def file_has_content(path, data):
+    """
+    Return True if the file at path already contains exactly data (bytes).
+    """
+    try:
+        if file_size(path) != len(data):
+            return False
+        return read_file(path) == data
+    except OSError:
+        return False
+
+
+def make_temp_file(path):
+    """
+    Create a temporary file next to path (same directory, so os.replace is atomic).
+
+    Returns:
+        tuple: (file descriptor, temporary path) as from tempfile.mkstemp.
+    """
+    target_dir = os.path.dirname(os.path.abspath(disk_path(path)))
+    return tempfile.mkstemp(dir=target_dir, prefix=".kuka_ace_", suffix=".tmp")
+
+
+def commit_temp_file(temp_file, path):
+    """
+    Atomically replace path with an already written and fsynced temp_file.
+
+    The permission bits of path are kept and the directory entry is fsynced
+    where the platform allows it. For an archive path the temp file becomes
+    the new member and the archive is rebuilt (see write_member_atomic).
+    """
+    if split_archive_path(path):
+        with open(temp_file, 'rb') as data:
+            write_member_atomic(path, data)
+        os.remove(temp_file)
+        return
+
+    if os.path.exists(path):
+        copymode(path, temp_file)
+    os.replace(temp_file, path)
+
+    # Na Windows katalogu nie da się otworzyć do fsync
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_file_atomic(path, data):
+    """
+    Write data (bytes) to path through a fsynced temporary file and os.replace.
+
+    A crash leaves either the old or the new file, never a truncated one.
+    Nothing is written (and the mtime is kept) if the file already holds data.
+
+    Returns:
+        bool: True if the file was written, False if it was already identical.
+    """
+    if file_has_content(path, data):
+        return False
+    write_chunks_atomic(path, [data])
+    return True
+
+
+def write_chunks_atomic(path, chunks):
+    """
+    Atomically replace path with the concatenation of chunks (bytes or memoryview).
+
+    Same temp file / fsync / os.replace sequence as write_file_atomic, but
+    without the identity check; memoryview chunks are written without copying.
+    """
+    if split_archive_path(path):
+        write_member_atomic(path, b"".join(chunks))
+        return
+
+    fd, temp_file = make_temp_file(path)
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk)
+            file.flush()
+            os.fsync(file.fileno())
+        commit_temp_file(temp_file, path)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def write_lines_atomic(path, lines):
+    """
+    write_file_atomic for text lines (encoded as in text mode).
+    """
+    return write_file_atomic(path, encode_lines(lines))
+
+
+def write_member_atomic(path, data):
+    """
+    Replace (or add) an archive member by rebuilding the archive atomically.
+
+    The other members are copied raw, without recompressing them, into a
+    temporary zip next to the archive, which then replaces it as in
+    write_chunks_atomic.
+
+    Args:
+        path (str): Archive path, "archive.zip!/KRC/R1/System/$config.dat".
+        data: New content (bytes or a binary file opened for reading); None removes the member.
+    """
+    archive, member = split_archive_path(path)
+    fd, temp_file = make_temp_file(archive)
+    try:
+        with os.fdopen(fd, 'w+b') as file:
+            rewrite_archive(archive, file, member, data)
+            file.flush()
+            os.fsync(file.fileno())
+        commit_temp_file(temp_file, archive)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+def remove_file(path):
+    """
+    Delete a file, or remove a member from its archive.
+    """
+    if split_archive_path(path):
+        write_member_atomic(path, None)
+    else:
+        os.remove(path)
+
+
+def file_exists(path):
+    """
+    os.path.exists that also understands archive paths.
+    """
+    if not split_archive_path(path):
+        return os.path.exists(path)
+    try:
+        member_info(path)
+        return True
+    except OSError:
+        return False
@@ -1,14 +1,8 @@
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog
-from handlers.base_data_handler import update_base_data
-from handlers.base_name_handler import update_base_name
-from handlers.base_type_handler import update_base_type
-from handlers.tool_data_handler import update_tool_data
-from handlers.tool_type_handler import update_tool_type
-from handlers.tool_name_handler import update_tool_name
-from handlers.load_data_handler import update_load_data
-from handlers.e6axis_handler import update_e6axis
+from config_index import ConfigIndex
+from sections import apply_sections, enabled_sections
 from utils.file_utils import prepare_target_file
 
 
@@ -158,21 +152,18 @@ class PurgeFileView:
             with open(target_file, 'r') as file:
                 target_content = file.readlines()
 
-            # Process each handler based on the selected options
-            handlers = [
-                (update_base_data, self.update_base_data.get()),
-                (update_base_name, self.update_base_name.get()),
-                (update_base_type, self.update_base_type.get()),
-                (update_tool_data, self.update_tool_data.get()),
-                (update_tool_type, self.update_tool_type.get()),
-                (update_tool_name, self.update_tool_name.get()),
-                (update_load_data, self.update_load_data.get()),
-                (update_e6axis, self.update_e6axis.get())
-            ]
-
-            for handler, enabled in handlers:
-                if enabled:
-                    handler([], target_content, self.log_message, purge_mode=True)
+            # All selected sections run on one index of the target, scanned once
+            specs = enabled_sections({
+                "BASE_DATA": self.update_base_data.get(),
+                "BASE_NAME": self.update_base_name.get(),
+                "BASE_TYPE": self.update_base_type.get(),
+                "TOOL_DATA": self.update_tool_data.get(),
+                "TOOL_TYPE": self.update_tool_type.get(),
+                "TOOL_NAME": self.update_tool_name.get(),
+                "LOAD_DATA": self.update_load_data.get(),
+                "E6AXIS": self.update_e6axis.get(),
+            })
+            apply_sections(specs, target_content, ConfigIndex(target_content), self.log_message, purge_mode=True)
 
             # Write the updated content back to the file
             with open(target_file, 'w') as file:
@@ -0,0 +1,239 @@
+"""
+Numeric comparison of BASE_DATA, TOOL_DATA, LOAD_DATA and E6AXIS between configs.
+
+Each section is turned into a (records x axes) float matrix and compared in
+one vectorised pass when NumPy is installed; without NumPy the same check
+runs in plain Python on the records' arrays.
+"""
+import math
+import weakref
+
+try:
+    import numpy as np
+except ImportError:  # NumPy jest opcjonalny - bez niego liczymy w czystym Pythonie
+    np = None
+
+from config_cache import get_parsed_config
+from sections import SECTIONS, build_e6axis_name_mapping, resolve_e6axis_mapping
+
+# Sekcje z wartościami liczbowymi (schemat rekordu daje nazwy kolumn macierzy)
+COMPARE_SECTIONS = {name: spec for name, spec in SECTIONS.items() if spec.schema is not None}
+
+# Sparsowane rekordy źródła, żeby przy porównaniu floty parsować je tylko raz
+_source_records_cache = weakref.WeakKeyDictionary()
+
+
+def source_records(source_index, section, log_callback):
+    """
+    Return the parsed records of a source section, parsed once per index.
+    """
+    parsed = _source_records_cache.setdefault(source_index, {})
+    if section not in parsed:
+        parsed[section] = COMPARE_SECTIONS[section].parse_source(source_index, log_callback)
+    return parsed[section]
+
+
+class Tolerances:
+    """
+    Per-axis absolute and relative tolerances.
+
+    A value is within tolerance if |target - source| <= abs + rel * |source|.
+    Overrides are keyed by axis ("X", "A1", "M") or by section and axis
+    ("TOOL_DATA.X"); the more specific key wins.
+    """
+
+    def __init__(self, abs_tol=0.0, rel_tol=0.0, overrides=None):
+        """
+        Args:
+            abs_tol (float): Default absolute tolerance.
+            rel_tol (float): Default relative tolerance (fraction of the source value).
+            overrides (dict): {axis or "SECTION.axis": (abs_tol, rel_tol)}.
+        """
+        self.abs_tol = abs_tol
+        self.rel_tol = rel_tol
+        self.overrides = dict(overrides or {})
+
+    def get(self, section, axis):
+        return self.overrides.get(f"{section}.{axis}", self.overrides.get(axis, (self.abs_tol, self.rel_tol)))
+
+    def vectors(self, section, axes):
+        """
+        Return ([abs_tol per axis], [rel_tol per axis]) for a section.
+        """
+        pairs = [self.get(section, axis) for axis in axes]
+        return [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+
+
+def parse_tolerance(text):
+    """
+    Parse "AXIS=ABS[:REL]" (e.g. "X=0.05" or "TOOL_DATA.M=0:0.01") into (key, (abs, rel)).
+    """
+    key, _, value = text.partition("=")
+    if not key or not value:
+        raise ValueError(f"Invalid tolerance '{text}', expected AXIS=ABS[:REL]")
+    abs_tol, _, rel_tol = value.partition(":")
+    return key.strip(), (float(abs_tol), float(rel_tol or 0.0))
+
+
+def pair_records(section, source_data, target_data, name_mapping):
+    """
+    Return ([(target key, source key)], missing) for one section.
+
+    E6AXIS target names are mapped to source names as in a transfer; for the
+    other sections records are paired by index.
+    """
+    mapped = SECTIONS[section].mapped
+    pairs = []
+    missing = []
+    for target_key in target_data:
+        source_key = name_mapping.get(target_key, target_key) if mapped else target_key
+        if source_key in source_data:
+            pairs.append((target_key, source_key))
+        else:
+            missing.append({"section": section, "key": target_key, "missing_in": "source"})
+    if not mapped:
+        for source_key in source_data:
+            if source_key not in target_data:
+                missing.append({"section": section, "key": source_key, "missing_in": "target"})
+    return pairs, missing
+
+
+def out_of_tolerance(source_rows, target_rows, abs_tol, rel_tol):
+    """
+    Compare two lists of equally long value arrays.
+
+    Values missing on both sides (NaN) are equal; a value missing on one side
+    is always out of tolerance.
+
+    Returns:
+        list: (row, column) of every value outside its tolerance, in row order.
+    """
+    if not source_rows:
+        return []
+
+    if np is not None:
+        columns = len(abs_tol)
+        source = np.frombuffer(b"".join(source_rows)).reshape(-1, columns)
+        target = np.frombuffer(b"".join(target_rows)).reshape(-1, columns)
+        within = np.abs(target - source) <= np.asarray(abs_tol) + np.asarray(rel_tol) * np.abs(source)
+        outside = ~(within | (np.isnan(source) & np.isnan(target)))
+        rows, cols = np.nonzero(outside)
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    outside = []
+    for row, (source, target) in enumerate(zip(source_rows, target_rows)):
+        for col, (s, t) in enumerate(zip(source, target)):
+            if math.isnan(s) and math.isnan(t):
+                continue
+            if not abs(t - s) <= abs_tol[col] + rel_tol[col] * abs(s):
+                outside.append((row, col))
+    return outside
+
+
+def _number(value):
+    return None if math.isnan(value) else value
+
+
+def compare_indexes(source_index, target_index, tolerances=None, sections=None, e6axis_names=None, log_callback=None):
+    """
+    Compare the numeric sections of two parsed configs.
+
+    Args:
+        source_index (ConfigIndex): Reference config (e.g. the calibration source).
+        target_index (ConfigIndex): Config checked against it.
+        tolerances (Tolerances): Tolerances per axis (default: exact comparison).
+        sections (list): Sections to compare (default: all of COMPARE_SECTIONS).
+        e6axis_names (list): E6AXIS source names, as for transfer_values.
+        log_callback (function): Receives parser warnings and errors.
+
+    Returns:
+        dict: compared (records per section), differences (one dict per value
+        outside tolerance: section, key, axis, source, target, delta) and
+        missing (records present on one side only).
+    """
+    if tolerances is None:
+        tolerances = Tolerances()
+    if log_callback is None:
+        log_callback = lambda message, level="INFO", bold=False: None
+
+    compared = {}
+    differences = []
+    missing = []
+    for section in sections or COMPARE_SECTIONS:
+        spec = COMPARE_SECTIONS[section]
+        axes = spec.schema.AXES
+        source_data = source_records(source_index, section, log_callback)
+        target_data = spec.parse_source(target_index, log_callback)
+
+        name_mapping = {}
+        if spec.mapped:
+            name_mapping = build_e6axis_name_mapping(source_index, e6axis_names or ["xFFT_HOME"], log_callback)
+            resolve_e6axis_mapping(name_mapping, source_data, log_callback, source_index.prefix_index("E6AXIS"))
+
+        pairs, section_missing = pair_records(section, source_data, target_data, name_mapping)
+        missing.extend(section_missing)
+        compared[section] = len(pairs)
+
+        source_rows = [source_data[source_key].values for _, source_key in pairs]
+        target_rows = [target_data[target_key].values for target_key, _ in pairs]
+        abs_tol, rel_tol = tolerances.vectors(section, axes)
+        for row, col in out_of_tolerance(source_rows, target_rows, abs_tol, rel_tol):
+            source_value = source_rows[row][col]
+            target_value = target_rows[row][col]
+            differences.append({
+                "section": section,
+                "key": pairs[row][0],
+                "axis": axes[col],
+                "source": _number(source_value),
+                "target": _number(target_value),
+                "delta": _number(target_value - source_value),
+            })
+
+    return {"compared": compared, "differences": differences, "missing": missing}
+
+
+def compare_configs(source_file, target_file, tolerances=None, sections=None, e6axis_names=None, source_index=None):
+    """
+    Compare target_file against source_file (see compare_indexes); nothing is written.
+
+    Returns:
+        dict: The compare_indexes report plus source, target and errors.
+    """
+    errors = []
+
+    def log_callback(message, level="INFO", bold=False):
+        if level == "ERROR":
+            errors.append(message)
+
+    report = {"source": source_file, "target": target_file, "compared": {}, "differences": [], "missing": []}
+    try:
+        if source_index is None:
+            source_index = get_parsed_config(source_file).index
+        target_index = get_parsed_config(target_file).index
+        report.update(compare_indexes(source_index, target_index, tolerances, sections, e6axis_names, log_callback))
+    except Exception as e:
+        errors.append(f"Error during comparison: {e}")
+    report["errors"] = errors
+    return report
+
+
+def format_comparison(report):
+    """
+    Return a text form of a comparison report (one line per difference).
+    """
+    if report["errors"]:
+        status = "FAILED"
+    elif report["differences"] or report["missing"]:
+        status = f"{len(report['differences'])} value(s) out of tolerance, {len(report['missing'])} missing record(s)"
+    else:
+        status = f"within tolerance ({sum(report['compared'].values())} records)"
+    out = [f"{report['target']}: {status}"]
+    for diff in report["differences"]:
+        delta = "n/a" if diff["delta"] is None else f"{diff['delta']:+g}"
+        out.append(
+            f"  {diff['section']}[{diff['key']}].{diff['axis']}: "
+            f"source {diff['source']}, target {diff['target']} (delta {delta})"
+        )
+    for item in report["missing"]:
+        out.append(f"  {item['section']}[{item['key']}]: missing in {item['missing_in']}")
+    return "\n".join(out)
@@ -0,0 +1,95 @@
+from config_cache import get_parsed_config
+from progress import ProgressReporter
+from run_report import RunReport
+from splice import edit_file_lines, splice_lines
+from utils.file_utils import file_size
+from sections import apply_sections, enabled_sections
+
+
+def purge_values(
+    target_file,
+    log_callback,
+    update_base_data_flag=True,
+    update_base_name_flag=True,
+    update_base_type_flag=True,
+    update_tool_data_flag=True,
+    update_tool_type_flag=True,
+    update_tool_name_flag=True,
+    update_load_data_flag=True,
+    update_e6axis_flag=True,
+    progress=None,
+    cancel_token=None,
+    report=None,
+):
+    """
+    Purge the selected sections of the target file (values reset to defaults).
+
+    Args:
+        target_file (str): Path of the file to purge in place.
+        log_callback (function): Function to log messages.
+        update_*_flag (bool): Whether the given section should be purged.
+        progress (ProgressReporter): Receives sections done, lines and bytes written.
+        cancel_token (CancelToken): Checked between records; the file is only
+            written after every handler finished.
+        report (RunReport): Receives wall time and counters per phase.
+
+    Returns:
+        bool: True if the file was rewritten, False if it was already purged.
+    """
+    if progress is None:
+        progress = ProgressReporter()
+    if report is None:
+        report = RunReport()
+    report.start("purge", target_file)
+
+    # Read the target file or reuse it from the parsed-config cache (line endings kept,
+    # so the edits can be spliced into its bytes); the handlers edit a copy of the lines
+    with report.phase("read") as stats:
+        target = get_parsed_config(target_file)
+        original = target.lines
+        target_content = list(original)
+
+        target_index = target.index
+        stats["lines_scanned"] += target_index.line_count
+
+    # Process each enabled section
+    specs = enabled_sections({
+        "BASE_DATA": update_base_data_flag,
+        "BASE_NAME": update_base_name_flag,
+        "BASE_TYPE": update_base_type_flag,
+        "TOOL_DATA": update_tool_data_flag,
+        "TOOL_TYPE": update_tool_type_flag,
+        "TOOL_NAME": update_tool_name_flag,
+        "LOAD_DATA": update_load_data_flag,
+        "E6AXIS": update_e6axis_flag,
+    })
+
+    progress.start(total_sections=len(specs))
+    progress.add_lines(target_index.line_count)
+
+    try:
+        apply_sections(
+            specs, target_content, target_index, log_callback, purge_mode=True,
+            progress=progress, cancel_token=cancel_token, report=report,
+        )
+
+        with report.phase("splice") as stats:
+            spliced = splice_lines(original, target_content)
+            stats["lines_scanned"] += len(target_content)
+            report.count_spliced(original, spliced)
+
+        # Write the updated content back to the file (skipped if nothing changed)
+        with report.phase("write") as stats:
+            written = edit_file_lines(target_file, original, spliced, expected_size=target.size, data=target.data)
+            if written:
+                stats["bytes_written"] += file_size(target_file)
+    finally:
+        report.finish()
+
+    if written:
+        progress.add_bytes(report.stats("write")["bytes_written"])
+        log_callback(f"Purged file saved: {target_file}", level="INFO")
+    else:
+        log_callback("Target file already purged; not rewritten.", level="INFO")
+    progress.finish()
+    return written
@@ -2,15 +2,12 @@ import sys
 import os
 from shutil import copyfile
 from datetime import datetime
-import re
-from handlers.base_data_handler import update_base_data
-from handlers.base_name_handler import update_base_name
-from handlers.base_type_handler import update_base_type  # Correct import
-from handlers.tool_data_handler import update_tool_data
-from handlers.tool_type_handler import update_tool_type
-from handlers.tool_name_handler import update_tool_name
-from handlers.load_data_handler import update_load_data
-from handlers.e6axis_handler import update_e6axis
+from config_cache import config_cache, get_parsed_config
+from progress import ProgressReporter
+from run_report import RunReport
+from splice import edit_file_lines, splice_lines
+from sections import apply_sections, build_e6axis_name_mapping, enabled_sections
+from utils.file_utils import file_size
 
 
 def transfer_values(
@@ -26,91 +23,173 @@ def transfer_values(
     update_load_data_flag=True,
     update_e6axis_flag=True,
     e6axis_names=["xFFT_HOME"],  # New parameter for E6AXIS names
+    source_index=None,
+    progress=None,
+    cancel_token=None,
+    report=None,
 ):
+    """
+    Transfer the selected sections from source_file into target_file.
+
+    Args:
+        source_index (ConfigIndex): Already parsed source. When given, source_file
+            is not read again (used by batch transfers).
+        progress (ProgressReporter): Receives sections done, lines and bytes written.
+        cancel_token (CancelToken): Checked between records; on cancellation JobCancelled
+            propagates and the target is not written.
+        report (RunReport): Receives wall time and counters per phase.
+
+    Returns:
+        list: Names of the sections that changed in the target.
+    """
+    changed_sections = []
+    if progress is None:
+        progress = ProgressReporter()
+    if report is None:
+        report = RunReport()
+    report.start("transfer", target_file)
     try:
         log_callback("Starting value transfer...", level="INFO")
 
-        # Read the source file
-        with open(source_file, 'r') as src:
-            source_content = src.readlines()
-        log_callback(f"Source file content loaded successfully. Lines: {len(source_content)}", level="INFO")
-
-        # Read the target file
-        with open(target_file, 'r') as tgt:
-            target_content = tgt.readlines()
+        with report.phase("read") as stats:
+            if source_index is None:
+                # Read the source file (or reuse it from the parsed-config cache)
+                source = get_parsed_config(source_file)
+                source_content = source.lines
+                source_index = source.index
+                stats["lines_scanned"] += source_index.line_count
+                log_callback(f"Source file content loaded successfully. Lines: {len(source_content)}", level="INFO")
+            else:
+                source_content = []
+                log_callback(f"Using pre-parsed source. Lines: {source_index.line_count}", level="INFO")
+
+            # Read the target file; the lines are copied because the handlers edit them in place
+            target = get_parsed_config(target_file)
+            target_content = list(target.lines)
+            target_index = target.index
+            stats["lines_scanned"] += target_index.line_count
         log_callback(f"Target file content loaded successfully. Lines: {len(target_content)}", level="INFO")
+        log_callback(f"Config cache: {config_cache.stats()}", level="DEBUG")
 
         # Check if target_content is empty
         if not target_content:
             log_callback("Warning: Target file is empty. No updates will be made.", level="WARNING")
-            return
-
-        # Update BASE, TOOL, LOAD, and E6AXIS data if the flags are enabled
-        changes_made = False
-        if update_base_data_flag:
-            changes_made |= update_base_data(source_content, target_content, log_callback)
-        if update_base_name_flag:
-            changes_made |= update_base_name(source_content, target_content, log_callback)
-        if update_base_type_flag:
-            changes_made |= update_base_type(source_content, target_content, log_callback)  # Correct function call
-        if update_tool_data_flag:
-            changes_made |= update_tool_data(source_content, target_content, log_callback)
-        if update_tool_type_flag:
-            changes_made |= update_tool_type(source_content, target_content, log_callback)
-        if update_tool_name_flag:
-            changes_made |= update_tool_name(source_content, target_content, log_callback)
-        if update_load_data_flag:
-            changes_made |= update_load_data(source_content, target_content, log_callback)
-        if update_e6axis_flag:
-            # Pobierz nazwę wpisaną w GUI (np. xFFT_HOME)
-            base_source = e6axis_names[0].strip()
-            # Bazowa nazwa targetu – tutaj zakładamy XHOME
-            base_target = "XHOME"
-
-            log_callback(f"Processing E6AXIS with source prefix: {base_source} -> target prefix: {base_target}", level="INFO")
-
-            # Stwórz początkowe mapowanie: XHOME -> HOME
-            name_mapping = {base_target: "HOME"}
-
-            # Automatycznie utwórz mapowania indeksowane
-            # Najpierw wyciągnij wszystkie pasujące klucze ze źródła
-            indexed_keys = []
-            for line in source_content:
-                m = re.match(r'\s*E6AXIS\s+([A-Za-z0-9_]+)\s*=', line)
-                if m:
-                    key = m.group(1)
-                    if key.startswith(base_source):
-                        indexed_keys.append(key)
-
-            # Posortuj, żeby kolejność była poprawna
-            indexed_keys.sort()
-
-            for key in indexed_keys:
-                # Wyciągamy numer z końca (np. xFFT_HOME3 -> "3")
-                idx = key[len(base_source):]
-                # Tworzymy target key, np. XHOME3
-                target_key = f"{base_target}{idx}"
-                name_mapping[target_key] = key
-
-            log_callback(f"Generated name_mapping: {name_mapping}", level="DEBUG")
-
-            updated_keys = update_e6axis(source_content, target_content, log_callback, name_mapping=name_mapping)
-            log_callback(f"Updated E6AXIS keys: {updated_keys}", level="INFO")
-
-            if updated_keys:
-                changes_made = True
-                log_callback(f"Successfully updated E6AXIS keys: {updated_keys}", level="INFO")
-            else:
-                log_callback("No E6AXIS keys were updated.", level="INFO")
+            return changed_sections
+
+        changed_sections = apply_transfer(
+            source_index, target_content, target_index, log_callback,
+            update_base_data_flag=update_base_data_flag,
+            update_base_name_flag=update_base_name_flag,
+            update_base_type_flag=update_base_type_flag,
+            update_tool_data_flag=update_tool_data_flag,
+            update_tool_type_flag=update_tool_type_flag,
+            update_tool_name_flag=update_tool_name_flag,
+            update_load_data_flag=update_load_data_flag,
+            update_e6axis_flag=update_e6axis_flag,
+            e6axis_names=e6axis_names,
+            progress=progress,
+            cancel_token=cancel_token,
+            report=report,
+        )
 
         # Write the final updated content back to the target file
-        if changes_made:
-            with open(target_file, 'w') as tgt:
-                tgt.writelines(target_content)
-            log_callback(f"Final updated target file saved: {target_file}", level="INFO")
-        else:
+        # Tylko rekordy o faktycznie zmienionych wartościach trafiają do pliku, reszta bajtów zostaje bez zmian
+        with report.phase("splice") as stats:
+            spliced = splice_lines(target.lines, target_content)
+            stats["lines_scanned"] += len(target_content)
+            spliced_sections = report.count_spliced(target.lines, spliced)
+        changed_sections = [section for section in changed_sections if section in spliced_sections]
+
+        if not changed_sections:
             log_callback("No changes were made to the target file.", level="INFO")
+        else:
+            with report.phase("write") as stats:
+                if edit_file_lines(
+                    target_file, target.lines, spliced, expected_size=target.size, data=target.data
+                ):
+                    written_size = file_size(target_file)
+                    stats["bytes_written"] += written_size
+                    progress.add_bytes(written_size)
+                    log_callback(f"Final updated target file saved: {target_file}", level="INFO")
 
         log_callback("Transfer process completed.", level="INFO")
     except Exception as e:
-        log_callback(f"Error during value transfer: {e}", level="ERROR")
\ No newline at end of file
+        log_callback(f"Error during value transfer: {e}", level="ERROR")
+    finally:
+        report.finish()
+
+    progress.finish()
+    return changed_sections
+
+
+def apply_transfer(
+    source_index,
+    target_content,
+    target_index,
+    log_callback,
+    update_base_data_flag=True,
+    update_base_name_flag=True,
+    update_base_type_flag=True,
+    update_tool_data_flag=True,
+    update_tool_type_flag=True,
+    update_tool_name_flag=True,
+    update_load_data_flag=True,
+    update_e6axis_flag=True,
+    e6axis_names=["xFFT_HOME"],
+    progress=None,
+    cancel_token=None,
+    report=None,
+):
+    """
+    Run the enabled sections (see sections.apply_sections) on target_content in memory (nothing is written).
+
+    Shared by transfer_values and the dry-run planner.
+
+    Args:
+        source_index (ConfigIndex): Index of the source file.
+        target_content (list): Target lines; updated in place.
+        target_index (ConfigIndex): Index of target_content.
+        log_callback (function): Function to log messages.
+        e6axis_names (list): E6AXIS source names for the XHOME name mapping; empty
+            to transfer E6AXIS records under their own names.
+        report (RunReport): Receives the wall time and records matched per section.
+
+    Returns:
+        list: Names of the sections in which records were rewritten.
+    """
+    if progress is None:
+        progress = ProgressReporter()
+    if report is None:
+        report = RunReport()
+
+    specs = enabled_sections({
+        "BASE_DATA": update_base_data_flag,
+        "BASE_NAME": update_base_name_flag,
+        "BASE_TYPE": update_base_type_flag,
+        "TOOL_DATA": update_tool_data_flag,
+        "TOOL_TYPE": update_tool_type_flag,
+        "TOOL_NAME": update_tool_name_flag,
+        "LOAD_DATA": update_load_data_flag,
+        "E6AXIS": update_e6axis_flag,
+    })
+    progress.start(total_sections=len(specs))
+    progress.add_lines(target_index.line_count)
+
+    # Bez nazw E6AXIS (np. punkty w plikach .dat programów) rekordy są przenoszone pod własną nazwą
+    name_mapping = None
+    if update_e6axis_flag and e6axis_names:
+        name_mapping = build_e6axis_name_mapping(source_index, e6axis_names, log_callback)
+
+    # Wszystkie sekcje w jednym silniku, na rekordach z indeksu (bez ponownego skanowania linii)
+    written = apply_sections(
+        specs, target_content, target_index, log_callback, source_index,
+        name_mapping=name_mapping, progress=progress, cancel_token=cancel_token, report=report,
+    )
+
+    if update_e6axis_flag:
+        if written["E6AXIS"]:
+            log_callback(f"Successfully updated E6AXIS keys: {written['E6AXIS']}", level="INFO")
+        else:
+            log_callback("No E6AXIS keys were updated.", level="INFO")
+
+    return [section for section, records in written.items() if records]